@@ -1,24 +1,169 @@
-from google.adk.agents import Agent, LlmAgent
-from google.adk.models.google_llm import Gemini
+import os
+import zlib
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.genai import types
-from tools.data_loader import load_messages, load_calendar, load_tasks
+from tools.data_store import store
+from tools.json_extract import extract_json, findings_validator
+
+# Session state keys written by DataIngestAgent. temp: keys live for the
+# current workflow run only, so the datasets are not persisted with the session.
+MESSAGES_KEY = "temp:messages"
+CALENDAR_KEY = "temp:calendar"
+TASKS_KEY = "temp:tasks"
+WORKERS_KEY = "temp:workers"
+
+# Incremental mode. The watermark is persisted with the workflow session:
+# {time, msg_ids at that time, count of messages before it, context}, where
+# context fingerprints the non-message data the findings depend on.
+WATERMARK_KEY = "workflow_watermark"
+INCREMENTAL_KEY = "temp:incremental"
+NEXT_WATERMARK_KEY = "temp:next_watermark"
+# Parsed delay/safety findings from the previous run, before this run overwrites them
+PREVIOUS_FINDINGS_KEY = "temp:previous_findings"
+
+MERGED_FINDINGS_KEYS = ("delay_findings", "safety_findings")
+# Sharded workflows use one shard per this many workers, so small data
+# sets don't pay for several model calls where one would do
+WORKFLOW_SHARD_MIN_WORKERS = max(1, int(os.getenv("WORKFLOW_SHARD_MIN_WORKERS", "100")))
+_CONTEXT_FILES = ("calendar", "tasks", "workers")
+
+
+def shard_of(worker_id: str, shards: int) -> int:
+    """Shard a worker's messages go to. Stable across processes, unlike hash()."""
+    return zlib.crc32((worker_id or "").encode()) % shards
+
+
+def shard_key(key: str, shard: Optional[int]) -> str:
+    """State key a sharded specialist writes instead of `key`."""
+    return key if shard is None else f"{key}_shard{shard}"
+
+
+def active_shards(state, shards: int) -> int:
+    """Shards in use this run: one per WORKFLOW_SHARD_MIN_WORKERS workers, at most `shards`."""
+    workers = state.get(WORKERS_KEY)
+    count = len(workers) if workers is not None else len(store.workers())
+    return max(1, min(shards, count // WORKFLOW_SHARD_MIN_WORKERS))
+
+
+def shard_messages(state, messages: list, shard: Optional[int], shards: int) -> list:
+    """A shard's share of messages. Shards past active_shards get none, so skip the model."""
+    if shard is None:
+        return messages
+    active = active_shards(state, shards)
+    return [m for m in messages if shard_of(m.get("worker_id"), active) == shard]
+
+
+def _watermark() -> Optional[dict]:
+    """Watermark just past the newest message, or None if there are none."""
+    last = store.latest_message_time()
+    if last is None:
+        return None
+    at_last = store.messages_between(last, last + "\0")
+    return {
+        "time": last,
+        "msg_ids": [m.get("msg_id") for m in at_last],
+        "count": store.count_messages_before(last),
+        "context": store.fingerprint(_CONTEXT_FILES),
+    }
+
+
+def _previous_findings(state) -> Optional[dict]:
+    previous = {}
+    for key in MERGED_FINDINGS_KEYS:
+        raw = state.get(key)
+        parsed = extract_json(raw, findings_validator(key)) if isinstance(raw, str) else None
+        if parsed is None:
+            return None
+        previous[key] = parsed
+    return previous
+
+
+def new_messages(state) -> Optional[list]:
+    """
+    Messages newer than the session's watermark, or None when the previous
+    results can't be extended: no watermark or findings yet, the calendar,
+    tasks or workers changed, or messages appeared or vanished at or before
+    the watermark.
+    """
+    mark = state.get(WATERMARK_KEY)
+    if not mark or mark.get("context") != store.fingerprint(_CONTEXT_FILES):
+        return None
+    last = mark["time"]
+    if store.count_messages_before(last) != mark["count"]:
+        return None
+    known = set(mark["msg_ids"])
+    at_last = store.messages_between(last, last + "\0")
+    if not known <= {m.get("msg_id") for m in at_last}:
+        return None
+    tied = [m for m in at_last if m.get("msg_id") not in known]
+    return tied + store.messages_since(last)
+
+
+class DataIngestAgent(BaseAgent):
+    """
+    Loads messages, calendar, tasks and workers straight from the data store
+    into session.state. No model call: the downstream specialists read the
+    datasets through {temp:...} placeholders in their instructions.
+
+    With incremental=True only messages newer than the session's watermark
+    are passed on, and the previous findings are kept for FindingsMergeAgent.
+    """
+
+    incremental: bool = False
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        messages = store.messages()
+        calendar = store.calendar()
+        tasks = store.tasks()
+        workers = store.workers()
+
+        delta = {}
+        summary = (
+            f"Data ingestion complete. {len(messages)} messages, "
+            f"{len(calendar)} calendar entries, {len(tasks)} tasks, "
+            f"{len(workers)} workers."
+        )
+
+        if self.incremental:
+            state = ctx.session.state
+            previous = _previous_findings(state)
+            fresh = new_messages(state) if previous is not None else None
+            delta[INCREMENTAL_KEY] = fresh is not None
+            delta[NEXT_WATERMARK_KEY] = _watermark()
+            if fresh is not None:
+                delta[PREVIOUS_FINDINGS_KEY] = previous
+                summary += f" {len(fresh)} new since the last run."
+                messages = fresh
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(state_delta={
+                MESSAGES_KEY: messages,
+                CALENDAR_KEY: calendar,
+                TASKS_KEY: tasks,
+                WORKERS_KEY: workers,
+                "ingest_results": summary,
+                **delta,
+            }),
+        )
+
 
-def build_data_ingest_agent(retry_config):
+def build_data_ingest_agent(retry_config=None, incremental: bool = False):
     """
-    Builds an LlmAgent whose job is to read input data and store structured items into session.state.
-    The agent will return the number of messages processed.
+    Builds the deterministic ingestion stage. retry_config is accepted for
+    symmetry with the other builders; no model is called here.
     """
-    return LlmAgent(
+    return DataIngestAgent(
         name="DataIngestAgent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-        instruction="""You are a data ingestion agent. Your ONLY job is to:
-1. Call load_messages() to fetch messages
-2. Call load_calendar() to fetch calendar data  
-3. Call load_tasks() to fetch task data
-4. After ALL THREE tools return results, output ONLY this text: "Data ingestion complete."
-
-CRITICAL: Do NOT call any other functions. Do NOT analyze data. Do NOT call run_analysis or any other tool.
-Just load the three datasets and confirm completion.""",
-        tools=[load_messages, load_calendar, load_tasks],
-        output_key="ingest_results"
-    )
\ No newline at end of file
+        description="Loads messages, calendar, tasks and workers into session.state.",
+        incremental=incremental,
+    )
@@ -1,34 +1,104 @@
+import json
+from functools import partial
+from typing import Optional
+
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents.callback_context import CallbackContext
+from agents.model_scheduler import PRIORITY_NORMAL, ScheduledGemini
+from google.genai import types
+from agents.data_ingest_agent import (
+    CALENDAR_KEY,
+    INCREMENTAL_KEY,
+    MESSAGES_KEY,
+    shard_key,
+    shard_messages,
+)
 from tools.approve_reassignment import approve_reassignment
 from tools.analyze_image_mock import analyze_image_mock
 from tools.transcribe_audio_mock import transcribe_audio_mock
+from tools.data_store import store
+from tools.delay_engine import detect_delays
+from tools.media_cache import cached_media_tools, run_cache
+
+# Rows flagged by the rule engine, for the LLM to phrase
+DELAY_CANDIDATES_KEY = "temp:delay_candidates"
+# Evidence already reported, persisted for incremental runs, and this run's update
+DELAY_SEEN_KEY = "workflow_delay_seen"
+NEXT_DELAY_SEEN_KEY = "temp:next_delay_seen"
+
+
+def run_delay_rules(callback_context: CallbackContext, shard: Optional[int] = None, shards: int = 1):
+    """
+    Runs the rule engine before the model. With nothing flagged the model
+    call is skipped entirely and delay_findings is set to an empty list.
+
+    A sharded agent only looks at its own workers' messages and writes
+    the shard's keys (see shard_key).
+    """
+    state = callback_context.state
+    # An incremental run with nothing new passes an empty list
+    messages = state.get(MESSAGES_KEY)
+    if messages is None:
+        messages = store.messages()
+    messages = shard_messages(state, messages, shard, shards)
+    calendar = state.get(CALENDAR_KEY) or store.calendar()
+
+    # Incremental runs skip evidence the previous findings already cover
+    seen = set()
+    if state.get(INCREMENTAL_KEY):
+        seen = {tuple(key) for key in state.get(DELAY_SEEN_KEY) or []}
 
-def build_delay_agent(retry_config):
+    # Media results are shared with SafetyAgent for the rest of the run
+    cache = run_cache(callback_context.invocation_id)
+    candidates = detect_delays(
+        messages,
+        calendar,
+        transcribe=cache.wrap(transcribe_audio_mock),
+        analyze=cache.wrap(analyze_image_mock),
+        seen=seen,
+    )
+    state[shard_key(DELAY_CANDIDATES_KEY, shard)] = json.dumps(candidates)
+    state[shard_key(NEXT_DELAY_SEEN_KEY, shard)] = sorted(seen, key=str)
+
+    if not candidates:
+        state[shard_key("delay_findings", shard)] = "[]"
+        return types.Content(role="model", parts=[types.Part(text="[]")])
+    return None
+
+
+def build_delay_agent(retry_config, shard: Optional[int] = None, shards: int = 1):
     """
     Detect delays using:
     - calendar
     - messages
     - audio analysis (accident = delay)
     - image analysis (wrong location = delay)
+
+    Detection itself is done by tools.delay_engine; the model only phrases
+    the suggested actions for the flagged rows.
+
+    With a shard number the agent covers only that shard's workers and is
+    named DelayAgent_shard<N>; ShardMergeAgent combines the shards.
     """
     return LlmAgent(
-        name="DelayAgent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        name=shard_key("DelayAgent", shard),
+        model=ScheduledGemini(
+            model="gemini-2.5-flash-lite",
+            retry_options=retry_config,
+            priority=PRIORITY_NORMAL,
+        ),
         instruction="""
-Use session.state calendar + messages.
-
-A delay is detected if:
-
-1. Text contains:
-   - "late", "stuck", "road closed", "traffic", "delayed", "wrong location"
+These delays were detected by rules from session.state calendar + messages
+(text keywords, audio urgency, image reuse/wrong location):
 
-2. Audio analysis via transcribe_audio_mock:
-   - urgency = medium/high → delay
+{%s?}
 
-3. Image analysis via analyze_image_mock:
-   - reuse_score > 0.7 → delay
-   - note mentions wrong location → delay
+For each row:
+- Keep worker_id, task_id and reason exactly as given
+- Rewrite suggested_action as one short, concrete instruction for the supervisor
+- Do NOT add or remove rows
+- If you need to re-check media, call transcribe_audio_batch(audio_ids) /
+  analyze_image_batch(image_ids) ONCE with all ids, not once per id
 
 Produce JSON array ONLY:
 [
@@ -38,7 +108,8 @@ Produce JSON array ONLY:
 STRICT:
 - NO text outside JSON
 - NO commentary
-""",
-        tools=[approve_reassignment, analyze_image_mock, transcribe_audio_mock],
-        output_key="delay_findings",
+""" % shard_key(DELAY_CANDIDATES_KEY, shard),
+        tools=[approve_reassignment, *cached_media_tools()],
+        before_agent_callback=partial(run_delay_rules, shard=shard, shards=shards),
+        output_key=shard_key("delay_findings", shard),
     )
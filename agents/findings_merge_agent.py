@@ -0,0 +1,169 @@
+import json
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from agents.data_ingest_agent import (
+    INCREMENTAL_KEY,
+    MERGED_FINDINGS_KEYS,
+    NEXT_WATERMARK_KEY,
+    PREVIOUS_FINDINGS_KEY,
+    WATERMARK_KEY,
+    shard_key,
+)
+from agents.delay_agent import DELAY_SEEN_KEY, NEXT_DELAY_SEEN_KEY
+from tools.json_extract import extract_json, findings_validator
+
+# False when an incremental run added nothing, so the last report still holds
+FINDINGS_CHANGED_KEY = "temp:findings_changed"
+# Names of the shard agents whose output could not be parsed this run
+SHARD_ERRORS_KEY = "temp:shard_errors"
+
+# Identity of a finding, for dropping repeats when merging
+_IDENTITY = {
+    "delay_findings": ("worker_id", "task_id", "reason"),
+    "safety_findings": ("worker_id", "issue"),
+}
+
+
+def merge_findings(key: str, previous: list, new: list) -> list:
+    """Previous findings followed by the new ones they don't already contain."""
+    fields = _IDENTITY[key]
+    known = {tuple(f.get(k) for k in fields) for f in previous}
+    return previous + [f for f in new if tuple(f.get(k) for k in fields) not in known]
+
+
+def merge_shards(state, shards: int) -> dict:
+    """
+    State delta combining the sharded specialists' outputs: each shard's
+    delay and safety findings concatenated in shard order under
+    delay_findings / safety_findings, the shards' delay evidence unioned,
+    and the shard agents whose output couldn't be parsed (left out) under
+    temp:shard_errors.
+    """
+    delta = {}
+    errors = []
+    for key, author in (("delay_findings", "DelayAgent"), ("safety_findings", "SafetyAgent")):
+        rows = []
+        for shard in range(shards):
+            raw = state.get(shard_key(key, shard))
+            parsed = extract_json(raw, findings_validator(key)) if isinstance(raw, str) else None
+            if parsed is None:
+                errors.append(shard_key(author, shard))
+            else:
+                rows.extend(parsed)
+        delta[key] = json.dumps(rows)
+
+    seen = set()
+    for shard in range(shards):
+        seen.update(tuple(k) for k in state.get(shard_key(NEXT_DELAY_SEEN_KEY, shard)) or [])
+    delta[NEXT_DELAY_SEEN_KEY] = sorted(seen, key=str)
+    delta[SHARD_ERRORS_KEY] = errors
+    return delta
+
+
+class ShardMergeAgent(BaseAgent):
+    """
+    Runs after the sharded specialists when the workflow is not
+    incremental (FindingsMergeAgent merges the shards otherwise), so the
+    report sees the same keys as with a single DelayAgent and SafetyAgent.
+    No model call.
+    """
+
+    shards: int = 1
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        delta = merge_shards(ctx.session.state, self.shards)
+        errors = delta[SHARD_ERRORS_KEY]
+        summary = f"Merged findings from {self.shards} shard(s)."
+        if errors:
+            summary += f" Could not read: {', '.join(errors)}."
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(state_delta=delta),
+        )
+
+
+class FindingsMergeAgent(BaseAgent):
+    """
+    Runs after the specialists in incremental mode. Folds this run's
+    findings (from new messages only) into the previous ones, and moves
+    the session's watermark forward. No model call. With shards > 1 it
+    first combines the shard outputs, as ShardMergeAgent does.
+
+    If a specialist's output can't be parsed, the watermark stays put
+    so the next run looks at the same messages again.
+    """
+
+    shards: int = 1
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        incremental = bool(state.get(INCREMENTAL_KEY))
+        previous = state.get(PREVIOUS_FINDINGS_KEY) or {}
+
+        delta = {FINDINGS_CHANGED_KEY: True}
+        if self.shards > 1:
+            delta.update(merge_shards(state, self.shards))
+
+        def get(key):
+            return delta[key] if key in delta else state.get(key)
+
+        current = {}
+        for key in MERGED_FINDINGS_KEYS:
+            raw = get(key)
+            current[key] = extract_json(raw, findings_validator(key)) if isinstance(raw, str) else None
+
+        if any(v is None for v in current.values()) or get(SHARD_ERRORS_KEY):
+            summary = "Could not read this run's findings; the watermark was not moved."
+            if incremental:
+                # Keep what the previous runs found
+                delta.update({key: json.dumps(previous.get(key, [])) for key in MERGED_FINDINGS_KEYS})
+        else:
+            if incremental:
+                for key in MERGED_FINDINGS_KEYS:
+                    current[key] = merge_findings(key, previous.get(key, []), current[key])
+                    delta[key] = json.dumps(current[key])
+            added = {key: len(current[key]) - len(previous.get(key, [])) for key in MERGED_FINDINGS_KEYS}
+            delta[FINDINGS_CHANGED_KEY] = not incremental or any(added.values())
+            delta[WATERMARK_KEY] = state.get(NEXT_WATERMARK_KEY)
+            delta[DELAY_SEEN_KEY] = get(NEXT_DELAY_SEEN_KEY) or []
+            summary = (
+                f"{added['delay_findings']} new delay and {added['safety_findings']} new safety "
+                f"finding(s); {len(current['delay_findings'])} delay and "
+                f"{len(current['safety_findings'])} safety finding(s) open."
+            )
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(state_delta=delta),
+        )
+
+
+def build_shard_merge_agent(shards: int):
+    return ShardMergeAgent(
+        name="ShardMergeAgent",
+        description="Combines the sharded specialists' findings in shard order.",
+        shards=shards,
+    )
+
+
+def build_findings_merge_agent(shards: int = 1):
+    return FindingsMergeAgent(
+        name="FindingsMergeAgent",
+        description="Merges new delay/safety findings into the previous ones and advances the watermark.",
+        shards=shards,
+    )
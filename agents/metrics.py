@@ -0,0 +1,327 @@
+import contextvars
+import threading
+import time
+from typing import Any, Optional
+
+from google.adk.plugins.base_plugin import BasePlugin
+
+# Seconds; model calls and whole runs can take tens of seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+
+
+# =====================================================================
+# Prometheus text-format metrics
+# =====================================================================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    le = 'le="' + _number(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from `collect`, which returns {label values: value}."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), collect=None):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for key, value in sorted((self.collect() if self.collect else {}).items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+run_seconds = registry.register(Histogram(
+    "agent_run_duration_seconds", "Whole runner invocation, by root agent.", ("root", "outcome")))
+agent_seconds = registry.register(Histogram(
+    "agent_duration_seconds", "Time inside each agent, sub-agents included.", ("agent", "outcome")))
+model_seconds = registry.register(Histogram(
+    "agent_model_call_duration_seconds", "Model call time including scheduler wait and retries.",
+    ("agent", "model", "outcome")))
+tool_seconds = registry.register(Histogram(
+    "agent_tool_duration_seconds", "Tool call time.", ("agent", "tool", "outcome")))
+tokens = registry.register(Histogram(
+    "agent_model_tokens", "Tokens per model call.", ("agent", "model", "kind"), TOKEN_BUCKETS))
+tokens_total = registry.register(Counter(
+    "agent_model_tokens_total", "Tokens consumed.", ("agent", "model", "kind")))
+retries_total = registry.register(Counter(
+    "agent_model_retries_total", "Model HTTP requests retried by the client.", ("agent",)))
+errors_total = registry.register(Counter(
+    "agent_errors_total", "Errors raised by runs, agents, model calls and tools.", ("stage", "name")))
+scheduler_wait_seconds = registry.register(Histogram(
+    "model_scheduler_wait_seconds", "Time model calls wait for a scheduler slot.", ("priority",)))
+
+
+# =====================================================================
+# Retries
+# =====================================================================
+
+# Agent whose model call is running in this task, for attributing retries
+_current_agent = contextvars.ContextVar("metrics_current_agent", default="")
+
+_retry_hook_installed = False
+
+
+def _count_retries():
+    """
+    Count google-genai's tenacity retries. Its client builds the retry
+    arguments with _api_client.retry_args, so the before_sleep hook there
+    is wrapped; the client's own retry logging is left as it is.
+    """
+    global _retry_hook_installed
+    if _retry_hook_installed:
+        return
+    _retry_hook_installed = True
+    from google.genai import _api_client
+
+    build = _api_client.retry_args
+
+    def retry_args(options):
+        args = build(options)
+        log = args.get("before_sleep")
+
+        def before_sleep(retry_state):
+            retries_total.inc(agent=_current_agent.get() or "unknown")
+            if log is not None:
+                log(retry_state)
+
+        args["before_sleep"] = before_sleep
+        return args
+
+    _api_client.retry_args = retry_args
+
+
+# =====================================================================
+# Plugin
+# =====================================================================
+
+def _outcome(error: Optional[Exception]) -> str:
+    return "error" if error else "ok"
+
+
+class MetricsPlugin(BasePlugin):
+    """
+    Records how long each run, agent, model call and tool call takes, plus
+    token usage, client retries and errors, into `registry`. Never changes
+    what the agents do: every callback returns None.
+    """
+
+    def __init__(self, name: str = "metrics"):
+        super().__init__(name)
+        # (invocation_id, stage, agent or function call id) -> start time
+        self._started = {}
+        # (invocation_id, agent) -> model named in the running request
+        self._models = {}
+        _count_retries()
+
+    def _start(self, *key):
+        self._started[key] = time.perf_counter()
+
+    def _stop(self, *key) -> Optional[float]:
+        started = self._started.pop(key, None)
+        return None if started is None else time.perf_counter() - started
+
+    def _forget(self, invocation_id: str):
+        """Drop what a finished run left behind (cancelled agents, model and tool calls)."""
+        for entries in (self._started, self._models):
+            for key in [k for k in entries if k[0] == invocation_id]:
+                del entries[key]
+
+    # Runs --------------------------------------------------------------
+
+    async def before_run_callback(self, *, invocation_context):
+        self._start(invocation_context.invocation_id, "run")
+        return None
+
+    def _end_run(self, invocation_context, error=None):
+        took = self._stop(invocation_context.invocation_id, "run")
+        if took is not None:
+            run_seconds.observe(took, root=invocation_context.agent.name, outcome=_outcome(error))
+        self._forget(invocation_context.invocation_id)
+
+    async def after_run_callback(self, *, invocation_context):
+        self._end_run(invocation_context)
+
+    async def on_run_error_callback(self, *, invocation_context, error):
+        errors_total.inc(stage="run", name=invocation_context.agent.name)
+        self._end_run(invocation_context, error)
+
+    # Agents ------------------------------------------------------------
+
+    async def before_agent_callback(self, *, agent, callback_context):
+        self._start(callback_context.invocation_id, "agent", agent.name)
+        return None
+
+    def _end_agent(self, agent, callback_context, error=None):
+        took = self._stop(callback_context.invocation_id, "agent", agent.name)
+        if took is not None:
+            agent_seconds.observe(took, agent=agent.name, outcome=_outcome(error))
+
+    async def after_agent_callback(self, *, agent, callback_context):
+        self._end_agent(agent, callback_context)
+        return None
+
+    async def on_agent_error_callback(self, *, agent, callback_context, error):
+        errors_total.inc(stage="agent", name=agent.name)
+        self._end_agent(agent, callback_context, error)
+
+    # Model calls -------------------------------------------------------
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        _current_agent.set(callback_context.agent_name)
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._models[key] = llm_request.model or ""
+        self._start(callback_context.invocation_id, "model", callback_context.agent_name)
+        return None
+
+    def _end_model(self, callback_context, error=None) -> str:
+        """Record the call's duration; returns the model it used."""
+        agent = callback_context.agent_name
+        model = self._models.pop((callback_context.invocation_id, agent), "")
+        took = self._stop(callback_context.invocation_id, "model", agent)
+        if took is not None:
+            model_seconds.observe(took, agent=agent, model=model, outcome=_outcome(error))
+        return model
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        # Streaming calls report each partial chunk; time and count the final one
+        if llm_response.partial:
+            return None
+        agent = callback_context.agent_name
+        model = self._end_model(callback_context)
+        usage = llm_response.usage_metadata
+        if usage:
+            for kind, value in (
+                ("prompt", usage.prompt_token_count),
+                ("completion", usage.candidates_token_count),
+                ("thoughts", usage.thoughts_token_count),
+                ("cached", usage.cached_content_token_count),
+            ):
+                if value:
+                    tokens.observe(value, agent=agent, model=model, kind=kind)
+                    tokens_total.inc(value, agent=agent, model=model, kind=kind)
+        if llm_response.error_code:
+            errors_total.inc(stage="model", name=agent)
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        errors_total.inc(stage="model", name=callback_context.agent_name)
+        self._end_model(callback_context, error)
+        return None
+
+    # Tools -------------------------------------------------------------
+
+    async def before_tool_callback(self, *, tool, tool_args, tool_context):
+        self._start(tool_context.invocation_id, "tool", tool_context.function_call_id)
+        return None
+
+    def _end_tool(self, tool, tool_context, error=None):
+        took = self._stop(tool_context.invocation_id, "tool", tool_context.function_call_id)
+        if took is not None:
+            tool_seconds.observe(
+                took, agent=tool_context.agent_name, tool=tool.name, outcome=_outcome(error)
+            )
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result: Any):
+        self._end_tool(tool, tool_context)
+        return None
+
+    async def on_tool_error_callback(self, *, tool, tool_args, tool_context, error):
+        errors_total.inc(stage="tool", name=tool.name)
+        self._end_tool(tool, tool_context, error)
+        return None
+
+
+# One instance shared by every runner, so all series land in `registry`
+metrics_plugin = MetricsPlugin()
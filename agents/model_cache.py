@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_last_used ON responses (last_used);
+"""
+
+# Per-call ids ADK assigns to function calls; they differ on every run
+_VOLATILE_FIELDS = ("id", "thought_signature")
+
+
+def _normalise_part(part: dict) -> dict:
+    part = {k: v for k, v in part.items() if k not in _VOLATILE_FIELDS}
+    for field in ("function_call", "function_response"):
+        if isinstance(part.get(field), dict):
+            part[field] = {k: v for k, v in part[field].items() if k not in _VOLATILE_FIELDS}
+    return part
+
+
+def request_key(model: str, llm_request: LlmRequest) -> str:
+    """Hash of everything that determines a model response: model, system
+    instruction, tool declarations and the conversation including tool results."""
+    config = llm_request.config
+    payload = {
+        "model": model,
+        "system": config.system_instruction if isinstance(config.system_instruction, str)
+        else config.system_instruction and config.system_instruction.model_dump(mode="json", exclude_none=True),
+        "tools": [t.model_dump(mode="json", exclude_none=True) for t in config.tools or []],
+        "contents": [
+            {
+                "role": c.role,
+                "parts": [_normalise_part(p.model_dump(mode="json", exclude_none=True)) for p in c.parts or []],
+            }
+            for c in llm_request.contents
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _cacheable(response: LlmResponse) -> bool:
+    return (
+        response.content is not None
+        and bool(response.content.parts)
+        and not response.partial
+        and not response.error_code
+    )
+
+
+class ResponseCache:
+    """
+    On-disk model response cache in one SQLite file.
+
+    Least recently used responses are evicted once the stored responses
+    exceed max_bytes. Function call ids are dropped on store so ADK assigns
+    fresh ones when a cached call is replayed.
+    """
+
+    def __init__(self, path: str, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Blocking helpers (run in a worker thread)
+    # ------------------------------------------------------------------
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0] if row else None
+
+    def _put(self, key: str, model: str, data: str):
+        size = len(data)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, data, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+
+            while self._bytes > self.max_bytes:
+                victims = self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_used LIMIT 64"
+                ).fetchall()
+                if not victims:
+                    break
+                for victim, victim_size in victims:
+                    if self._bytes <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (victim,))
+                    self._bytes -= victim_size
+                    self.evictions += 1
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str) -> Optional[LlmResponse]:
+        data = await asyncio.to_thread(self._get, key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return LlmResponse.model_validate_json(data)
+
+    async def put(self, key: str, model: str, response: LlmResponse) -> bool:
+        """Store a complete response; partial or failed responses are skipped."""
+        if not _cacheable(response):
+            return False
+        response = response.model_copy(deep=True)
+        for part in response.content.parts:
+            if part.function_call is not None:
+                part.function_call.id = None
+        data = response.model_dump_json(exclude_none=True)
+        await asyncio.to_thread(self._put, key, model, data)
+        self.stores += 1
+        return True
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": await asyncio.to_thread(self._count),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def response_cache() -> Optional[ResponseCache]:
+    """The shared cache when LLM_CACHE_PATH is set (opt-in), else None."""
+    global _cache
+    path = os.getenv("LLM_CACHE_PATH")
+    if not path:
+        return None
+    if _cache is None or _cache.path != path:
+        with _cache_lock:
+            if _cache is None or _cache.path != path:
+                _cache = ResponseCache(path)
+    return _cache
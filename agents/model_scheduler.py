@@ -0,0 +1,206 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from agents.metrics import Gauge, registry, scheduler_wait_seconds
+from agents.model_cache import request_key, response_cache
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+
+MODEL_MAX_CONCURRENCY = int(os.getenv("MODEL_MAX_CONCURRENCY", "4"))
+# Token bucket: sustained model calls per second and burst size (0 = no rate
+# limit, so only MODEL_MAX_CONCURRENCY applies). Set it to the API quota.
+MODEL_RATE_PER_SECOND = float(os.getenv("MODEL_RATE_PER_SECOND", "0"))
+MODEL_RATE_BURST = int(os.getenv("MODEL_RATE_BURST", "4"))
+
+# Lower runs first
+PRIORITY_SAFETY = 0
+PRIORITY_NORMAL = 1
+PRIORITY_REPORT = 2
+
+_PRIORITY_NAMES = {
+    PRIORITY_SAFETY: "safety",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_REPORT: "report",
+}
+
+
+class ModelScheduler:
+    """
+    Admission control for model calls across all agents and requests.
+
+    At most max_concurrency calls run at once, and calls start no faster
+    than the token bucket allows (rate_per_second, bursts of `burst`).
+    Waiting calls are admitted by priority, then arrival order.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MODEL_MAX_CONCURRENCY,
+        rate_per_second: float = MODEL_RATE_PER_SECOND,
+        burst: int = MODEL_RATE_BURST,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        # (priority, seq, future), lowest first
+        self._waiting = []
+        self._seq = itertools.count()
+        self._timer = None
+        self.active = 0
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+        self._refilled_at = now
+
+    def _wake(self):
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._waiting and self.active < self.max_concurrency:
+            future = self._waiting[0][2]
+            if future.done():
+                # Caller gave up while queued
+                heapq.heappop(self._waiting)
+                continue
+
+            if self.rate_per_second > 0:
+                self._refill()
+                if self._tokens < 1:
+                    if self._timer is None:
+                        delay = (1 - self._tokens) / self.rate_per_second
+                        self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+                    return
+                self._tokens -= 1
+
+            heapq.heappop(self._waiting)
+            self.active += 1
+            future.set_result(None)
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._seq), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Admitted just as we were cancelled: hand the slot back
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        self.active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_NORMAL):
+        started = time.monotonic()
+        await self.acquire(priority)
+        waited = time.monotonic() - started
+        self.granted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        scheduler_wait_seconds.observe(waited, priority=_PRIORITY_NAMES.get(priority, str(priority)))
+        try:
+            yield
+        finally:
+            self.release()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        waiting = [p for p, _, f in self._waiting if not f.done()]
+        return {
+            "active": self.active,
+            "queue_depth": len(waiting),
+            "queued_by_priority": {
+                name: waiting.count(p) for p, name in _PRIORITY_NAMES.items()
+            },
+            "granted": self.granted,
+            "avg_wait_ms": round(1000 * self.total_wait / self.granted, 1) if self.granted else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 1),
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+        }
+
+
+# Shared by every agent's model
+scheduler = ModelScheduler()
+
+registry.register(Gauge(
+    "model_scheduler_active", "Model calls holding a scheduler slot.",
+    collect=lambda: {(): scheduler.active},
+))
+registry.register(Gauge(
+    "model_scheduler_queue_depth", "Model calls waiting for a slot.", ("priority",),
+    collect=lambda: {(k,): v for k, v in scheduler.stats()["queued_by_priority"].items()},
+))
+
+
+class ScheduledGemini(Gemini):
+    """
+    Gemini whose calls go through the shared ModelScheduler at `priority`.
+
+    The slot covers the model call only: responses are collected, the
+    slot is released, and only then are they passed on, so tools and
+    slow readers downstream don't hold it. Streamed calls (stream=True)
+    are the exception: partial responses are passed on as they arrive,
+    so the slot is held until the stream ends.
+
+    With LLM_CACHE_PATH set, identical requests are answered from the
+    on-disk response cache without taking a scheduler slot.
+    """
+
+    priority: int = PRIORITY_NORMAL
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if stream:
+            async with scheduler.slot(self.priority):
+                async for response in self._call_model(llm_request, stream):
+                    yield response
+            return
+
+        cache = response_cache()
+        key = request_key(self.model, llm_request) if cache else None
+        if key:
+            cached = await cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        async with scheduler.slot(self.priority):
+            responses = [r async for r in self._call_model(llm_request, stream)]
+
+        if key and len(responses) == 1:
+            await cache.put(key, self.model, responses[0])
+        for response in responses:
+            yield response
+
+    def _call_model(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """The underlying model call; benchmarks override it with a local fake."""
+        return super().generate_content_async(llm_request, stream)
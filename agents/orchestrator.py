@@ -1,28 +1,67 @@
+import os
+
 from google.adk.agents import SequentialAgent, ParallelAgent
 
-def build_orchestrator_agent(retry_config):
+# Repeated runs in a session only analyze messages newer than the last run
+WORKFLOW_INCREMENTAL = os.getenv("WORKFLOW_INCREMENTAL", "1") == "1"
+# Most worker partitions the specialists run over, one DelayAgent +
+# SafetyAgent each; how many are used depends on the worker count
+# (WORKFLOW_SHARD_MIN_WORKERS in agents/data_ingest_agent.py)
+WORKFLOW_SHARDS = max(1, int(os.getenv("WORKFLOW_SHARDS", "4")))
+
+
+def build_orchestrator_agent(
+    retry_config,
+    incremental: bool = WORKFLOW_INCREMENTAL,
+    shards: int = WORKFLOW_SHARDS,
+):
     """
     Builds the workflow agent (no CoreAgent routing here).
     Routing is handled in backend/main.py
+
+    In incremental mode DataIngestAgent passes on only the messages after
+    the session's watermark, and FindingsMergeAgent folds the specialists'
+    new findings into the previous ones before the report.
+
+    With shards > 1 workers are split by a hash of worker_id and every shard
+    gets its own DelayAgent and SafetyAgent, all in SpecialistsParallel.
+    Their model calls still go through the shared model scheduler, which
+    bounds how many run at once. Only one shard per
+    WORKFLOW_SHARD_MIN_WORKERS workers gets messages; the others skip
+    their model calls. ShardMergeAgent (or FindingsMergeAgent, when
+    incremental) then combines the shard findings in shard order.
     """
     from agents.data_ingest_agent import build_data_ingest_agent
     from agents.delay_agent import build_delay_agent
+    from agents.findings_merge_agent import build_findings_merge_agent, build_shard_merge_agent
     from agents.safety_agent import build_safety_agent
     from agents.report_agent import build_report_agent
+    from tools.media_cache import release_run_cache
 
-    ingest = build_data_ingest_agent(retry_config)
-    delay = build_delay_agent(retry_config)
-    safety = build_safety_agent(retry_config)
+    ingest = build_data_ingest_agent(retry_config, incremental=incremental)
+    if shards > 1:
+        specialists = [
+            build(retry_config, shard=shard, shards=shards)
+            for build in (build_delay_agent, build_safety_agent)
+            for shard in range(shards)
+        ]
+    else:
+        specialists = [build_delay_agent(retry_config), build_safety_agent(retry_config)]
     report = build_report_agent(retry_config)
 
+    stages = [ingest, ParallelAgent(name="SpecialistsParallel", sub_agents=specialists)]
+    if incremental:
+        stages.append(build_findings_merge_agent(shards))
+    elif shards > 1:
+        stages.append(build_shard_merge_agent(shards))
+    stages.append(report)
+
     # Just the workflow, no CoreAgent
     workflow = SequentialAgent(
         name="Workflow",
-        sub_agents=[
-            ingest,
-            ParallelAgent(name="SpecialistsParallel", sub_agents=[delay, safety]),
-            report
-        ]
+        sub_agents=stages,
+        # Media results are cached per run; free them when the run ends
+        after_agent_callback=release_run_cache,
     )
 
     return workflow 
\ No newline at end of file
@@ -1,5 +1,22 @@
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from agents.findings_merge_agent import FINDINGS_CHANGED_KEY
+from agents.model_scheduler import PRIORITY_REPORT, ScheduledGemini
+
+
+def reuse_unchanged_report(callback_context: CallbackContext):
+    """
+    Skips the model when an incremental run found nothing new: the
+    previous report already describes the same findings.
+    """
+    state = callback_context.state
+    report = state.get("final_report")
+    if state.get(FINDINGS_CHANGED_KEY) is False and report:
+        state["final_report"] = report
+        return types.Content(role="model", parts=[types.Part(text=report)])
+    return None
+
 
 def build_report_agent(retry_config):
     """
@@ -20,7 +37,11 @@ def build_report_agent(retry_config):
     """
     return LlmAgent(
         name="ReportAgent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=ScheduledGemini(
+            model="gemini-2.5-flash-lite",
+            retry_options=retry_config,
+            priority=PRIORITY_REPORT,
+        ),
         instruction="""
 You are the final reporting agent. Read ONLY the items in session.state:
 
@@ -29,6 +50,9 @@ You are the final reporting agent. Read ONLY the items in session.state:
 - image_findings
 - audio_findings
 
+delay_findings: {delay_findings?}
+safety_findings: {safety_findings?}
+
 Then create a clear, human-friendly operational report.
 
 STRUCTURE OF REPORT:
@@ -60,5 +84,6 @@ RULES:
 - If a key is null, missing, or empty → treat as “No issues detected”.
 - The final output must be a clean natural-language report.
 """,
+        before_agent_callback=reuse_unchanged_report,
         output_key="final_report",
     )
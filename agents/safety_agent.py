@@ -1,33 +1,91 @@
+import json
+from functools import partial
+from typing import Optional
+
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents.callback_context import CallbackContext
+from agents.model_scheduler import PRIORITY_SAFETY, ScheduledGemini
+from google.genai import types
+from agents.data_ingest_agent import MESSAGES_KEY, shard_key, shard_messages
 from tools.transcribe_audio_mock import transcribe_audio_mock
 from tools.analyze_image_mock import analyze_image_mock
+from tools.data_store import store
+from tools.safety_engine import triage_messages
+from tools.media_cache import cached_media_tools, run_cache
+
+# Findings the rule engine is sure about, and messages it wants reviewed
+SAFETY_CONFIRMED_KEY = "temp:safety_confirmed"
+SAFETY_AMBIGUOUS_KEY = "temp:safety_ambiguous"
 
-def build_safety_agent(retry_config):
+
+def run_safety_triage(callback_context: CallbackContext, shard: Optional[int] = None, shards: int = 1):
+    """
+    Scores all messages with the keyword engine and pre-populates
+    safety_findings. The model only runs when there are ambiguous cases.
+    A sharded agent only scores its own workers' messages.
+    """
+    state = callback_context.state
+    # An incremental run with nothing new passes an empty list
+    messages = state.get(MESSAGES_KEY)
+    if messages is None:
+        messages = store.messages()
+    messages = shard_messages(state, messages, shard, shards)
+
+    # Media results are shared with DelayAgent for the rest of the run
+    cache = run_cache(callback_context.invocation_id)
+    triage = triage_messages(
+        messages,
+        transcribe=cache.wrap(transcribe_audio_mock),
+        analyze=cache.wrap(analyze_image_mock),
+    )
+    confirmed = json.dumps(triage["findings"])
+    state[shard_key(SAFETY_CONFIRMED_KEY, shard)] = confirmed
+    state[shard_key(SAFETY_AMBIGUOUS_KEY, shard)] = json.dumps(triage["ambiguous"])
+    state[shard_key("safety_findings", shard)] = confirmed
+
+    if not triage["ambiguous"]:
+        return types.Content(role="model", parts=[types.Part(text=confirmed)])
+    return None
+
+
+def build_safety_agent(retry_config, shard: Optional[int] = None, shards: int = 1):
     """
     Safety agent checks:
     - Audio urgency via transcription (MCP tool)
     - Image evidence via image analysis (MCP tool)
     - Text messages for safety keywords
+
+    Keyword and urgency scoring is done by tools.safety_engine; the model
+    only reviews the messages the engine marks as ambiguous.
+
+    With a shard number the agent covers only that shard's workers and is
+    named SafetyAgent_shard<N>.
     """
     return LlmAgent(
-        name="SafetyAgent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        name=shard_key("SafetyAgent", shard),
+        model=ScheduledGemini(
+            model="gemini-2.5-flash-lite",
+            retry_options=retry_config,
+            priority=PRIORITY_SAFETY,
+        ),
         instruction="""
-Scan session.state messages. For each message:
+session.state messages have already been scanned for safety keywords
+("accident", "danger", "help", "shock", "injury", Hinglish terms), audio
+urgency and image evidence.
+
+Confirmed findings (include ALL of these unchanged):
+{%s?}
 
-1. If type = "audio":
-    - Call transcribe_audio_mock(audio_id)
-    - If urgency is medium/high OR translated_text contains danger keywords:
-        Add to findings.
+Ambiguous messages (evidence = text, transcript or image note):
+{%s?}
 
-2. If type = "image":
-    - Call analyze_image_mock(image_id)
-    - If reuse_score > 0.7 OR note indicates accident/wrong location:
-        Add to findings.
+For each ambiguous message, decide whether it is a real safety issue
+(injury, accident, danger to the worker, urgent need for help).
+If it is, add a finding for it. Ignore messages that are only about
+delays, equipment or customers.
 
-3. If type = "text":
-    - Check for keywords: "accident", "danger", "help", "shock", "injury".
+If you need more detail, call transcribe_audio_batch(audio_ids) and/or
+analyze_image_batch(image_ids) ONCE with all the ids you need, not once per id.
 
 Output a JSON ARRAY:
 [
@@ -42,7 +100,8 @@ Output a JSON ARRAY:
 STRICT RULES:
 - Output ONLY raw JSON
 - No markdown, no text outside JSON
-""",
-        tools=[transcribe_audio_mock, analyze_image_mock],
-        output_key="safety_findings",
+""" % (shard_key(SAFETY_CONFIRMED_KEY, shard), shard_key(SAFETY_AMBIGUOUS_KEY, shard)),
+        tools=cached_media_tools(),
+        before_agent_callback=partial(run_safety_triage, shard=shard, shards=shards),
+        output_key=shard_key("safety_findings", shard),
     )
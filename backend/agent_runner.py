@@ -2,8 +2,6 @@ import asyncio
 from dotenv import load_dotenv
 import os
 
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory import InMemoryMemoryService
 from google.adk.plugins.logging_plugin import LoggingPlugin
 from google.adk.runners import Runner
 from google.adk.apps.app import App
@@ -11,12 +9,12 @@ from google.genai import types
 
 # Import your orchestrator
 from agents.orchestrator import build_orchestrator_agent
+from backend.sqlite_services import create_services
 
 load_dotenv()
 
-# Create global services (persistent across requests)
-session_service = InMemorySessionService()
-memory_service = InMemoryMemoryService()
+# Create global services (persistent across requests; SQLite when SESSION_DB_PATH is set)
+session_service, memory_service = create_services()
 
 # Build retry config once
 retry_config = types.HttpRetryOptions(
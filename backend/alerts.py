@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+from agents.metrics import Counter, Gauge, Histogram, registry
+from tools.data_store import store
+from tools.safety_engine import alerts_for
+
+logger = logging.getLogger(__name__)
+
+# Alerts waiting to be sent to one dashboard before the oldest are dropped
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "100"))
+# Recent alerts a dashboard gets when it connects
+ALERT_HISTORY_SIZE = int(os.getenv("ALERT_HISTORY_SIZE", "20"))
+# How often to check the message log for messages other worker processes ingested
+ALERT_POLL_SECONDS = float(os.getenv("ALERT_POLL_SECONDS", "0.5"))
+
+alerts_total = registry.register(Counter(
+    "safety_alerts_total", "Safety alerts raised for ingested messages.", ("urgency",)))
+alerts_dropped_total = registry.register(Counter(
+    "safety_alerts_dropped_total", "Alerts dropped because a dashboard fell behind."))
+alert_delivery_seconds = registry.register(Histogram(
+    "safety_alert_delivery_seconds", "Time from an alert being raised to it being sent to a dashboard."))
+
+
+class AlertClient:
+    """One connected dashboard: a bounded queue of alerts to send."""
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.dropped = 0
+
+    def offer(self, frame: dict):
+        # A slow dashboard loses its oldest alerts, never blocks ingestion
+        while self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            alerts_dropped_total.inc()
+        self.queue.put_nowait(frame)
+
+
+class AlertHub:
+    """
+    Fans safety alerts out to every connected dashboard.
+
+    Each client has its own bounded queue, so publish() never waits on a
+    slow or stuck socket: when a queue is full its oldest alert is dropped.
+    The last few alerts are kept and replayed to clients as they connect.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(self, queue_size: int = ALERT_QUEUE_SIZE, history_size: int = ALERT_HISTORY_SIZE):
+        self.queue_size = queue_size
+        self._clients = set()
+        self._history = deque(maxlen=history_size)
+        self.published = 0
+
+    def publish(self, alerts: list):
+        now = time.monotonic()
+        for alert in alerts:
+            frame = {"alert": alert, "raised_at": now}
+            self._history.append(frame)
+            self.published += 1
+            alerts_total.inc(urgency=alert.get("urgency", ""))
+            for client in self._clients:
+                client.offer(frame)
+
+    @contextmanager
+    def subscribe(self):
+        """An AlertClient, pre-filled with recent alerts, for the duration of a connection."""
+        client = AlertClient(self.queue_size)
+        for frame in self._history:
+            client.offer({**frame, "replay": True})
+        self._clients.add(client)
+        try:
+            yield client
+        finally:
+            self._clients.discard(client)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "published": self.published,
+            "dropped": sum(c.dropped for c in self._clients),
+            "queued": sum(c.queue.qsize() for c in self._clients),
+        }
+
+
+class AlertFeed:
+    """
+    Publishes alerts for every message appended to the shared message log,
+    whichever worker process ingested it, so dashboards connected to any
+    worker see them all. Messages already in the log at start() are not
+    alerted. poke() checks right away instead of at the next poll.
+    """
+
+    def __init__(self, hub: AlertHub, poll_seconds: float = ALERT_POLL_SECONDS):
+        self.hub = hub
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._position = None
+
+    def start(self):
+        if self._task is None:
+            self._position = store.log.tail()[0]
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def poke(self):
+        self._wake.set()
+
+    def check(self) -> list:
+        """Alerts for messages logged since the last check (blocking; file reads)."""
+        self._position, messages = store.log.tail(self._position)
+        return alerts_for(messages)
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                self.hub.publish(await asyncio.to_thread(self.check))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Checking the message log for alerts failed")
+
+
+alert_hub = AlertHub()
+alert_feed = AlertFeed(alert_hub)
+
+registry.register(Gauge(
+    "safety_alert_clients", "Dashboards connected to /ws/alerts.",
+    collect=lambda: {(): alert_hub.stats()["clients"]},
+))
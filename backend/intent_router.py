@@ -0,0 +1,384 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from tools.data_store import MessageCursor, store
+from tools.delay_engine import detect_delays
+from tools.digest import digests
+from tools.safety_engine import triage_messages
+
+# Intents answered without a model. "workflow" starts the multi-agent run,
+# "chat" goes to CoreAgent.
+WORKFLOW = "workflow"
+CHAT = "chat"
+DELAYS = "delays"
+SAFETY = "safety"
+MESSAGES = "messages"
+WORKER_STATUS = "worker_status"
+
+FAST_INTENTS = (DELAYS, SAFETY, MESSAGES, WORKER_STATUS)
+
+# The classifier must be at least this sure before skipping the model, and
+# at least this share of the message's words must be ones it was trained on
+MIN_CONFIDENCE = 0.8
+MIN_COVERAGE = 0.5
+
+
+# =====================================================================
+# Patterns
+# =====================================================================
+
+WORKFLOW_KEYWORDS = [
+    "run analysis",
+    "run workflow",
+    "full analysis",
+    "complete analysis",
+    "analyze everything",
+    "scan everything",
+    "run full scan",
+    "execute workflow",
+]
+
+# Checked on its own, before the other intents: a workflow keyword anywhere
+# in the message starts the workflow, even after another intent's phrase
+_workflow_re = re.compile("|".join(re.escape(k) for k in WORKFLOW_KEYWORDS))
+
+_PATTERNS = [
+    (DELAYS, r"\bwho(?:'s| is| are)? (?:delayed|late|running late|behind|stuck)\b"
+             r"|\bany(?:one|body| workers?)? (?:delayed|late|running late|delays?|stuck)\b"
+             r"|\b(?:show|list|check)(?: the)? delays\b|^delays\W*$"),
+    (SAFETY, r"\bany (?:safety|accidents?|emergenc(?:y|ies)|injur(?:y|ies))\b"
+             r"|\bsafety (?:issues?|alerts?|check|status|problems?)\b|\bcheck(?: for)? safety\b"
+             r"|\b(?:any|some)(?:one|body) (?:been |got |get )?(?:hurt|injured)\b"),
+    (MESSAGES, r"\b(?:scan|show|list|read|summari[sz]e|check)(?: the| all| latest)?(?: worker)? messages\b"
+               r"|\blatest messages\b"),
+    (WORKER_STATUS, r"\bworker status\b|\bstatus of (?:all |the )?workers\b|\bhow is w\d+\b"
+                    r"|\bstatus (?:of|for) w\d+\b|\bwhat(?:'s| is) happening\b|\bw\d+ status\b"),
+]
+
+_pattern_re = re.compile(
+    "|".join(f"(?P<{intent}>{pattern})" for intent, pattern in _PATTERNS)
+)
+
+# Words that ask for reasoning or writing; the canned answers can't do that
+_OPEN_ENDED_RE = re.compile(
+    r"\b(?:why|should|explain|draft|write|compose|suggest|recommend|compare|predict|plan|if)\b"
+)
+_WORKER_ID_RE = re.compile(r"\bw\d+\b")
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+# =====================================================================
+# Classifier
+# =====================================================================
+
+# Seed phrasings per intent, for messages the patterns don't catch
+_TRAINING = {
+    DELAYS: [
+        "is anyone running behind schedule",
+        "which workers are late today",
+        "are there any delays",
+        "who hasn't reached their task on time",
+        "anybody stuck or late",
+        "delayed workers",
+        "who is behind schedule",
+        "show me late workers",
+        "is somebody stuck on the road",
+        "traffic problems for any worker",
+    ],
+    SAFETY: [
+        "has anyone been hurt",
+        "any accidents reported",
+        "is everyone safe",
+        "any emergencies right now",
+        "safety alerts please",
+        "did someone get injured",
+        "are there any dangerous situations",
+        "anyone need help urgently",
+        "is somebody hurt or injured",
+    ],
+    MESSAGES: [
+        "what did workers say",
+        "show recent messages",
+        "summarize what workers reported",
+        "any new messages from the field",
+        "read me the worker updates",
+        "latest updates from workers",
+        "what are workers reporting",
+        "what have the workers been telling us",
+    ],
+    WORKER_STATUS: [
+        "how are the workers doing",
+        "give me a status overview",
+        "what is everyone working on",
+        "status update",
+        "overview of the team",
+        "how is the field team doing",
+        "where is everyone right now",
+    ],
+    CHAT: [
+        "why is the customer angry",
+        "what should i tell the customer about the delay",
+        "draft a message to the worker",
+        "can you reassign the task to someone else",
+        "explain the reuse score",
+        "what does urgency medium mean",
+        "hello",
+        "thanks",
+        "who should take over the pickup",
+        "compare this week with last week",
+        "help me plan tomorrow",
+        "what can you do",
+    ],
+}
+
+
+def _features(text: str) -> list:
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class NaiveBayes:
+    """Multinomial naive Bayes over word unigrams and bigrams."""
+
+    def __init__(self, examples: dict):
+        self.labels = list(examples)
+        self._counts = {label: Counter() for label in self.labels}
+        self._totals = {}
+        vocab = set()
+        for label, texts in examples.items():
+            for text in texts:
+                feats = _features(text)
+                self._counts[label].update(feats)
+                vocab.update(feats)
+            self._totals[label] = sum(self._counts[label].values())
+        self.vocab = vocab
+        self._vocab_size = len(vocab)
+        n = sum(len(texts) for texts in examples.values())
+        self._priors = {label: math.log(len(texts) / n) for label, texts in examples.items()}
+
+    def coverage(self, text: str) -> float:
+        """Share of the text's words seen in training."""
+        words = _TOKEN_RE.findall(text.lower())
+        return sum(w in self.vocab for w in words) / len(words) if words else 0.0
+
+    def predict(self, text: str) -> tuple:
+        """(label, posterior probability)."""
+        feats = _features(text)
+        scores = {}
+        for label in self.labels:
+            counts = self._counts[label]
+            denom = self._totals[label] + self._vocab_size
+            scores[label] = self._priors[label] + sum(
+                math.log((counts[f] + 1) / denom) for f in feats
+            )
+        best = max(scores, key=scores.get)
+        norm = sum(math.exp(s - scores[best]) for s in scores.values())
+        return best, 1 / norm
+
+
+classifier = NaiveBayes(_TRAINING)
+
+
+# =====================================================================
+# Routing
+# =====================================================================
+
+@dataclass
+class Route:
+    intent: str
+    # "pattern", "classifier" or "fallback"
+    method: str
+    confidence: float = 1.0
+    worker_id: Optional[str] = None
+
+
+def route(message: str) -> Route:
+    """Pick an intent for a message: patterns first, then the classifier."""
+    text = message.lower().strip()
+    m = _WORKER_ID_RE.search(text)
+    worker_id = m.group().upper() if m else None
+
+    if _workflow_re.search(text):
+        return Route(WORKFLOW, "pattern")
+
+    if _OPEN_ENDED_RE.search(text):
+        return Route(CHAT, "fallback")
+
+    match = _pattern_re.search(text)
+    if match:
+        return Route(match.lastgroup, "pattern", worker_id=worker_id)
+
+    if classifier.coverage(text) < MIN_COVERAGE:
+        return Route(CHAT, "fallback", 0.0)
+
+    intent, confidence = classifier.predict(text)
+    if intent in FAST_INTENTS and confidence >= MIN_CONFIDENCE:
+        return Route(intent, "classifier", confidence, worker_id)
+    return Route(CHAT, "fallback", confidence)
+
+
+# =====================================================================
+# Canned answers (from indexed data, cached per data version)
+# =====================================================================
+
+# Items listed in one canned answer; the rest are counted
+FAST_ANSWER_MAX_ITEMS = int(os.getenv("FAST_ANSWER_MAX_ITEMS", "10"))
+
+_URGENCY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+class _RuleScan:
+    """
+    Delay and safety rule results over all messages, extended with each
+    batch of new ones instead of rescanning everything. Starts over when
+    the calendar changes or a message arrives out of time order.
+    """
+
+    def __init__(self):
+        self._cursor = MessageCursor(store, ("calendar",))
+        self._reset()
+
+    def _reset(self):
+        self.delays = []
+        self._delay_seen = set()
+        self.safety = []
+        self.ambiguous = 0
+
+    def update(self):
+        restart, messages = self._cursor.read()
+        if restart:
+            self._reset()
+        if messages:
+            self.delays += detect_delays(messages, store.calendar(), seen=self._delay_seen)
+            triage = triage_messages(messages)
+            self.safety += triage["findings"]
+            self.ambiguous += len(triage["ambiguous"])
+
+
+_scan = _RuleScan()
+
+
+def _more(total: int, shown: int, what: str) -> list:
+    return [f"…and {total - shown} more {what}."] if total > shown else []
+
+
+def _worker_label(worker_id: str) -> str:
+    worker = store.worker(worker_id)
+    return f"{worker_id} ({worker['name']})" if worker and worker.get("name") else worker_id
+
+
+def _answer_delays() -> str:
+    rows = _scan.delays
+    if not rows:
+        return "No delays detected right now."
+    # Most recent first
+    shown = rows[:-FAST_ANSWER_MAX_ITEMS - 1:-1]
+    lines = [f"⏰ {len(rows)} delay signal(s):"]
+    for r in shown:
+        lines.append(f"• {_worker_label(r['worker_id'])} on {r['task_id']}: {r['reason']}")
+        lines.append(f"  → {r['suggested_action']}")
+    return "\n".join(lines + _more(len(rows), len(shown), "older delay signal(s)"))
+
+
+def _answer_safety() -> str:
+    findings, ambiguous = _scan.safety, _scan.ambiguous
+    if not findings and not ambiguous:
+        return "No safety issues detected."
+    lines = []
+    if findings:
+        # Most urgent first, newest first within each urgency
+        ranked = sorted(reversed(findings), key=lambda f: _URGENCY_RANK.get(f["urgency"], len(_URGENCY_RANK)))
+        shown = ranked[:FAST_ANSWER_MAX_ITEMS]
+        high = sum(f["urgency"] == "high" for f in findings)
+        lines.append(f"⚠️ SAFETY ALERTS ({len(findings)}, {high} high urgency):")
+        for f in shown:
+            lines.append(f"• [{f['urgency'].upper()}] {_worker_label(f['worker_id'])}: {f['issue']}")
+            lines.append(f"  → {f['recommended_action']}")
+        lines += _more(len(findings), len(shown), "alert(s)")
+    if ambiguous:
+        lines.append(
+            f"{ambiguous} more message(s) may be safety-related; "
+            "say \"run analysis\" for a full review."
+        )
+    return "\n".join(lines)
+
+
+def _answer_messages() -> str:
+    workers = [d for d in digests()["workers"].values() if d["messages"]]
+    if not workers:
+        return "No worker messages yet."
+    # Workers who wrote most recently first
+    shown = sorted(workers, key=lambda d: d["latest"]["time"], reverse=True)[:FAST_ANSWER_MAX_ITEMS]
+    lines = [f"Recent messages from {len(workers)} worker(s):"]
+    for d in shown:
+        flagged = f" — {len(d['flagged'])} flagged" if d["flagged"] else " — no issues"
+        lines.append(
+            f"• {_worker_label(d['worker_id'])}: '{d['latest']['summary']}' "
+            f"({d['latest']['time'][11:16]}){flagged}"
+        )
+    return "\n".join(lines + _more(len(workers), len(shown), "worker(s)"))
+
+
+def _worker_status_line(d: dict) -> str:
+    tasks = ", ".join(f"{t['task_id']} {t['window']} @ {t['location']}" for t in d["tasks"]) or "no tasks"
+    latest = f"last: '{d['latest']['summary']}' ({d['latest']['time'][11:16]})" if d["latest"] else "no messages"
+    flags = f"; ⚠️ {len(d['flagged'])} flagged" if d["flagged"] else ""
+    return f"• {_worker_label(d['worker_id'])} [{d['status']}] — {tasks}; {latest}{flags}"
+
+
+def _answer_worker_status(worker_id: Optional[str] = None) -> str:
+    data = digests()["workers"]
+    if worker_id:
+        d = data.get(worker_id)
+        if d is None:
+            return f"I don't have a worker {worker_id}."
+        lines = [_worker_status_line(d)]
+        shown = d["flagged"][-FAST_ANSWER_MAX_ITEMS:]
+        for e in shown:
+            lines.append(f"  - {e['time'][11:16]} {e['summary']} [{', '.join(e['flags'])}]")
+        return "\n".join(lines + _more(len(d["flagged"]), len(shown), "earlier flagged message(s)"))
+    # Workers with the most flagged messages first
+    shown = sorted(data.values(), key=lambda d: len(d["flagged"]), reverse=True)[:FAST_ANSWER_MAX_ITEMS]
+    lines = [f"Status of {len(data)} worker(s):"] + [_worker_status_line(d) for d in shown]
+    if len(data) > len(shown):
+        lines.append(f"…and {len(data) - len(shown)} more; ask about one, e.g. \"how is {shown[-1]['worker_id']}\".")
+    return "\n".join(lines)
+
+
+_ANSWERS = {
+    DELAYS: _answer_delays,
+    SAFETY: _answer_safety,
+    MESSAGES: _answer_messages,
+}
+
+_lock = threading.Lock()
+# (data fingerprint, {intent: answer})
+_cached = (None, {})
+
+
+def answer(r: Route) -> Optional[str]:
+    """
+    Canned answer for a fast intent, or None if the message needs the model.
+    Blocking (catches up with new data); call it from a worker thread.
+    """
+    global _cached
+    if r.intent not in FAST_INTENTS:
+        return None
+    if r.intent == WORKER_STATUS and r.worker_id:
+        return _answer_worker_status(r.worker_id)
+
+    fingerprint = store.fingerprint()
+    with _lock:
+        if _cached[0] != fingerprint:
+            _cached = (fingerprint, {})
+        answers = _cached[1]
+        if r.intent not in answers:
+            if r.intent in (DELAYS, SAFETY):
+                _scan.update()
+            answers[r.intent] = _ANSWERS.get(r.intent, _answer_worker_status)()
+        return answers[r.intent]
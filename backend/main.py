@@ -1,53 +1,118 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Body, FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from .shared_runner import runner, session_service, memory_service
+from .shared_runner import (
+    get_runner,
+    session_service,
+    warm_up,
+    workflow_cache,
+    workflow_cache_key,
+    workflow_flight,
+)
+from .alerts import alert_delivery_seconds, alert_feed, alert_hub
+from .report_scheduler import ReportScheduler
+from agents.metrics import registry as metrics_registry
+from agents.model_cache import response_cache
+from agents.model_scheduler import scheduler
+from tools.data_store import store
+from tools.message_log import MESSAGE_LOG_COMPACT_BYTES
+from . import intent_router
+from tools.json_extract import extract_json, findings_validator
+from google.adk.events import Event
 from google.genai import types
 
+import asyncio
 import json
 import re
+import time
+import uuid
 from pathlib import Path
+from typing import Optional, Union
 import os
 
 
 # =====================================================================
-# JSON Extraction Helpers
+# Event Helpers
 # =====================================================================
 
-_json_fence_re = re.compile(r"```json\s*(\[.*?\]|\{.*?\})\s*```", re.DOTALL)
-_json_any_re = re.compile(r"(\{.*\}|\[.*\])", re.DOTALL)
+FINDINGS_KEYS = ("delay_findings", "safety_findings", "final_report")
 
+# Agent that writes each findings key, for replaying cached results
+FINDINGS_AUTHORS = {
+    "delay_findings": "DelayAgent",
+    "safety_findings": "SafetyAgent",
+    "final_report": "ReportAgent",
+}
 
-def extract_json(text: str):
-    """Extract JSON from LLM output, even if inside ```json ...```"""
-    if not text:
-        return None
 
-    m = _json_fence_re.search(text)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except:
-            pass
+def findings_in(event) -> dict:
+    """Structured outputs an event writes to session.state (via output_key or callbacks)."""
+    delta = event.actions.state_delta if event.actions else None
+    if not delta:
+        return {}
+    found = {}
+    for key in FINDINGS_KEYS:
+        if key in delta:
+            raw = delta[key]
+            parsed = extract_json(raw, findings_validator(key)) if isinstance(raw, str) else None
+            found[key] = raw if parsed is None else parsed
+    return found
+
+
+# Sharded specialists write e.g. delay_findings_shard2 before they are merged
+_SHARD_FINDINGS_RE = re.compile(r"^(delay_findings|safety_findings)_shard(\d+)$")
+
+
+def shard_findings_in(event) -> dict:
+    """Per-shard findings an event writes, keyed by their state key."""
+    delta = event.actions.state_delta if event.actions else None
+    if not delta:
+        return {}
+    found = {}
+    for key, raw in delta.items():
+        match = _SHARD_FINDINGS_RE.match(key)
+        if match:
+            parsed = extract_json(raw, findings_validator(match.group(1))) if isinstance(raw, str) else None
+            found[key] = raw if parsed is None else parsed
+    return found
+
+
+def event_text(event) -> str:
+    """Last text part of a complete (non-partial) event, or ''."""
+    if event.partial or not event.content or not event.content.parts:
+        return ""
+    text = ""
+    for p in event.content.parts:
+        if p.text:
+            text = p.text
+    return text
 
-    m = _json_any_re.search(text)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except:
-            pass
 
-    return None
+def sse(event_type: str, data) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 # =====================================================================
 # FastAPI App Setup
 # =====================================================================
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up()
+    report_scheduler.start()
+    alert_feed.start()
+    yield
+    await alert_feed.stop()
+    await report_scheduler.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -58,37 +123,34 @@ app.add_middleware(
 )
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
 FRONTEND_DIR = BASE_DIR / "frontend"
 
+# Serve the background report to workflow requests when it is at most this
+# old; 0 always runs (or reuses a cached run over the same data)
+RUN_AGENT_REPORT_MAX_AGE_SECONDS = float(os.getenv("RUN_AGENT_REPORT_MAX_AGE_SECONDS", "0"))
+
+
 class AgentRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None
+    user_id: Optional[str] = None
+    # Overrides RUN_AGENT_REPORT_MAX_AGE_SECONDS for this request
+    max_report_age_seconds: Optional[float] = None
 
 
 # =====================================================================
-# Workflow Trigger Logic - FIXED VERSION
+# Intent routing (see backend/intent_router.py)
 # =====================================================================
 
-def should_trigger_workflow(message: str) -> bool:
-    """
-    Only trigger full workflow for explicit analysis requests.
-    Simple status queries should go to CoreAgent.
-    """
-    message = message.lower().strip()
-
-    # ONLY these phrases trigger the full workflow
-    full_workflow_keywords = [
-        "run analysis",
-        "run workflow", 
-        "full analysis",
-        "complete analysis",
-        "analyze everything",
-        "scan everything",
-        "run full scan",
-        "execute workflow"
-    ]
-
-    return any(k in message for k in full_workflow_keywords)
+async def record_fast_answer(session, message: str, answer: str):
+    """Keep a canned answer in the chat session so CoreAgent sees it on follow-ups."""
+    invocation_id = f"e-{uuid.uuid4()}"
+    for author, role, text in (("user", "user", message), ("CoreAgent", "model", answer)):
+        await session_service.append_event(session, Event(
+            invocation_id=invocation_id,
+            author=author,
+            content=types.Content(role=role, parts=[types.Part(text=text)]),
+        ))
 
 
 # =====================================================================
@@ -107,15 +169,164 @@ async def get_data():
     try:
         return {
             "success": True,
-            "workers": json.loads((DATA_DIR / "workers.json").read_text()).get("workers", []),
-            "tasks": json.loads((DATA_DIR / "tasks.json").read_text()).get("tasks", []),
-            "messages": json.loads((DATA_DIR / "messages.json").read_text()).get("messages", []),
-            "calendar": json.loads((DATA_DIR / "calendar.json").read_text()).get("worker_calendar", []),
+            "workers": store.workers(),
+            "tasks": store.tasks(),
+            "messages": store.messages(),
+            "calendar": store.calendar(),
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+# ---------------------  MESSAGE INGESTION ENDPOINTS  -------------------
+
+# Background compaction of the message log, when one is running
+_compaction: Optional[asyncio.Task] = None
+
+
+def _maybe_compact():
+    """Start compacting the message log once it passes MESSAGE_LOG_COMPACT_BYTES."""
+    global _compaction
+    if store.log.active_bytes < MESSAGE_LOG_COMPACT_BYTES:
+        return
+    if _compaction is None or _compaction.done():
+        _compaction = asyncio.create_task(asyncio.to_thread(store.compact_messages))
+
+
+@app.post("/api/messages")
+async def post_messages(payload: Union[dict, list] = Body(...)):
+    """
+    Ingest worker messages: one message object, a list of them, or
+    {"messages": [...]}. Each needs worker_id and type (text/audio/image)
+    with text/audio_id/image_id; msg_id and time are filled in if missing.
+    All-or-nothing: one invalid message rejects the batch.
+    """
+    if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+        messages = payload["messages"]
+    else:
+        messages = payload if isinstance(payload, list) else [payload]
+    try:
+        # File writes and the cross-process log lock stay off the event loop
+        accepted = await asyncio.to_thread(store.append_messages, messages)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    _maybe_compact()
+    # Rules only, so alerts go out now rather than after the next workflow run;
+    # the feed publishes them, in every worker process
+    alert_feed.poke()
+    report_scheduler.poke()
+    return {
+        "success": True,
+        "accepted": len(accepted),
+        "msg_ids": [m["msg_id"] for m in accepted],
+    }
+
+
+@app.post("/api/messages/compact")
+async def compact_messages():
+    """Fold the message log into data/messages.json now."""
+    compacted = await asyncio.to_thread(store.compact_messages)
+    return {"success": True, "compacted": compacted}
+
+
+# -------------------------  LIVE SAFETY ALERTS  -------------------------
+
+@app.websocket("/ws/alerts")
+async def alerts_socket(websocket: WebSocket):
+    """
+    Pushes a frame for every ingested message the safety rules flag
+    (high-urgency audio, accident notes, danger keywords), whichever
+    worker process took the message in:
+
+        {"event": "alert", "data": {msg_id, worker_id, type, time, urgency,
+                                    score, evidence, hits, recommended_action},
+         "replay": bool, "dropped": int}
+
+    Recent alerts are replayed on connect. dropped counts alerts this
+    client missed because it fell behind. Anything the client sends is ignored.
+    """
+    await websocket.accept()
+    with alert_hub.subscribe() as client:
+        async def send():
+            while True:
+                frame = await client.queue.get()
+                await websocket.send_json({
+                    "event": "alert",
+                    "data": frame["alert"],
+                    "replay": frame.get("replay", False),
+                    "dropped": client.dropped,
+                })
+                if not frame.get("replay"):
+                    alert_delivery_seconds.observe(time.monotonic() - frame["raised_at"])
+
+        async def receive():
+            # Only here to notice the client going away
+            while True:
+                await websocket.receive_text()
+
+        tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+        try:
+            # Ends on disconnect (WebSocketDisconnect) or a failed send
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+@app.get("/api/alerts/stats")
+async def get_alert_stats():
+    """Connected dashboards, alerts raised, and alerts queued or dropped."""
+    return {"success": True, **alert_hub.stats()}
+
+
+# ----------------------  SESSION STATS ENDPOINT  ----------------------
+
+@app.get("/api/sessions/stats")
+async def get_session_stats():
+    """Live session counts and approximate memory held by sessions."""
+    return {"success": True, **(await session_service.stats())}
+
+
+# -------------------  WORKFLOW CACHE STATS ENDPOINT  ------------------
+
+@app.get("/api/workflow-cache/stats")
+async def get_workflow_cache_stats():
+    """Hit/miss counts and size of the workflow result cache, and coalesced runs."""
+    return {
+        "success": True,
+        **workflow_cache.stats(),
+        "single_flight": workflow_flight.stats(),
+        "report_scheduler": report_scheduler.stats(),
+    }
+
+
+# --------------------  MODEL SCHEDULER STATS ENDPOINT  -----------------
+
+@app.get("/api/models/stats")
+async def get_model_stats():
+    """Model calls running and queued, by priority, their wait times, and
+    response cache hit rate (null unless LLM_CACHE_PATH is set)."""
+    cache = response_cache()
+    return {
+        "success": True,
+        **scheduler.stats(),
+        "response_cache": await cache.stats() if cache else None,
+    }
+
+
+# --------------------------  METRICS ENDPOINT  -------------------------
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text format: per-run, per-agent, per-model-call and per-tool
+    latency histograms, token usage, retries, errors and scheduler queueing."""
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ----------------------  TOOL DASHBOARD ENDPOINT  ---------------------
 
 @app.get("/api/tools")
@@ -148,6 +359,30 @@ async def get_tools():
                 "last_used": None,
                 "result": None
             },
+            {
+                "name": "get_digest",
+                "type": "FunctionTool",
+                "status": "idle",
+                "returns": "dict(workers=[{tasks, latest, flagged}], omitted_workers)",
+                "last_used": None,
+                "result": None
+            },
+            {
+                "name": "get_worker_digest",
+                "type": "FunctionTool",
+                "status": "idle",
+                "returns": "dict(worker_id, tasks, latest, flagged, omitted_flagged)",
+                "last_used": None,
+                "result": None
+            },
+            {
+                "name": "get_flagged_events",
+                "type": "FunctionTool",
+                "status": "idle",
+                "returns": "dict(events=[{msg_id, worker_id, time, summary, flags}], omitted_older)",
+                "last_used": None,
+                "result": None
+            },
             {
                 "name": "analyze_image_mock",
                 "type": "FunctionTool",
@@ -164,6 +399,22 @@ async def get_tools():
                 "last_used": None,
                 "result": None
             },
+            {
+                "name": "analyze_image_batch",
+                "type": "FunctionTool",
+                "status": "idle",
+                "returns": "dict(image_id -> analyze_image_mock result)",
+                "last_used": None,
+                "result": None
+            },
+            {
+                "name": "transcribe_audio_batch",
+                "type": "FunctionTool",
+                "status": "idle",
+                "returns": "dict(audio_id -> transcribe_audio_mock result)",
+                "last_used": None,
+                "result": None
+            },
             {
                 "name": "approve_reassignment",
                 "type": "FunctionTool",
@@ -180,114 +431,198 @@ async def get_tools():
 
 
 # =====================================================================
-# MAIN AGENT ROUTE (Workflow + Chat) - FIXED VERSION
+# WORKFLOW RUNS (cached + coalesced)
 # =====================================================================
 
-@app.post("/run_agent")
-async def run_agent(request: AgentRequest):
-    try:
-        # ==============================================================
-        # CASE 1 — FULL WORKFLOW TRIGGERED (only for explicit requests)
-        # ==============================================================
-        if should_trigger_workflow(request.message):
+async def run_workflow(user_id: str, session_id: str, message: str, on_event=None) -> dict:
+    """One full workflow run; returns its final text and findings."""
+    await session_service.ensure_session(
+        app_name="agents",
+        user_id=user_id,
+        session_id=session_id
+    )
 
-            session_id = "workflow-session"
+    user_msg = types.Content(
+        role="user",
+        parts=[types.Part(text=message)]
+    )
 
-            try:
-                await session_service.create_session(
-                    app_name="agents",
-                    user_id="web-user",
-                    session_id=session_id
-                )
-            except:
-                pass
+    result = {"response": "", **{key: None for key in FINDINGS_KEYS}}
+    async for event in get_runner("workflow").run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=user_msg
+    ):
+        if on_event is not None:
+            on_event(event)
 
-            user_msg = types.Content(
-                role="user",
-                parts=[types.Part(text=request.message)]
-            )
+        # --- structured outputs ---
+        result.update(findings_in(event))
 
-            final_text = ""
-            delay_findings = None
-            safety_findings = None
-            final_report = None
+        # --- final LLM output ---
+        text = event_text(event)
+        if text:
+            result["response"] = text
 
-            async for event in runner.run_async(
-                user_id="web-user",
-                session_id=session_id,
-                new_message=user_msg
-            ):
-                # --- structured outputs ---
-                if getattr(event, "output_key", None) == "delay_findings":
-                    raw = event.content.parts[0].text if event.content else ""
-                    delay_findings = extract_json(raw) or raw
+    return result
 
-                if getattr(event, "output_key", None) == "safety_findings":
-                    raw = event.content.parts[0].text if event.content else ""
-                    safety_findings = extract_json(raw) or raw
 
-                if getattr(event, "output_key", None) == "final_report":
-                    raw = event.content.parts[0].text if event.content else ""
-                    final_report = extract_json(raw) or raw
+def start_workflow(cache_key: tuple, user_id: str, session_id: str, message: str, on_event=None):
+    """
+    Attach to the in-flight run for cache_key, or start one in this session.
 
-                # --- final LLM output ---
-                if event.content and event.content.parts:
-                    for p in event.content.parts:
-                        if p.text:
-                            final_text = p.text
+    Returns (task, leader). Only the leader's on_event sees the run's events,
+    followed by None when the run ends. A run that produced a report is cached.
+    """
+    async def run():
+        try:
+            result = await run_workflow(user_id, session_id, message, on_event)
+        finally:
+            if on_event is not None:
+                on_event(None)
+        if result["final_report"] is not None:
+            workflow_cache.put(cache_key, result)
+        return result
+
+    return workflow_flight.start(cache_key, run)
+
+
+# =====================================================================
+# BACKGROUND REPORTS
+# =====================================================================
+
+async def run_scheduled_workflow(cache_key: tuple) -> dict:
+    """
+    Background run in its own session, so repeated runs are incremental.
+    A result already cached for this data (e.g. from a supervisor's run)
+    is taken as is.
+    """
+    result = workflow_cache.get(cache_key)
+    if result is not None:
+        return result
+    task, _ = start_workflow(cache_key, "scheduler", "scheduler:workflow", "run analysis")
+    # Requests may be attached to this run; stopping the scheduler mustn't cancel it
+    return await asyncio.shield(task)
+
+
+report_scheduler = ReportScheduler(run_scheduled_workflow, workflow_cache_key, state_dir=store.data_dir)
+
+
+def precomputed_report(request: AgentRequest) -> Optional[dict]:
+    """The background report, if the request accepts one of its age."""
+    max_age = request.max_report_age_seconds
+    if max_age is None:
+        max_age = RUN_AGENT_REPORT_MAX_AGE_SECONDS
+    if max_age <= 0:
+        return None
+    return report_scheduler.latest(max_age)
+
+
+@app.get("/api/report/latest")
+async def get_latest_report():
+    """
+    The most recent background workflow result (final_report, findings and
+    response) with when it was computed. current is false once the data
+    changed after that; a newer report is then on its way.
+    """
+    latest = report_scheduler.latest()
+    if latest is None:
+        return {
+            "success": False,
+            "error": "No report has been computed yet",
+            "running": report_scheduler.running,
+        }
+    return {
+        "success": True,
+        **latest["result"],
+        "computed_at": latest["computed_at"],
+        "age_seconds": latest["age_seconds"],
+        "current": latest["current"],
+        "running": report_scheduler.running,
+    }
+
+
+# =====================================================================
+# MAIN AGENT ROUTE (Workflow + Chat) - FIXED VERSION
+# =====================================================================
+
+@app.post("/run_agent")
+async def run_agent(request: AgentRequest):
+    # One conversation per client; workflow and chat keep separate ADK
+    # sessions under it so their histories don't mix.
+    user_id = request.user_id or "web-user"
+    conversation_id = request.session_id or uuid.uuid4().hex
+
+    try:
+        # ==============================================================
+        # CASE 1 — FULL WORKFLOW TRIGGERED (only for explicit requests)
+        # ==============================================================
+        routed = intent_router.route(request.message)
+        if routed.intent == intent_router.WORKFLOW:
+
+            # A recent enough background report is served as is
+            precomputed = precomputed_report(request)
+            if precomputed is not None:
+                return {
+                    "success": True,
+                    **precomputed["result"],
+                    "workflow_triggered": True,
+                    "session_id": conversation_id,
+                    "agents_completed": 4,
+                    "cached": True,
+                    "coalesced": False,
+                    "precomputed": True,
+                    "computed_at": precomputed["computed_at"],
+                    "report_age_seconds": precomputed["age_seconds"],
+                }
+
+            # Same data and agents as a previous run: reuse its result.
+            # Otherwise join a run already in progress, or start one.
+            cache_key = workflow_cache_key()
+            result = workflow_cache.get(cache_key)
+            cached = result is not None
+            coalesced = False
+
+            if result is None:
+                task, leader = start_workflow(
+                    cache_key, user_id, f"{conversation_id}:workflow", request.message
+                )
+                result = await asyncio.shield(task)
+                coalesced = not leader
 
             return {
                 "success": True,
-                "response": final_text,
-                "delay_findings": delay_findings,
-                "safety_findings": safety_findings,
-                "final_report": final_report,
+                **result,
                 "workflow_triggered": True,
-                "session_id": session_id,
-                "agents_completed": 4
+                "session_id": conversation_id,
+                "agents_completed": 4,
+                "cached": cached,
+                "coalesced": coalesced,
+                "precomputed": False,
             }
 
         # ==============================================================
-        # CASE 2 — NORMAL CHAT (CoreAgent with Tools)
+        # CASE 2 — NORMAL CHAT (canned answer, else CoreAgent with Tools)
         # ==============================================================
         else:
-            session_id = "chat-session"
+            session_id = f"{conversation_id}:chat"
 
-            try:
-                await session_service.create_session(
-                    app_name="agents",
-                    user_id="web-user",
-                    session_id=session_id
-                )
-            except:
-                pass
-
-            # Import tools for CoreAgent
-            from tools.data_loader import load_messages, load_calendar, load_tasks, load_workers
-            from agents.core_agent import build_core_agent
-            from google.adk.runners import Runner
-            from google.adk.apps.app import App
-            from google.adk.plugins.logging_plugin import LoggingPlugin
-
-            retry_cfg = types.HttpRetryOptions(attempts=3, exp_base=2, initial_delay=1)
-            
-            # Build CoreAgent with tools
-            core_agent = build_core_agent(retry_cfg)
-            
-            # Add tools to CoreAgent
-            core_agent.tools = [load_messages, load_calendar, load_tasks, load_workers]
-
-            chat_app = App(
-                name="agents",
-                root_agent=core_agent,
-                plugins=[LoggingPlugin()]
+            session = await session_service.ensure_session(
+                app_name="agents",
+                user_id=user_id,
+                session_id=session_id
             )
 
-            chat_runner = Runner(
-                app=chat_app,
-                session_service=session_service,
-                memory_service=memory_service
-            )
+            fast = await asyncio.to_thread(intent_router.answer, routed)
+            if fast is not None:
+                await record_fast_answer(session, request.message, fast)
+                return {
+                    "success": True,
+                    "response": fast,
+                    "workflow_triggered": False,
+                    "session_id": conversation_id,
+                    "intent": routed.intent,
+                }
 
             user_msg = types.Content(
                 role="user",
@@ -295,8 +630,8 @@ async def run_agent(request: AgentRequest):
             )
 
             response_text = ""
-            async for event in chat_runner.run_async(
-                user_id="web-user",
+            async for event in get_runner("chat").run_async(
+                user_id=user_id,
                 session_id=session_id,
                 new_message=user_msg
             ):
@@ -309,7 +644,8 @@ async def run_agent(request: AgentRequest):
                 "success": True,
                 "response": response_text,
                 "workflow_triggered": False,
-                "session_id": session_id
+                "session_id": conversation_id,
+                "intent": routed.intent,
             }
 
     except Exception as e:
@@ -321,6 +657,164 @@ async def run_agent(request: AgentRequest):
         }
 
 
+# =====================================================================
+# STREAMING AGENT ROUTE (Server-Sent Events)
+# =====================================================================
+
+def event_frames(event, started: set):
+    """SSE frames for one ADK event; `started` tracks agents already announced."""
+    agent = event.author
+    if agent and agent != "user" and agent not in started:
+        started.add(agent)
+        yield sse("agent_started", {"agent": agent})
+
+    for call in event.get_function_calls():
+        yield sse("tool_call", {"agent": agent, "name": call.name, "args": call.args})
+
+    for resp in event.get_function_responses():
+        yield sse("tool_result", {"agent": agent, "name": resp.name})
+
+    for key, value in shard_findings_in(event).items():
+        yield sse("shard_findings", {"agent": agent, "key": key, "value": value})
+
+    for key, value in findings_in(event).items():
+        yield sse(key, {"agent": agent, "value": value})
+
+    text = event_text(event)
+    if text:
+        yield sse("text", {"agent": agent, "text": text})
+
+
+def result_frames(result: dict):
+    """Findings frames replayed from a cached or shared workflow result."""
+    for key in FINDINGS_KEYS:
+        if result.get(key) is not None:
+            yield sse(key, {"agent": FINDINGS_AUTHORS[key], "value": result[key]})
+
+
+async def stream_agent_events(request: AgentRequest):
+    """
+    Same routing as /run_agent, but yields an SSE frame for each ADK event
+    as it arrives:
+
+        start           {workflow_triggered, session_id, cached, precomputed}
+        agent_started   {agent}
+        tool_call       {agent, name, args}
+        tool_result     {agent, name}
+        shard_findings  {agent, key, value}   one shard's findings, before the merge
+        delay_findings / safety_findings / final_report  {agent, value}
+        text            {agent, text}
+        done            {response, workflow_triggered, session_id, cached, coalesced, precomputed}
+        error           {error}
+
+    A cached or recent background workflow result, or one shared from a
+    run another request started, is replayed as its findings frames
+    followed by done.
+    """
+    user_id = request.user_id or "web-user"
+    conversation_id = request.session_id or uuid.uuid4().hex
+    routed = intent_router.route(request.message)
+    kind = "workflow" if routed.intent == intent_router.WORKFLOW else "chat"
+    session_id = f"{conversation_id}:{kind}"
+
+    precomputed = precomputed_report(request) if kind == "workflow" else None
+    cache_key = workflow_cache_key() if kind == "workflow" else None
+    cached = precomputed["result"] if precomputed else None
+    if cached is None and cache_key:
+        cached = workflow_cache.get(cache_key)
+
+    yield sse("start", {
+        "workflow_triggered": kind == "workflow",
+        "session_id": conversation_id,
+        "cached": cached is not None,
+        "precomputed": precomputed is not None,
+    })
+
+    try:
+        started = set()
+
+        if kind == "workflow":
+            leader = False
+            if cached is not None:
+                result = cached
+            else:
+                queue = asyncio.Queue()
+                task, leader = start_workflow(
+                    cache_key, user_id, session_id, request.message, queue.put_nowait
+                )
+                if leader:
+                    while (event := await queue.get()) is not None:
+                        for frame in event_frames(event, started):
+                            yield frame
+                result = await asyncio.shield(task)
+
+            if not leader:
+                for frame in result_frames(result):
+                    yield frame
+
+            yield sse("done", {
+                "response": result["response"],
+                "workflow_triggered": True,
+                "session_id": conversation_id,
+                "cached": cached is not None,
+                "coalesced": cached is None and not leader,
+                "precomputed": precomputed is not None,
+            })
+            return
+
+        session = await session_service.ensure_session(
+            app_name="agents",
+            user_id=user_id,
+            session_id=session_id
+        )
+
+        fast = await asyncio.to_thread(intent_router.answer, routed)
+        if fast is not None:
+            await record_fast_answer(session, request.message, fast)
+            yield sse("text", {"agent": "CoreAgent", "text": fast})
+            yield sse("done", {
+                "response": fast,
+                "workflow_triggered": False,
+                "session_id": conversation_id,
+                "intent": routed.intent,
+            })
+            return
+
+        user_msg = types.Content(
+            role="user",
+            parts=[types.Part(text=request.message)]
+        )
+
+        final_text = ""
+        async for event in get_runner(kind).run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=user_msg
+        ):
+            for frame in event_frames(event, started):
+                yield frame
+            final_text = event_text(event) or final_text
+
+        yield sse("done", {
+            "response": final_text,
+            "workflow_triggered": False,
+            "session_id": conversation_id,
+            "intent": routed.intent,
+        })
+
+    except Exception as e:
+        yield sse("error", {"error": str(e)})
+
+
+@app.post("/run_agent/stream")
+async def run_agent_stream(request: AgentRequest):
+    return StreamingResponse(
+        stream_agent_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 app.mount("/assets", StaticFiles(directory=str(FRONTEND_DIR / "assets")), name="assets")
 app.mount("/", StaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
 
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from tools.message_log import FileLock
+
+logger = logging.getLogger(__name__)
+
+
+# Re-run the workflow in the background at least this often (0 disables the scheduler)
+REPORT_SCHEDULER_INTERVAL_SECONDS = float(os.getenv("REPORT_SCHEDULER_INTERVAL_SECONDS", "600"))
+# How often to check whether the data changed since the last report
+REPORT_SCHEDULER_POLL_SECONDS = float(os.getenv("REPORT_SCHEDULER_POLL_SECONDS", "5"))
+# Wait this long after a change before running, so a burst of messages makes one run
+REPORT_SCHEDULER_DEBOUNCE_SECONDS = float(os.getenv("REPORT_SCHEDULER_DEBOUNCE_SECONDS", "2"))
+
+
+class ReportScheduler:
+    """
+    Keeps a precomputed workflow result around so supervisors don't wait
+    for the agents.
+
+    A background task runs `run(key)` whenever `key()` (the workflow cache
+    key: data and agent fingerprints) changes, and otherwise every
+    interval_seconds. poke() skips the poll delay after new data arrives.
+    The latest successful result is kept with the key and time it was
+    computed for; a failed run keeps the previous one and is retried at
+    the next interval or data change.
+
+    With a state_dir (the data directory), the worker processes sharing it
+    elect one runner through a non-blocking flock on report_scheduler.lock;
+    another takes over if it exits. The result is kept in
+    report_latest.json there, so every process serves it and a restart
+    over unchanged data doesn't run the workflow again.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[tuple], Awaitable[dict]],
+        key: Callable[[], tuple],
+        interval_seconds: float = REPORT_SCHEDULER_INTERVAL_SECONDS,
+        poll_seconds: float = REPORT_SCHEDULER_POLL_SECONDS,
+        debounce_seconds: float = REPORT_SCHEDULER_DEBOUNCE_SECONDS,
+        state_dir: Optional[Path] = None,
+    ):
+        self.run = run
+        self.key = key
+        self.interval_seconds = interval_seconds
+        self.poll_seconds = poll_seconds
+        self.debounce_seconds = debounce_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._latest: Optional[dict] = None
+        self._election = FileLock(Path(state_dir) / "report_scheduler.lock") if state_dir else None
+        self._report_path = Path(state_dir) / "report_latest.json" if state_dir else None
+        # (mtime_ns, size) of report_latest.json when last read or written
+        self._report_stamp = None
+        # Whether this process runs the workflow
+        self.leader = state_dir is None
+        # Key and monotonic time of the last attempt, successful or not
+        self._attempted_key: Optional[tuple] = None
+        self._attempted_at = 0.0
+
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_duration_seconds: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._election is not None and self.leader:
+            self._election.release()
+            self.leader = False
+
+    def poke(self):
+        """Check for changed data now instead of at the next poll."""
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def latest(self, max_age_seconds: Optional[float] = None) -> Optional[dict]:
+        """
+        The latest result with its metadata, or None if there is none or it
+        is older than max_age_seconds:
+
+            {result, key, computed_at (ISO time), age_seconds, current}
+
+        current is False once the data or agents changed after it was computed.
+        """
+        self._load_shared()
+        if self._latest is None:
+            return None
+        age = time.time() - self._latest["at"]
+        if max_age_seconds is not None and age > max_age_seconds:
+            return None
+        try:
+            current = self._latest["key"] == self.key()
+        except Exception:
+            # Can't tell; serve the last report marked stale
+            logger.exception("Could not compute the workflow cache key")
+            current = False
+        return {
+            "result": dict(self._latest["result"]),
+            "key": self._latest["key"],
+            "computed_at": self._latest["computed_at"],
+            "age_seconds": round(age, 3),
+            "current": current,
+        }
+
+    def stats(self) -> dict:
+        latest = self.latest()
+        return {
+            "enabled": self.enabled,
+            "leader": self.leader,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_duration_seconds": self.last_duration_seconds,
+            "computed_at": latest["computed_at"] if latest else None,
+            "age_seconds": latest["age_seconds"] if latest else None,
+            "interval_seconds": self.interval_seconds,
+        }
+
+    # ------------------------------------------------------------------
+    # Shared result
+    # ------------------------------------------------------------------
+
+    def _load_shared(self):
+        """Pick up a result another process (or an earlier run) wrote."""
+        if self._report_path is None:
+            return
+        try:
+            st = self._report_path.stat()
+        except FileNotFoundError:
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._report_stamp:
+            return
+        self._report_stamp = stamp
+        try:
+            saved = json.loads(self._report_path.read_bytes())
+            self._latest = {**saved, "key": tuple(saved["key"])}
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception("Ignoring unreadable %s", self._report_path)
+
+    def _save_shared(self):
+        if self._report_path is None:
+            return
+        tmp = self._report_path.with_name(self._report_path.name + ".tmp")
+        tmp.write_text(json.dumps(self._latest, default=str))
+        os.replace(tmp, self._report_path)
+        st = self._report_path.stat()
+        self._report_stamp = (st.st_mtime_ns, st.st_size)
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    def _lead(self) -> bool:
+        """Whether this process runs the workflow, taking over if the runner exited."""
+        if self.leader:
+            return True
+        if not self._election.acquire(blocking=False):
+            return False
+        self.leader = True
+        # Carry on from the last result instead of running right away
+        self._load_shared()
+        if self._latest is not None:
+            self._attempted_key = self._latest["key"]
+            self._attempted_at = time.monotonic() - (time.time() - self._latest["at"])
+        return True
+
+    def _due(self, key: tuple) -> bool:
+        if key != self._attempted_key:
+            return True
+        return time.monotonic() - self._attempted_at >= self.interval_seconds
+
+    async def _loop(self):
+        while True:
+            try:
+                key = self.key() if self._lead() else None
+                if key is not None and self._due(key):
+                    await self.refresh(key)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # e.g. a data file caught mid-write; try again at the next poll
+                self.failures += 1
+                self.last_error = str(e)
+                logger.exception("Background workflow check failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                await asyncio.sleep(self.debounce_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def refresh(self, key: Optional[tuple] = None):
+        """Run the workflow now and keep its result if it produced a report."""
+        key = key if key is not None else self.key()
+        self._attempted_key, self._attempted_at = key, time.monotonic()
+        self.running = True
+        started = time.perf_counter()
+        try:
+            result = await self.run(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.exception("Background workflow run failed")
+            return
+        finally:
+            self.running = False
+            self.last_duration_seconds = round(time.perf_counter() - started, 3)
+
+        self.runs += 1
+        if result.get("final_report") is None:
+            self.failures += 1
+            self.last_error = "The workflow run produced no report"
+            return
+        self.last_error = None
+        self._latest = {
+            "result": result,
+            "key": key,
+            "at": time.time(),
+            "computed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            self._save_shared()
+        except OSError:
+            logger.exception("Could not save the report for other workers")
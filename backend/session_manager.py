@@ -0,0 +1,224 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+
+SESSION_MAX_EVENTS = int(os.getenv("SESSION_MAX_EVENTS", "60"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "500"))
+
+
+def _trim_point(events: list, max_events: int) -> int:
+    """
+    Index of the first event to keep so that at most max_events remain.
+    Cuts only on invocation boundaries, so a function call is never kept
+    without its response; the latest invocation is always kept whole.
+    """
+    if len(events) <= max_events:
+        return 0
+
+    last_invocation = events[-1].invocation_id
+    last_start = len(events) - 1
+    while last_start > 0 and events[last_start - 1].invocation_id == last_invocation:
+        last_start -= 1
+
+    cut = len(events) - max_events
+    while cut < last_start and events[cut].invocation_id == events[cut - 1].invocation_id:
+        cut += 1
+    return min(cut, last_start)
+
+
+class SessionManager(BaseSessionService):
+    """
+    Wraps a session service with bounded memory:
+    - keeps at most max_events events per session (oldest invocations dropped)
+    - evicts sessions idle longer than ttl_seconds
+    - evicts least recently used sessions beyond max_sessions
+
+    Drop-in for the Runner: every call is delegated to the inner service.
+    """
+
+    def __init__(
+        self,
+        inner: BaseSessionService,
+        max_events: int = SESSION_MAX_EVENTS,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+    ):
+        self.inner = inner
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        # (app_name, user_id, session_id) -> last access time, LRU first
+        self._last_access: "OrderedDict[tuple, float]" = OrderedDict()
+        self.evicted = 0
+        self.trimmed_events = 0
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def _touch(self, key: tuple):
+        self._last_access[key] = time.monotonic()
+        self._last_access.move_to_end(key)
+
+    async def _evict(self):
+        now = time.monotonic()
+        victims = []
+        for key, last in self._last_access.items():
+            if now - last > self.ttl_seconds \
+                    or len(self._last_access) - len(victims) > self.max_sessions:
+                victims.append(key)
+            else:
+                # OrderedDict is LRU-first, so nothing after this is older
+                break
+
+        for app_name, user_id, session_id in victims:
+            self._last_access.pop((app_name, user_id, session_id), None)
+
+            # A shared (on-disk) store may have seen activity from another
+            # worker process since we last touched this session
+            if not isinstance(self.inner, InMemorySessionService):
+                session = await self.inner.get_session(
+                    app_name=app_name, user_id=user_id, session_id=session_id,
+                    config=GetSessionConfig(num_recent_events=0),
+                )
+                if session is None:
+                    continue
+                if time.time() - session.last_update_time < self.ttl_seconds:
+                    continue
+
+            await self.inner.delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            self.evicted += 1
+
+    async def _trim(self, session: Session):
+        cut = _trim_point(session.events, self.max_events)
+        if not cut:
+            return
+
+        del session.events[:cut]
+        self.trimmed_events += cut
+
+        # InMemorySessionService hands out copies; trim the stored one too
+        if isinstance(self.inner, InMemorySessionService):
+            stored = self.inner.sessions.get(session.app_name, {}) \
+                .get(session.user_id, {}).get(session.id)
+            if stored is not None and stored is not session:
+                del stored.events[:_trim_point(stored.events, self.max_events)]
+        elif hasattr(self.inner, "trim_events"):
+            await self.inner.trim_events(session)
+
+    # ------------------------------------------------------------------
+    # Convenience for request handlers
+    # ------------------------------------------------------------------
+
+    async def ensure_session(self, *, app_name: str, user_id: str, session_id: str) -> Session:
+        session = await self.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            try:
+                session = await self.create_session(
+                    app_name=app_name, user_id=user_id, session_id=session_id
+                )
+            except AlreadyExistsError:
+                # Created concurrently by another request or worker
+                session = await self.get_session(
+                    app_name=app_name, user_id=user_id, session_id=session_id
+                )
+        return session
+
+    async def stats(self) -> dict:
+        """Session counts and approximate memory held by tracked sessions."""
+        events = 0
+        approx_bytes = 0
+        for app_name, user_id, session_id in list(self._last_access):
+            session = await self.inner.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            if session is None:
+                continue
+            events += len(session.events)
+            approx_bytes += len(session.model_dump_json(exclude_none=True))
+
+        return {
+            "sessions": len(self._last_access),
+            "events": events,
+            "approx_bytes": approx_bytes,
+            "evicted": self.evicted,
+            "trimmed_events": self.trimmed_events,
+            "max_events": self.max_events,
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    # ------------------------------------------------------------------
+    # BaseSessionService
+    # ------------------------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch((app_name, user_id, session.id))
+        await self._evict()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self._evict()
+        session = await self.inner.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch((app_name, user_id, session_id))
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        return await self.inner.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self._last_access.pop((app_name, user_id, session_id), None)
+        await self.inner.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await self.inner.append_event(session=session, event=event)
+        if not event.partial:
+            self._touch((session.app_name, session.user_id, session.id))
+            # Once an agent has replied, drop whole older invocations
+            if event.is_final_response():
+                await self._trim(session)
+        return event
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        return await self.inner.get_user_state(app_name=app_name, user_id=user_id)
+
+    async def flush(self) -> None:
+        await self.inner.flush()
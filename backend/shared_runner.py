@@ -1,17 +1,29 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory import InMemoryMemoryService
+import logging
+
+from google.adk.agents import LlmAgent
 from google.adk.plugins.logging_plugin import LoggingPlugin
 from google.adk.runners import Runner
 from google.adk.apps.app import App
 from google.genai import types
+from agents.metrics import metrics_plugin
 from agents.orchestrator import build_orchestrator_agent
+from backend.session_manager import SessionManager
+from backend.sqlite_services import create_services
+from backend.workflow_cache import SingleFlight, WorkflowCache, agent_fingerprint
+from agents.core_agent import build_core_agent
+from tools.data_loader import load_messages, load_calendar, load_tasks, load_workers
+from tools.data_store import store
+from tools.digest import digests
+
+logger = logging.getLogger(__name__)
 
-# Shared services for the whole backend
-session_service = InMemorySessionService()
-memory_service = InMemoryMemoryService()
+# Shared services for the whole backend (SQLite when SESSION_DB_PATH is set).
+# SessionManager caps events per session and evicts idle sessions.
+_session_store, memory_service = create_services()
+session_service = SessionManager(_session_store)
 
 retry_config = types.HttpRetryOptions(
     attempts=3,
@@ -25,7 +37,7 @@ workflow_agent = build_orchestrator_agent(retry_config)
 app = App(
     name="agents",
     root_agent=workflow_agent,
-    plugins=[LoggingPlugin()]
+    plugins=[LoggingPlugin(), metrics_plugin]
 )
 
 # The shared runner used by FastAPI
@@ -33,4 +45,70 @@ runner = Runner(
     app=app,
     session_service=session_service,
     memory_service=memory_service,
-)
\ No newline at end of file
+)
+
+# Build chat agent once; every non-workflow request reuses it.
+# Runner.run_async keeps no per-call state on the runner or agent,
+# so a single instance is safe to share across concurrent requests.
+chat_agent = build_core_agent(retry_config)
+
+chat_app = App(
+    name="agents",
+    root_agent=chat_agent,
+    plugins=[LoggingPlugin(), metrics_plugin]
+)
+
+chat_runner = Runner(
+    app=chat_app,
+    session_service=session_service,
+    memory_service=memory_service,
+)
+
+# Prebuilt runners, keyed by request kind
+runners = {
+    "workflow": runner,
+    "chat": chat_runner,
+}
+
+
+def get_runner(kind: str) -> Runner:
+    """Return the prebuilt runner for 'workflow' or 'chat'."""
+    return runners[kind]
+
+
+# Full workflow results, reused until the data files or the agents change
+workflow_cache = WorkflowCache()
+workflow_version = agent_fingerprint(workflow_agent)
+
+# Concurrent workflow requests over the same data share one run
+workflow_flight = SingleFlight()
+
+
+def workflow_cache_key() -> tuple:
+    """Cache key for a workflow run over the current data."""
+    return (store.fingerprint(), workflow_version)
+
+
+def _iter_llm_agents(agent):
+    if isinstance(agent, LlmAgent):
+        yield agent
+    for sub in agent.sub_agents:
+        yield from _iter_llm_agents(sub)
+
+
+async def warm_up():
+    """
+    Pay one-off setup costs at startup instead of on the first request:
+    read the data files once, build the worker digests and create each
+    model's API client.
+    """
+    for loader in (load_messages, load_calendar, load_tasks, load_workers):
+        loader()
+    digests()
+
+    for r in runners.values():
+        for agent in _iter_llm_agents(r.agent):
+            try:
+                agent.canonical_model.api_client
+            except Exception as e:
+                logger.warning("Warm-up skipped model client for %s: %s", agent.name, e)
@@ -0,0 +1,491 @@
+import asyncio
+import json
+import os
+import queue
+import re
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.memory.base_memory_service import BaseMemoryService, SearchMemoryResponse
+from google.adk.memory.memory_entry import MemoryEntry
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.genai import types
+
+
+SESSION_DB_POOL_SIZE = int(os.getenv("SESSION_DB_POOL_SIZE", "4"))
+SESSION_DB_BATCH_SIZE = int(os.getenv("SESSION_DB_BATCH_SIZE", "16"))
+
+_MAX_SEARCH_RESULTS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_state (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+CREATE TABLE IF NOT EXISTS memory (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    author TEXT,
+    timestamp REAL NOT NULL,
+    text TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, event_id)
+);
+"""
+
+
+def _split_state(state: Optional[dict]) -> tuple[dict, dict, dict]:
+    """Split a state dict into (app, user, session) parts; temp: keys are dropped."""
+    app, user, session = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app[key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user[key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session[key] = value
+    return app, user, session
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=str)
+
+
+class _ConnectionPool:
+    """Fixed-size pool of WAL-mode SQLite connections shared by worker threads."""
+
+    def __init__(self, path: str, size: int):
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._pool.put(conn)
+
+        with self.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    async def run(self, fn, *args):
+        """Run a blocking DB function off the event loop."""
+        return await asyncio.to_thread(fn, *args)
+
+
+class SqliteSessionService(BaseSessionService):
+    """
+    Session service backed by a SQLite file in WAL mode, so several uvicorn
+    worker processes share sessions and conversations survive restarts.
+
+    Non-partial events are buffered and written in one transaction when the
+    buffer reaches batch_size, when an agent produces its final reply, or
+    before any read; flush() forces a write.
+    """
+
+    def __init__(self, pool: _ConnectionPool, batch_size: int = SESSION_DB_BATCH_SIZE):
+        self.pool = pool
+        self.batch_size = batch_size
+        # (app_name, user_id, session_id, event, state delta)
+        self._pending: list[tuple] = []
+        # One batch written at a time, in order
+        self._flush_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Blocking helpers (run in worker threads)
+    # ------------------------------------------------------------------
+
+    def _load_shared_state(self, conn, app_name: str, user_id: str) -> dict:
+        merged = {}
+        row = conn.execute(
+            "SELECT state FROM app_state WHERE app_name = ?", (app_name,)
+        ).fetchone()
+        for key, value in json.loads(row[0]).items() if row else ():
+            merged[State.APP_PREFIX + key] = value
+
+        row = conn.execute(
+            "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        ).fetchone()
+        for key, value in json.loads(row[0]).items() if row else ():
+            merged[State.USER_PREFIX + key] = value
+        return merged
+
+    def _merge_shared_state(self, conn, app_name: str, user_id: str, app_delta: dict, user_delta: dict):
+        if app_delta:
+            row = conn.execute(
+                "SELECT state FROM app_state WHERE app_name = ?", (app_name,)
+            ).fetchone()
+            state = json.loads(row[0]) if row else {}
+            state.update(app_delta)
+            conn.execute(
+                "INSERT OR REPLACE INTO app_state (app_name, state) VALUES (?, ?)",
+                (app_name, _dumps(state)),
+            )
+        if user_delta:
+            row = conn.execute(
+                "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            ).fetchone()
+            state = json.loads(row[0]) if row else {}
+            state.update(user_delta)
+            conn.execute(
+                "INSERT OR REPLACE INTO user_state (app_name, user_id, state) VALUES (?, ?, ?)",
+                (app_name, user_id, _dumps(state)),
+            )
+
+    def _create(self, app_name, user_id, session_id, state) -> Session:
+        app_delta, user_delta, session_state = _split_state(state)
+        now = time.time()
+        with self.pool.transaction() as conn:
+            try:
+                conn.execute(
+                    "INSERT INTO sessions (app_name, user_id, id, state, last_update_time) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (app_name, user_id, session_id, _dumps(session_state), now),
+                )
+            except sqlite3.IntegrityError:
+                raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+            self._merge_shared_state(conn, app_name, user_id, app_delta, user_delta)
+            merged = {**session_state, **self._load_shared_state(conn, app_name, user_id)}
+
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=merged,
+            last_update_time=now,
+        )
+
+    def _get(self, app_name, user_id, session_id, config) -> Optional[Session]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT state, last_update_time FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+
+            query = "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+            params: list = [app_name, user_id, session_id]
+            if config and config.after_timestamp is not None:
+                query += " AND timestamp >= ?"
+                params.append(config.after_timestamp)
+            query += " ORDER BY seq DESC"
+            if config and config.num_recent_events is not None:
+                query += " LIMIT ?"
+                params.append(config.num_recent_events)
+
+            rows = conn.execute(query, params).fetchall()
+            events = [Event.model_validate_json(r[0]) for r in reversed(rows)]
+            state = {**json.loads(row[0]), **self._load_shared_state(conn, app_name, user_id)}
+
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state,
+            events=events,
+            last_update_time=row[1],
+        )
+
+    def _list(self, app_name, user_id) -> list[Session]:
+        with self.pool.connection() as conn:
+            query = "SELECT user_id, id, state, last_update_time FROM sessions WHERE app_name = ?"
+            params: list = [app_name]
+            if user_id is not None:
+                query += " AND user_id = ?"
+                params.append(user_id)
+            query += " ORDER BY last_update_time"
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            Session(
+                app_name=app_name,
+                user_id=uid,
+                id=sid,
+                state=json.loads(state),
+                last_update_time=updated,
+            )
+            for uid, sid, state, updated in rows
+        ]
+
+    def _delete(self, app_name, user_id, session_id):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            )
+
+    def _write_batch(self, batch: list[tuple]):
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, id, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (app_name, user_id, session_id, event.id, event.timestamp,
+                     event.model_dump_json(exclude_none=True))
+                    for app_name, user_id, session_id, event, _ in batch
+                ],
+            )
+
+            for app_name, user_id, session_id, event, delta in batch:
+                app_delta, user_delta, session_delta = _split_state(delta)
+                self._merge_shared_state(conn, app_name, user_id, app_delta, user_delta)
+
+                row = conn.execute(
+                    "SELECT state FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (app_name, user_id, session_id),
+                ).fetchone()
+                if row is None:
+                    continue
+                state = json.loads(row[0])
+                state.update(session_delta)
+                conn.execute(
+                    "UPDATE sessions SET state = ?, last_update_time = ? "
+                    "WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (_dumps(state), event.timestamp, app_name, user_id, session_id),
+                )
+
+    def _trim(self, app_name, user_id, session_id, first_kept_event_id):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? "
+                "AND seq < (SELECT seq FROM events WHERE app_name = ? AND user_id = ? "
+                "AND session_id = ? AND id = ?)",
+                (app_name, user_id, session_id, app_name, user_id, session_id, first_kept_event_id),
+            )
+
+    # ------------------------------------------------------------------
+    # BaseSessionService
+    # ------------------------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or uuid.uuid4().hex
+        return await self.pool.run(self._create, app_name, user_id, session_id, state)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush()
+        return await self.pool.run(self._get, app_name, user_id, session_id, config)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        await self.flush()
+        sessions = await self.pool.run(self._list, app_name, user_id)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self.flush()
+        await self.pool.run(self._delete, app_name, user_id, session_id)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        def _read():
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?",
+                    (app_name, user_id),
+                ).fetchone()
+            return json.loads(row[0]) if row else {}
+
+        await self.flush()
+        return await self.pool.run(_read)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        delta = dict(event.actions.state_delta) if event.actions and event.actions.state_delta else {}
+        self._pending.append((session.app_name, session.user_id, session.id, event, delta))
+
+        if len(self._pending) >= self.batch_size or event.is_final_response():
+            await self.flush()
+        return event
+
+    async def flush(self) -> None:
+        # Taken even when nothing is pending, so a read waits for a batch
+        # another task is still writing
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            await self.pool.run(self._write_batch, batch)
+
+    async def trim_events(self, session: Session) -> None:
+        """Drop stored events older than the first event still in session.events."""
+        if not session.events:
+            return
+        await self.flush()
+        await self.pool.run(
+            self._trim, session.app_name, session.user_id, session.id, session.events[0].id
+        )
+
+
+class SqliteMemoryService(BaseMemoryService):
+    """
+    Memory service backed by the same SQLite file as SqliteSessionService.
+    Search scores stored events by the number of query words they contain.
+    """
+
+    def __init__(self, pool: _ConnectionPool):
+        self.pool = pool
+
+    def _insert(self, rows: list[tuple]):
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO memory "
+                "(app_name, user_id, session_id, event_id, author, timestamp, text, content) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _rows(self, app_name, user_id, session_id, events) -> list[tuple]:
+        rows = []
+        for event in events:
+            if not event.content or not event.content.parts:
+                continue
+            text = " ".join(p.text for p in event.content.parts if p.text)
+            if not text:
+                continue
+            rows.append((
+                app_name, user_id, session_id, event.id, event.author, event.timestamp,
+                text.lower(), event.content.model_dump_json(exclude_none=True),
+            ))
+        return rows
+
+    async def add_session_to_memory(self, session: Session) -> None:
+        rows = self._rows(session.app_name, session.user_id, session.id, session.events)
+        await self.pool.run(self._insert, rows)
+
+    async def add_events_to_memory(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        events,
+        session_id: Optional[str] = None,
+        custom_metadata=None,
+    ) -> None:
+        rows = self._rows(app_name, user_id, session_id or "", events)
+        await self.pool.run(self._insert, rows)
+
+    async def search_memory(
+        self, *, app_name: str, user_id: str, query: str
+    ) -> SearchMemoryResponse:
+        words = set(re.findall(r"\w+", query.lower()))
+        if not words:
+            return SearchMemoryResponse()
+
+        def _search():
+            clause = " OR ".join("text LIKE ?" for _ in words)
+            with self.pool.connection() as conn:
+                return conn.execute(
+                    f"SELECT author, timestamp, text, content FROM memory "
+                    f"WHERE app_name = ? AND user_id = ? AND ({clause})",
+                    [app_name, user_id, *(f"%{w}%" for w in words)],
+                ).fetchall()
+
+        scored = []
+        for author, timestamp, text, content in await self.pool.run(_search):
+            score = len(words & set(re.findall(r"\w+", text)))
+            if score:
+                scored.append((score, timestamp, author, content))
+
+        scored.sort(key=lambda s: -s[0])
+        return SearchMemoryResponse(memories=[
+            MemoryEntry(
+                content=types.Content.model_validate_json(content),
+                author=author,
+                timestamp=datetime.fromtimestamp(timestamp).isoformat(),
+            )
+            for _, timestamp, author, content in scored[:_MAX_SEARCH_RESULTS]
+        ])
+
+
+def create_services(db_path: Optional[str] = None):
+    """
+    Return (session_service, memory_service). With a db_path (default:
+    SESSION_DB_PATH env var) both are backed by one SQLite file; otherwise
+    the in-memory ADK services are used.
+    """
+    db_path = db_path or os.getenv("SESSION_DB_PATH")
+    if not db_path:
+        return InMemorySessionService(), InMemoryMemoryService()
+
+    pool = _ConnectionPool(db_path, SESSION_DB_POOL_SIZE)
+    return SqliteSessionService(pool), SqliteMemoryService(pool)
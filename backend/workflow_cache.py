@@ -0,0 +1,142 @@
+import asyncio
+import copy
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from google.adk.agents import LlmAgent
+
+
+WORKFLOW_CACHE_TTL_SECONDS = float(os.getenv("WORKFLOW_CACHE_TTL_SECONDS", "900"))
+WORKFLOW_CACHE_MAX_ENTRIES = int(os.getenv("WORKFLOW_CACHE_MAX_ENTRIES", "32"))
+
+# Bump when the rule engines (tools/delay_engine.py, tools/safety_engine.py)
+# change behaviour, so results computed by the old rules are not reused.
+RULES_VERSION = "2"
+
+
+def _name(obj) -> str:
+    return getattr(obj, "name", None) or getattr(obj, "__qualname__", None) or type(obj).__name__
+
+
+def agent_fingerprint(agent) -> str:
+    """
+    Hash of everything about an agent tree that shapes its output: agent
+    names and types, models, instructions, output keys, tools and callbacks.
+    """
+    h = hashlib.sha256(f"rules:{RULES_VERSION};".encode())
+
+    def visit(a):
+        h.update(f"{type(a).__name__}:{a.name};".encode())
+        for cb in ("before_agent_callback", "after_agent_callback"):
+            value = getattr(a, cb, None)
+            if value is not None:
+                h.update(f"{cb}={_name(value)};".encode())
+        if isinstance(a, LlmAgent):
+            model = a.model if isinstance(a.model, str) else getattr(a.model, "model", "")
+            instruction = a.instruction if isinstance(a.instruction, str) else _name(a.instruction)
+            h.update(f"model={model};output_key={a.output_key};".encode())
+            h.update(instruction.encode())
+            h.update(",".join(sorted(_name(t) for t in a.tools)).encode())
+        for sub in a.sub_agents:
+            visit(sub)
+
+    visit(agent)
+    return h.hexdigest()
+
+
+class WorkflowCache:
+    """
+    Results of full workflow runs, keyed by (data fingerprint, agent fingerprint).
+
+    Entries expire after ttl_seconds; beyond max_entries the least recently
+    used entry is dropped. Stored and returned values are copies, so callers
+    may modify what they get.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = WORKFLOW_CACHE_TTL_SECONDS,
+        max_entries: int = WORKFLOW_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (stored_at, result), LRU first
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, result: dict):
+        self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent runs of the same key into one.
+
+    start(key, fn) launches fn() as a task unless a run for key is already in
+    flight, in which case the caller gets that run's task instead. Runs are
+    tasks of their own, so a leader whose request is cancelled doesn't cancel
+    the run for the requests attached to it.
+    """
+
+    def __init__(self):
+        self._tasks: dict = {}
+        self.runs = 0
+        self.coalesced = 0
+
+    def start(self, key, fn) -> tuple:
+        """Returns (task, leader); leader is False when attached to a running task."""
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task, False
+
+        task = asyncio.ensure_future(fn())
+        self._tasks[key] = task
+        self.runs += 1
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task, True
+
+    def _done(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Followers may all be gone; don't warn about an unretrieved error
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._tasks),
+            "runs": self.runs,
+            "coalesced": self.coalesced,
+        }
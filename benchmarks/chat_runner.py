@@ -0,0 +1,126 @@
+"""
+Benchmark: per-request chat runner vs the shared one.
+
+Before the shared runner, every chat request built CoreAgent, its App and
+Runner, and the model created its genai API client on the first call.
+Now backend.shared_runner builds them once and warm_up() creates the
+client at startup. This measures what each request pays for its runner
+in both cases, then drives concurrent requests (runner setup plus an
+asyncio.sleep standing in for the model call) to show the effect of the
+setup running synchronously on the event loop.
+
+No network is used: creating a client only reads its configuration, so
+a placeholder GOOGLE_API_KEY is set when none is present.
+
+    python -m benchmarks.chat_runner
+    python -m benchmarks.chat_runner --requests 200 --concurrency 16 --latency-ms 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from google.adk.apps.app import App
+from google.adk.plugins.logging_plugin import LoggingPlugin
+from google.adk.runners import Runner
+
+from agents.core_agent import build_core_agent
+from agents.metrics import metrics_plugin
+from backend.shared_runner import (
+    get_runner,
+    memory_service,
+    retry_config,
+    session_service,
+    warm_up,
+)
+
+
+def per_request_runner() -> Runner:
+    """What each chat request did before: a new agent, App, Runner and client."""
+    agent = build_core_agent(retry_config)
+    chat_app = App(name="agents", root_agent=agent, plugins=[LoggingPlugin(), metrics_plugin])
+    runner = Runner(app=chat_app, session_service=session_service, memory_service=memory_service)
+    agent.canonical_model.api_client
+    return runner
+
+
+def shared_runner() -> Runner:
+    """What each chat request does now."""
+    runner = get_runner("chat")
+    runner.agent.canonical_model.api_client
+    return runner
+
+
+def percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def setup_ms(make, runs: int) -> list:
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        make()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return times
+
+
+async def drive(make, requests: int, concurrency: int, latency_ms: float) -> tuple:
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+    latencies = []
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            t0 = time.perf_counter()
+            make()
+            await asyncio.sleep(latency_ms / 1000)
+            latencies.append((time.perf_counter() - t0) * 1e3)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - t0
+
+
+async def run(args):
+    # ADK caches a model's API client per event loop, so warm up in the
+    # loop that serves the requests, as the app's lifespan hook does
+    await warm_up()
+    variants = (("per-request", per_request_runner), ("shared", shared_runner))
+
+    print(f"{'runner setup':<14}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, make in variants:
+        times = setup_ms(make, args.runs)
+        print(f"{name:<14}{statistics.median(times):>10.2f}{percentile(times, 99):>10.2f}")
+
+    print(
+        f"\n{args.requests} requests, concurrency {args.concurrency}, "
+        f"{args.latency_ms:.0f} ms model call"
+    )
+    print(f"{'request':<14}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name, make in variants:
+        latencies, elapsed = await drive(make, args.requests, args.concurrency, args.latency_ms)
+        print(
+            f"{name:<14}{statistics.median(latencies):>10.1f}"
+            f"{percentile(latencies, 99):>10.1f}{len(latencies) / elapsed:>10.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50, help="setup measurements per variant")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="simulated model call")
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
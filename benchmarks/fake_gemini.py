@@ -0,0 +1,113 @@
+"""
+Deterministic local stand-in for Gemini, for offline benchmarks.
+
+FakeGemini keeps ScheduledGemini's scheduler and response cache and only
+replaces the network call: it waits a configurable latency, then either
+makes the next scripted tool call or returns the scripted text.
+"""
+import asyncio
+import random
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from agents.model_scheduler import ScheduledGemini
+
+# Per agent: tool calls made in order (one per model turn), then the final text
+SCRIPTS = {
+    "CoreAgent": {
+        "tool_calls": [("get_flagged_events", {"since": ""})],
+        "text": "W101 (Rajesh Kumar) is delayed: road closed near Sector 12.",
+    },
+    "DelayAgent": {
+        "tool_calls": [("transcribe_audio_batch", {"audio_ids": ["audio_accident", "audio_lowbattery"]})],
+        "text": '[{"worker_id": "W101", "task_id": "T011", "reason": "Road closed", '
+                '"suggested_action": "Call W101 to confirm the new ETA."}]',
+    },
+    "SafetyAgent": {
+        "tool_calls": [("analyze_image_batch", {"image_ids": ["img_reused_003"]})],
+        "text": '[{"worker_id": "W101", "issue": "Accident reported", "urgency": "high", '
+                '"recommended_action": "Call W101 now."}]',
+    },
+    "ReportAgent": {
+        "tool_calls": [],
+        "text": "1. Delay Analysis: 1 delay.\n2. Safety: 1 high urgency alert.\n5. Overall: act now.",
+    },
+}
+
+
+class FakeGemini(ScheduledGemini):
+    """ScheduledGemini whose model call is a scripted, local coroutine."""
+
+    latency_ms: float = 200.0
+    jitter_ms: float = 50.0
+    script: dict = {"tool_calls": [], "text": "OK"}
+    seed: int = 0
+    calls: int = 0
+
+    def _rng(self) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + self.calls)
+
+    async def _call_model(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        delay = max(0.0, self.latency_ms + self._rng().uniform(-self.jitter_ms, self.jitter_ms))
+        await asyncio.sleep(delay / 1000)
+
+        # One scripted tool call per turn since the last user message
+        turns = 0
+        for content in reversed(llm_request.contents):
+            if content.role == "user" and any(p.text for p in content.parts or []):
+                break
+            if any(p.function_response for p in content.parts or []):
+                turns += 1
+
+        declared = set(llm_request.tools_dict)
+        calls = [c for c in self.script.get("tool_calls", []) if c[0] in declared]
+        if turns < len(calls):
+            name, args = calls[turns]
+            part = types.Part(function_call=types.FunctionCall(name=name, args=args))
+        else:
+            part = types.Part(text=self.script.get("text", ""))
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=len(str(llm_request.contents)) // 4,
+                candidates_token_count=len(str(part)) // 4,
+            ),
+        )
+
+
+def install_fake_models(
+    runners,
+    latency_ms: float = 200.0,
+    jitter_ms: float = 50.0,
+    seed: int = 0,
+    scripts: Optional[dict] = None,
+):
+    """Replace the model of every LlmAgent under the given runners with a FakeGemini."""
+    from google.adk.agents import LlmAgent
+
+    scripts = scripts or SCRIPTS
+
+    def visit(agent):
+        if isinstance(agent, LlmAgent):
+            current = agent.model
+            agent.model = FakeGemini(
+                model=getattr(current, "model", "fake"),
+                priority=getattr(current, "priority", 1),
+                latency_ms=latency_ms,
+                jitter_ms=jitter_ms,
+                seed=seed,
+                # Sharded specialists (DelayAgent_shard0, ...) share one script
+                script=scripts.get(agent.name.split("_shard")[0], {"tool_calls": [], "text": "OK"}),
+            )
+        for sub in agent.sub_agents:
+            visit(sub)
+
+    for runner in runners:
+        visit(runner.agent)
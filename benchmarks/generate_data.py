@@ -0,0 +1,247 @@
+"""
+Synthetic field-operations data at production scale.
+
+Writes workers.json, tasks.json, calendar.json and messages.json in the
+same schemas as data/, seeded and reproducible. Audio and image messages
+only use ids the mock media tools know, so delay/safety detection sees
+realistic urgencies, accidents and reused photos.
+
+    python -m benchmarks.generate_data --workers 10000 --out /tmp/ops-10k
+    python -m benchmarks.generate_data --workers 1000 --messages 1000000 --out /tmp/ops-1m
+    DATA_DIR=/tmp/ops-10k uvicorn backend.main:app
+    python -m benchmarks.run_agent --scenario data --data-dir /tmp/ops-10k
+
+Each worker gets a profile that shapes their messages:
+    normal 85%, delayed 9%, incident 3%, suspicious photos 3%
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from tools.analyze_image_mock import analyze_image_mock
+from tools.transcribe_audio_mock import transcribe_audio_mock
+
+FIRST_NAMES = [
+    "Rajesh", "Gowtham", "Anjali", "Priya", "Arjun", "Meera", "Vikram", "Sneha",
+    "Rahul", "Kavya", "Suresh", "Deepa", "Imran", "Fatima", "Karthik", "Lakshmi",
+    "Manoj", "Pooja", "Naveen", "Divya", "Ravi", "Asha", "Sanjay", "Nisha",
+]
+LAST_NAMES = [
+    "Kumar", "N.", "Singh", "Sharma", "Reddy", "Iyer", "Patel", "Das", "Khan",
+    "Nair", "Rao", "Gupta", "Menon", "Joshi", "Pillai", "Verma",
+]
+CATEGORIES = ["delivery", "pickup", "inspection", "installation", "repair", "meter reading"]
+PRIORITIES = ["low", "medium", "medium", "high"]
+
+TEXT_NORMAL = [
+    "Received order", "Starting task now", "Reached meter location", "Leaving location now",
+    "Customer confirmed exact building", "Customer arrived, continuing work",
+    "On break, need few minutes", "Entering basement zone, network weak",
+    "Customer not answering", "Reached site, but gate locked", "Meter is damaged",
+]
+TEXT_DELAY = [
+    "Road closed", "Stuck, road closed near {sector}, will be late",
+    "Traffic huge near {sector}, delay expected", "Roadblock near {sector}",
+    "Bike skidded slightly, can continue but delayed", "Running late, stuck behind a truck",
+]
+TEXT_INCIDENT = [
+    "Accident near {sector}, need help", "Got a shock from the meter, injured",
+    "Slipped on the stairs, hurt my leg", "Fire in the building next door, danger",
+]
+
+# Media ids grouped by what the mock tools say about them
+AUDIO_NORMAL = ["audio_confusion", "audio_noisyworksite"]
+AUDIO_MEDIUM = ["audio_lowbattery", "audio_angrycustomer", "audio_sirenbackground",
+                "audio_heavybreathing", "audio_minoraccident"]
+AUDIO_HIGH = ["audio_accident", "audio_shock_urgent"]
+IMAGE_NORMAL = ["img_siteok_001", "img_meter_004", "img_deliveryproof_007", "img_pickup_008"]
+IMAGE_SUSPICIOUS = ["img_reused_003", "img_wrongloc_002"]
+IMAGE_INCIDENT = ["img_accidentspot_006"]
+
+PROFILES = [("normal", 0.85), ("delayed", 0.09), ("incident", 0.03), ("suspicious", 0.03)]
+
+# Message type mix per profile: (text, audio, image)
+TYPE_MIX = {
+    "normal": (0.6, 0.2, 0.2),
+    "delayed": (0.7, 0.2, 0.1),
+    "incident": (0.4, 0.4, 0.2),
+    "suspicious": (0.4, 0.1, 0.5),
+}
+
+
+def _check_media_ids():
+    """Fail fast if the mock tools no longer know an id used here."""
+    for image_id in IMAGE_NORMAL + IMAGE_SUSPICIOUS + IMAGE_INCIDENT:
+        assert analyze_image_mock(image_id)["note"] != "Unknown image ID.", image_id
+    for audio_id in AUDIO_NORMAL + AUDIO_MEDIUM + AUDIO_HIGH:
+        assert transcribe_audio_mock(audio_id)["text"] != "Unclear audio", audio_id
+
+
+def _iso(t: datetime) -> str:
+    return t.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class Generator:
+    def __init__(self, workers: int, messages: int, tasks_per_worker: int, day: str, seed: int):
+        self.rng = random.Random(seed)
+        self.n_workers = workers
+        self.n_messages = messages
+        self.tasks_per_worker = tasks_per_worker
+        self.day = datetime.fromisoformat(day)
+        self.sectors = max(10, workers // 50)
+        # worker index -> (profile, [(task_id, start, end, sector)])
+        self.plan = []
+
+    def _profile(self) -> str:
+        roll = self.rng.random()
+        for name, share in PROFILES:
+            if roll < share:
+                return name
+            roll -= share
+        return PROFILES[0][0]
+
+    def workers(self):
+        for i in range(self.n_workers):
+            yield {
+                "worker_id": f"W{101 + i}",
+                "name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                "status": "active" if self.rng.random() < 0.95 else "offline",
+            }
+
+    def tasks_and_calendar(self):
+        """Yields (task, calendar entry) pairs and records each worker's plan."""
+        task_no = 0
+        for i in range(self.n_workers):
+            worker_id = f"W{101 + i}"
+            start = self.day + timedelta(hours=8, minutes=self.rng.randrange(0, 120, 15))
+            schedule = []
+            for _ in range(self.tasks_per_worker):
+                task_no += 1
+                task_id = f"T{task_no:03d}"
+                sector = f"Sector {self.rng.randint(1, self.sectors)}"
+                end = start + timedelta(minutes=self.rng.choice([30, 45, 60, 90]))
+                schedule.append((task_id, start, end, sector))
+                yield (
+                    {
+                        "task_id": task_id,
+                        "worker_id": worker_id,
+                        "address": sector,
+                        "status": "assigned",
+                        "priority": self.rng.choice(PRIORITIES),
+                        "category": self.rng.choice(CATEGORIES),
+                    },
+                    {
+                        "worker_id": worker_id,
+                        "task_id": task_id,
+                        "start": _iso(start),
+                        "end": _iso(end),
+                        "location": sector,
+                    },
+                )
+                start = end + timedelta(minutes=self.rng.choice([15, 30, 45]))
+            self.plan.append((self._profile(), schedule))
+
+    def _message(self, msg_no: int, worker_index: int) -> dict:
+        rng = self.rng
+        profile, schedule = self.plan[worker_index]
+        task_id, start, end, sector = rng.choice(schedule)
+        at = start + timedelta(seconds=rng.randint(-600, int((end - start).total_seconds()) + 900))
+        msg = {"msg_id": f"m{msg_no}", "worker_id": f"W{101 + worker_index}"}
+
+        text_share, audio_share, _ = TYPE_MIX[profile]
+        roll = rng.random()
+        # Most messages are routine even for flagged profiles
+        flagged = profile != "normal" and rng.random() < 0.35
+
+        if roll < text_share:
+            pool = TEXT_NORMAL
+            if flagged and profile == "delayed":
+                pool = TEXT_DELAY
+            elif flagged and profile == "incident":
+                pool = TEXT_INCIDENT
+            msg.update(type="text", text=rng.choice(pool).format(sector=sector))
+        elif roll < text_share + audio_share:
+            pool = AUDIO_NORMAL if rng.random() < 0.7 else AUDIO_MEDIUM
+            if flagged and profile == "incident":
+                pool = AUDIO_HIGH
+            elif flagged and profile == "delayed":
+                pool = AUDIO_MEDIUM
+            msg.update(type="audio", audio_id=rng.choice(pool))
+        else:
+            pool = IMAGE_NORMAL
+            if flagged and profile == "suspicious":
+                pool = IMAGE_SUSPICIOUS
+            elif flagged and profile == "incident":
+                pool = IMAGE_INCIDENT
+            msg.update(type="image", image_id=rng.choice(pool))
+
+        msg["time"] = _iso(at)
+        return msg
+
+    def messages(self):
+        # Every worker reports at least once while there are messages to spare
+        for n in range(self.n_messages):
+            worker_index = n if n < self.n_workers else self.rng.randrange(self.n_workers)
+            yield self._message(n + 1, worker_index)
+
+
+def _write(path: Path, key: str, records) -> int:
+    """Stream records into {"key": [...]} without holding the file in memory."""
+    count = 0
+    with path.open("w") as f:
+        f.write('{\n  "' + key + '": [\n')
+        for record in records:
+            if count:
+                f.write(",\n")
+            f.write("    " + json.dumps(record))
+            count += 1
+        f.write("\n  ]\n}\n")
+    return count
+
+
+def generate(out: Path, workers: int, messages: int, tasks_per_worker: int = 1,
+             day: str = "2025-11-28", seed: int = 7) -> dict:
+    _check_media_ids()
+    out.mkdir(parents=True, exist_ok=True)
+    gen = Generator(workers, messages, tasks_per_worker, day, seed)
+
+    counts = {"workers": _write(out / "workers.json", "workers", gen.workers())}
+
+    tasks, calendar = [], []
+    for task, entry in gen.tasks_and_calendar():
+        tasks.append(task)
+        calendar.append(entry)
+    counts["tasks"] = _write(out / "tasks.json", "tasks", tasks)
+    counts["calendar"] = _write(out / "calendar.json", "worker_calendar", calendar)
+    counts["messages"] = _write(out / "messages.json", "messages", gen.messages())
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=1000)
+    parser.add_argument("--messages", type=int, help="default: 5 per worker")
+    parser.add_argument("--tasks-per-worker", type=int, default=1)
+    parser.add_argument("--day", default="2025-11-28")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", required=True, help="output directory (not data/ unless you mean it)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    counts = generate(
+        Path(args.out),
+        args.workers,
+        args.messages if args.messages is not None else args.workers * 5,
+        args.tasks_per_worker,
+        args.day,
+        args.seed,
+    )
+    sizes = {p.name: round(p.stat().st_size / 2**20, 1) for p in sorted(Path(args.out).glob("*.json"))}
+    print(json.dumps({"counts": counts, "mb": sizes, "seconds": round(time.perf_counter() - started, 2)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Routing accuracy and latency of backend.intent_router on a labelled set.
+
+Messages are held out from the classifier's training phrases. Misroutes
+into a fast intent are the costly kind (a canned answer to a question that
+needed the model), so they are reported separately.
+
+    python -m benchmarks.intent_routing
+"""
+import time
+from collections import Counter
+
+from backend.intent_router import CHAT, FAST_INTENTS, answer, route
+
+CASES = [
+    # workflow
+    ("run analysis", "workflow"),
+    ("Please run a full analysis now", "workflow"),
+    ("execute workflow", "workflow"),
+    ("can you scan everything for me", "workflow"),
+    # delays
+    ("who is delayed?", "delays"),
+    ("Who's late?", "delays"),
+    ("any delays?", "delays"),
+    ("is anyone late", "delays"),
+    ("which workers are running behind", "delays"),
+    ("show delays", "delays"),
+    ("who is running late this morning", "delays"),
+    ("anyone stuck in traffic?", "delays"),
+    # safety
+    ("any safety issues?", "safety"),
+    ("safety check", "safety"),
+    ("any accidents?", "safety"),
+    ("check for safety", "safety"),
+    ("is anybody hurt", "safety"),
+    ("any emergency", "safety"),
+    ("has someone been injured today", "safety"),
+    ("safety status", "safety"),
+    # messages
+    ("scan worker messages", "messages"),
+    ("show the latest messages", "messages"),
+    ("summarize messages", "messages"),
+    ("what have workers been saying", "messages"),
+    ("read the messages", "messages"),
+    ("latest messages please", "messages"),
+    # worker status
+    ("worker status", "worker_status"),
+    ("how is W101 doing?", "worker_status"),
+    ("status of workers", "worker_status"),
+    ("what's happening?", "worker_status"),
+    ("W194 status", "worker_status"),
+    ("give me an overview of the team", "worker_status"),
+    ("how is everyone doing", "worker_status"),
+    # open-ended -> model
+    ("why is W101 late?", "chat"),
+    ("what should I do about the accident?", "chat"),
+    ("draft an apology to the customer for the delay", "chat"),
+    ("who should take over task T011?", "chat"),
+    ("explain what reuse_score means", "chat"),
+    ("hi there", "chat"),
+    ("thank you!", "chat"),
+    ("can you reassign W101's task", "chat"),
+    ("what is the capital of France", "chat"),
+    ("compare W101 and W194", "chat"),
+    ("if W101 is late, who is free?", "chat"),
+]
+
+
+def main():
+    correct = 0
+    bad_fast = []
+    by_method = Counter()
+    confusion = Counter()
+
+    for message, expected in CASES:
+        r = route(message)
+        by_method[r.method] += 1
+        confusion[(expected, r.intent)] += 1
+        if r.intent == expected:
+            correct += 1
+        else:
+            print(f"MISS  {message!r}: expected {expected}, got {r.intent} ({r.method}, {r.confidence:.2f})")
+            if r.intent in FAST_INTENTS and expected == CHAT:
+                bad_fast.append(message)
+
+    print(f"\naccuracy: {correct}/{len(CASES)} = {correct / len(CASES):.1%}")
+    print(f"open-ended questions given a canned answer: {len(bad_fast)}")
+    print(f"routed by: {dict(by_method)}")
+
+    # Latency: routing, and routing + answer with warm per-data caches
+    fast = [m for m, e in CASES if e in FAST_INTENTS]
+    for m in fast:
+        answer(route(m))
+    n = 2000
+    t0 = time.perf_counter()
+    for i in range(n):
+        route(CASES[i % len(CASES)][0])
+    route_us = (time.perf_counter() - t0) / n * 1e6
+    t0 = time.perf_counter()
+    for i in range(n):
+        answer(route(fast[i % len(fast)]))
+    answer_us = (time.perf_counter() - t0) / n * 1e6
+    print(f"route: {route_us:.1f} µs/message, route + answer: {answer_us:.1f} µs/message")
+
+
+if __name__ == "__main__":
+    main()
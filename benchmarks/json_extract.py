@@ -0,0 +1,96 @@
+"""
+Benchmark: JSON extraction from large model outputs.
+
+Compares the old regex extractor (greedy DOTALL match + json.loads) with
+tools.json_extract on synthetic outputs of growing size, including
+trailing prose with braces and a pathological run of unclosed brackets.
+
+    python -m benchmarks.json_extract
+"""
+import json
+import re
+import time
+
+from tools.json_extract import JsonExtractor, extract_json, findings_validator
+
+_json_fence_re = re.compile(r"```json\s*(\[.*?\]|\{.*?\})\s*```", re.DOTALL)
+_json_any_re = re.compile(r"(\{.*\}|\[.*\])", re.DOTALL)
+
+
+def regex_extract_json(text: str):
+    """The previous backend/main.py implementation."""
+    for pattern in (_json_fence_re, _json_any_re):
+        m = pattern.search(text)
+        if m:
+            try:
+                return json.loads(m.group(1))
+            except ValueError:
+                pass
+    return None
+
+
+def findings_output(rows: int) -> str:
+    findings = [
+        {
+            "worker_id": f"W{i % 50:03d}",
+            "issue": f"Audio message M{i} mentions an accident {{near}} site [{i}]",
+            "urgency": "high" if i % 3 == 0 else "medium",
+            "recommended_action": f"Call W{i % 50:03d} now and dispatch help.",
+        }
+        for i in range(rows)
+    ]
+    return (
+        "Here are the findings:\n```json\n" + json.dumps(findings) + "\n```\n"
+        "Note: escalate {urgent} cases first and ignore [resolved] ones. {"
+    )
+
+
+def unclosed_output(size: int) -> str:
+    return "{" * size + " truncated"
+
+
+def timed(func, text, repeat=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def chunked(text: str, size: int = 256):
+    extractor = JsonExtractor(findings_validator("safety_findings"))
+    for i in range(0, len(text), size):
+        if extractor.feed(text[i:i + size]) is not None:
+            break
+    return extractor.value
+
+
+def main():
+    validate = findings_validator("safety_findings")
+    print(f"{'case':<12}{'chars':>10}{'regex ms':>12}{'scan ms':>12}{'chunked ms':>12}  regex ok  scan ok")
+
+    for rows in (100, 1_000, 10_000, 50_000):
+        text = findings_output(rows)
+        old = regex_extract_json(text)
+        new = extract_json(text, validate)
+        print(
+            f"{'findings':<12}{len(text):>10}"
+            f"{timed(regex_extract_json, text) * 1e3:>12.2f}"
+            f"{timed(lambda t: extract_json(t, validate), text) * 1e3:>12.2f}"
+            f"{timed(chunked, text) * 1e3:>12.2f}"
+            f"  {str(old is not None and len(old) == rows):>8}  {str(new is not None and len(new) == rows):>7}"
+        )
+
+    for size in (1_000, 2_000, 4_000, 8_000):
+        text = unclosed_output(size)
+        print(
+            f"{'unclosed':<12}{len(text):>10}"
+            f"{timed(regex_extract_json, text, 1) * 1e3:>12.2f}"
+            f"{timed(extract_json, text) * 1e3:>12.2f}"
+            f"{timed(chunked, text) * 1e3:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: message ingestion into the append-only message log.
+
+Appends batches of messages to a copy of a data set (store.append_messages,
+then POST /api/messages in-process), reads them back through the store,
+queries a time range (the store's index and a scan of the mapped log), and
+compacts the log into messages.json.
+
+    python -m benchmarks.message_ingest
+    python -m benchmarks.message_ingest --data-dir /tmp/ops-100k --messages 200000 --batch 1000
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def make_batch(start: datetime, size: int, offset: int) -> list:
+    return [
+        {
+            "worker_id": f"W{101 + (offset + i) % 50}",
+            "type": "text",
+            "text": "Traffic huge near Sector 3, delay expected",
+            "time": (start + timedelta(seconds=offset + i)).isoformat(timespec="seconds"),
+        }
+        for i in range(size)
+    ]
+
+
+def timed(label: str, count: int, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    took = time.perf_counter() - t0
+    rate = f"{count / took:>10,.0f} msgs/s" if count else ""
+    print(f"{label:<34} {took * 1000:>9.1f} ms {rate}")
+    return result
+
+
+async def post_batches(app, batches: list):
+    import httpx
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for batch in batches:
+            response = await client.post("/api/messages", json=batch)
+            assert response.json()["success"], response.text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=str(Path(__file__).parent.parent / "data"))
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    # Never write into the source data set
+    work = Path(tempfile.mkdtemp(prefix="ingest-"))
+    for name in ("workers.json", "tasks.json", "calendar.json", "messages.json"):
+        shutil.copy(Path(args.data_dir) / name, work / name)
+    os.environ["DATA_DIR"] = str(work)
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+
+    from tools.data_store import store
+
+    start = datetime(2030, 1, 1)
+    n, size = args.messages, args.batch
+    before = len(store.messages())
+    try:
+        batches = [make_batch(start, size, i) for i in range(0, n, size)]
+        timed(f"append ({size}/batch)", n, lambda: [store.append_messages(b) for b in batches])
+        timed("store.messages() after appends", 0, store.messages)
+
+        one = make_batch(start + timedelta(days=30), 1, 0)
+        store.append_messages(one)
+        timed("store.messages() after one more", 0, store.messages)
+
+        middle = (start + timedelta(seconds=n // 2)).isoformat()
+        end = (start + timedelta(seconds=n // 2 + 1000)).isoformat()
+        found = timed("messages_between() of 1000 seconds", 0, lambda: store.messages_between(middle, end))
+        assert len(found) == 1000, len(found)
+        found = timed("log.scan() of 1000 seconds", 0, lambda: list(store.log.scan(middle, end)))
+        assert len(found) == 1000, len(found)
+
+        from backend.main import app
+
+        http = [make_batch(start + timedelta(days=31), size, i) for i in range(0, n // 10, size)]
+        timed(f"POST /api/messages ({size}/batch)", n // 10, lambda: asyncio.run(post_batches(app, http)))
+
+        compacted = timed("compact into messages.json", 0, store.compact_messages)
+        print(f"\n{compacted:,} compacted; {len(store.messages()) - before:,} messages added")
+    finally:
+        store.log.close()
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Offline load benchmark for /run_agent, the workflow and the tools.
+
+Every agent's Gemini model is replaced by benchmarks.fake_gemini.FakeGemini
+(local, scripted, configurable latency); requests go through the FastAPI app
+in-process, so no API key or network is needed.
+
+    python -m benchmarks.run_agent --scenario mixed --requests 200 --concurrency 16
+    python -m benchmarks.run_agent --scenario tools
+    python -m benchmarks.run_agent --scenario chat --json out.json --max-p95-ms 1500
+    python -m benchmarks.run_agent --scenario workflow --model-concurrency 64 --model-rate 0
+    python -m benchmarks.run_agent --scenario data --data-dir /tmp/ops-100k
+
+Scenarios:
+    chat      open-ended questions (CoreAgent with a tool call)
+    fast      status questions answered by the intent router
+    workflow  "run analysis" (full multi-agent workflow)
+    mixed     70% fast, 20% chat, 10% workflow
+    data      GET /api/data
+    tools     loading the store, then the rule engines and tools called directly
+
+--data-dir points the store at another data set, e.g. one written by
+benchmarks.generate_data.
+
+Workflow and model response caches are off unless --with-caches is given,
+so each workflow request does real work (concurrent ones still coalesce).
+The model scheduler keeps its configured limits unless overridden, so
+results include queueing for the rate limit.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+CHAT_MESSAGES = [
+    "why is W101 late?",
+    "what should I tell the customer waiting on T011?",
+    "explain the reuse score on W194's photo",
+    "who should take over if W101 can't continue?",
+]
+FAST_MESSAGES = [
+    "who is delayed?",
+    "any safety issues?",
+    "scan worker messages",
+    "worker status",
+    "how is W101 doing?",
+]
+WORKFLOW_MESSAGES = ["run analysis"]
+
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def pick_message(scenario: str, rng: random.Random) -> str:
+    if scenario == "mixed":
+        roll = rng.random()
+        scenario = "fast" if roll < 0.7 else "chat" if roll < 0.9 else "workflow"
+    if scenario == "data":
+        return ""
+    pool = {"chat": CHAT_MESSAGES, "fast": FAST_MESSAGES, "workflow": WORKFLOW_MESSAGES}[scenario]
+    return rng.choice(pool)
+
+
+def summarize(name: str, latencies: list, elapsed: float, errors: int) -> dict:
+    return {
+        "scenario": name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+# =====================================================================
+# /run_agent scenarios
+# =====================================================================
+
+async def drive(app, args) -> dict:
+    import httpx
+
+    rng = random.Random(args.seed)
+    messages = [pick_message(args.scenario, rng) for _ in range(args.requests)]
+    latencies = []
+    errors = 0
+    pending = iter(messages)
+
+    async def send(client, message):
+        if args.scenario == "data":
+            response = await client.get("/api/data")
+            return response.status_code == 200
+        response = await client.post("/run_agent", json={"message": message})
+        return response.status_code == 200 and response.json().get("success")
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            for message in pending:
+                t0 = time.perf_counter()
+                ok = await send(client, message)
+                took = time.perf_counter() - t0
+                if ok:
+                    latencies.append(took)
+                else:
+                    errors += 1
+
+        # One unmeasured request of each kind pays first-call costs
+        for message in dict.fromkeys(messages):
+            await send(client, message)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(args.scenario, latencies, elapsed, errors)
+
+
+def run_endpoint(args) -> dict:
+    if not args.with_caches:
+        os.environ.pop("LLM_CACHE_PATH", None)
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+
+    from google.adk.plugins.logging_plugin import LoggingPlugin
+
+    from agents.model_scheduler import scheduler
+    from backend import shared_runner
+    from backend.main import app
+    from benchmarks.fake_gemini import install_fake_models
+
+    install_fake_models(
+        shared_runner.runners.values(),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+    )
+    if not args.keep_logging:
+        for r in shared_runner.runners.values():
+            r.plugin_manager.plugins = [
+                p for p in r.plugin_manager.plugins if not isinstance(p, LoggingPlugin)
+            ]
+    if not args.with_caches:
+        shared_runner.workflow_cache.max_entries = 0
+    if args.model_concurrency is not None:
+        scheduler.max_concurrency = args.model_concurrency
+    if args.model_rate is not None:
+        scheduler.rate_per_second = args.model_rate
+
+    result = asyncio.run(drive(app, args))
+    result["model_scheduler"] = scheduler.stats()
+    result["single_flight"] = shared_runner.workflow_flight.stats()
+    return result
+
+
+# =====================================================================
+# Tools scenario
+# =====================================================================
+
+def run_tools(args) -> dict:
+    from tools.data_store import DataStore, store
+    from tools.delay_engine import detect_delays
+    from tools.digest import _build, get_digest, get_flagged_events
+    from tools.safety_engine import triage_messages
+
+    # Cold load: parse, hash and index every file
+    load = {}
+    for name in ("workers", "tasks", "calendar", "messages"):
+        t0 = time.perf_counter()
+        getattr(DataStore(store.data_dir), name)()
+        load[name + "_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+
+    cases = {
+        "detect_delays": lambda: detect_delays(store.messages(), store.calendar()),
+        "triage_messages": lambda: triage_messages(store.messages()),
+        "digest_build": _build,
+        "get_digest": get_digest,
+        "get_flagged_events": lambda: get_flagged_events(""),
+    }
+    results = {}
+    for name, fn in cases.items():
+        fn()
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            t0 = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - t0)
+        results[name] = summarize(name, latencies, time.perf_counter() - started, 0)
+    return {
+        "scenario": "tools",
+        "data_dir": str(store.data_dir),
+        "messages": len(store.messages()),
+        "cold_load": load,
+        "tools": results,
+    }
+
+
+# =====================================================================
+# CLI
+# =====================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["chat", "fast", "workflow", "mixed", "data", "tools"], default="mixed")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake model latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="read data from this directory instead of data/")
+    parser.add_argument("--model-concurrency", type=int, help="override MODEL_MAX_CONCURRENCY")
+    parser.add_argument("--model-rate", type=float, help="override MODEL_RATE_PER_SECOND (0 = unlimited)")
+    parser.add_argument("--with-caches", action="store_true", help="keep workflow/model response caches on")
+    parser.add_argument("--keep-logging", action="store_true", help="keep LoggingPlugin console output")
+    parser.add_argument("--trace-alloc", action="store_true", help="report Python allocations (slower)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="exit 1 if p95 latency exceeds this")
+    args = parser.parse_args(argv)
+
+    if args.data_dir:
+        # Before anything imports the store
+        os.environ["DATA_DIR"] = args.data_dir
+    if args.trace_alloc:
+        tracemalloc.start()
+    rss_before = rss_mb()
+
+    result = run_tools(args) if args.scenario == "tools" else run_endpoint(args)
+
+    result["rss_mb"] = {"before": round(rss_before, 1), "after": round(rss_mb(), 1)}
+    if args.trace_alloc:
+        current, peak = tracemalloc.get_traced_memory()
+        result["alloc_mb"] = {"current": round(current / 2**20, 2), "peak": round(peak / 2**20, 2)}
+        tracemalloc.stop()
+
+    print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.max_p95_ms is not None and result.get("p95_ms", 0) > args.max_p95_ms:
+        print(f"p95 {result['p95_ms']} ms exceeds {args.max_p95_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 const API_BASE_URL = 'https://ongroundai-backend.onrender.com';
 
 // Global State
-let currentSessionId = 'workflow-session';
+let currentSessionId = null;
 let workflowStartTime = null;
 let agentsCompleted = 0;
 let executionLog = [];
@@ -12,6 +12,7 @@ document.addEventListener('DOMContentLoaded', async () => {
     console.log('Dashboard initializing...');
     await initializeDashboard();
     setupEventListeners();
+    connectAlerts();
 });
 
 // Initialize Dashboard - Load Data
@@ -49,7 +50,7 @@ async function initializeDashboard() {
         }
 
         // Update session info
-        updateSessionInfo(currentSessionId);
+        updateSessionInfo(currentSessionId || 'new');
 
         // Add initial log entry
         addExecutionLog('Dashboard loaded successfully', new Date());
@@ -79,6 +80,55 @@ function setupEventListeners() {
     console.log('Event listeners setup complete');
 }
 
+// Live Safety Alerts - pushed by /ws/alerts as messages are ingested
+let alertRetryDelay = 1000;
+
+function connectAlerts() {
+    const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/ws/alerts`);
+
+    socket.addEventListener('open', () => {
+        alertRetryDelay = 1000;
+    });
+
+    socket.addEventListener('message', (e) => {
+        const frame = JSON.parse(e.data);
+        if (frame.event === 'alert') handleAlert(frame.data, frame.replay);
+    });
+
+    // Reconnect with backoff, up to 30s between attempts
+    socket.addEventListener('close', () => {
+        setTimeout(connectAlerts, alertRetryDelay);
+        alertRetryDelay = Math.min(alertRetryDelay * 2, 30000);
+    });
+}
+
+function handleAlert(alert, replay) {
+    // addExecutionLog renders HTML; worker ids come straight from ingestion
+    const escape = (value) => {
+        const el = document.createElement('span');
+        el.textContent = value;
+        return el.innerHTML;
+    };
+    const label = replay ? 'Recent alert' : 'ALERT';
+    addExecutionLog(
+        `🚨 ${label}: ${escape(alert.worker_id)} (${alert.urgency}) → ${escape(alert.hits.join(', '))}`,
+        new Date()
+    );
+
+    const workerCard = document.getElementById(`worker-${alert.worker_id}`);
+    if (!workerCard) return;
+
+    const statusDot = workerCard.querySelector('.status-dot');
+    const actionText = workerCard.querySelector('.worker-action');
+    if (statusDot) {
+        statusDot.classList.remove('green');
+        statusDot.classList.add('red');
+    }
+    if (actionText) {
+        actionText.textContent = `Safety alert: ${alert.recommended_action}`;
+    }
+}
+
 // Handle Chat Send
 async function handleChatSend() {
     const chatInput = document.getElementById('chat-input');
@@ -96,6 +146,11 @@ async function handleChatSend() {
     const loadingBubble = addChatMessage('Thinking...', 'agent', true);
 
     try {
+        // Prefer the streaming endpoint; fall back to /run_agent if unavailable
+        if (await streamAgent(message, loadingBubble)) {
+            return;
+        }
+
         console.log('Posting to /run_agent...');
 
         const response = await fetch(`${API_BASE_URL}/run_agent`, {
@@ -103,7 +158,7 @@ async function handleChatSend() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ message: message }),
+            body: JSON.stringify({ message: message, session_id: currentSessionId }),
         });
 
         const data = await response.json();
@@ -115,16 +170,16 @@ async function handleChatSend() {
         }
 
         if (data.success) {
+            // Keep the server-assigned conversation for follow-up messages
+            if (data.session_id) {
+                currentSessionId = data.session_id;
+                updateSessionInfo(currentSessionId);
+            }
+
             // Check if workflow was triggered
             if (data.workflow_triggered) {
                 console.log('Workflow triggered!');
 
-                // Update session ID
-                if (data.session_id) {
-                    currentSessionId = data.session_id;
-                    updateSessionInfo(currentSessionId);
-                }
-
                 // Add workflow started message
                 addChatMessage('Starting workflow analysis...', 'agent');
 
@@ -151,6 +206,209 @@ async function handleChatSend() {
     }
 }
 
+// Agent name -> dashboard card id
+const AGENT_CARD_IDS = {
+    DataIngestAgent: 'dataingest',
+    DelayAgent: 'delay',
+    SafetyAgent: 'safety',
+    ReportAgent: 'report'
+};
+
+// Stream /run_agent/stream and render each Server-Sent Event as it arrives.
+// Returns false (without consuming anything) if the endpoint is unavailable.
+async function streamAgent(message, loadingBubble) {
+    let response;
+    try {
+        response = await fetch(`${API_BASE_URL}/run_agent/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ message: message, session_id: currentSessionId }),
+        });
+    } catch (error) {
+        console.warn('Streaming request failed, falling back:', error);
+        return false;
+    }
+
+    if (!response.ok || !response.body) {
+        console.warn('Streaming unavailable, falling back:', response.status);
+        return false;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const stream = { workflow: false, response: '', loadingBubble: loadingBubble };
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE frames are separated by a blank line
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+
+            let type = 'message';
+            let data = '';
+            frame.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) type = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+
+            handleStreamEvent(type, data ? JSON.parse(data) : {}, stream);
+        }
+    }
+
+    removeLoadingBubble(stream);
+    return true;
+}
+
+function removeLoadingBubble(stream) {
+    const bubble = stream.loadingBubble;
+    if (bubble && bubble.parentNode) {
+        bubble.parentNode.removeChild(bubble);
+    }
+    stream.loadingBubble = null;
+}
+
+function elapsedSeconds() {
+    return ((Date.now() - workflowStartTime) / 1000).toFixed(1);
+}
+
+function findingsCount(value) {
+    if (Array.isArray(value)) return value.length;
+    return (String(value || '').match(/worker_id/g) || []).length;
+}
+
+// Render one streamed event
+function handleStreamEvent(type, data, stream) {
+    switch (type) {
+        case 'start':
+            if (data.session_id) {
+                currentSessionId = data.session_id;
+                updateSessionInfo(currentSessionId);
+            }
+            stream.workflow = !!data.workflow_triggered;
+            if (stream.workflow) {
+                removeLoadingBubble(stream);
+                addChatMessage('Starting workflow analysis...', 'agent');
+
+                workflowStartTime = Date.now();
+                agentsCompleted = 0;
+                executionLog = [];
+                document.getElementById('execution-log').innerHTML = '';
+                addExecutionLog('WORKFLOW STARTED', new Date());
+                if (data.cached) {
+                    addExecutionLog('Data unchanged since last run → reusing cached results', new Date());
+                }
+            }
+            break;
+
+        case 'agent_started': {
+            if (!stream.workflow) break;
+            // Sharded specialists are named e.g. DelayAgent_shard2
+            const cardId = AGENT_CARD_IDS[data.agent.replace(/_shard\d+$/, '')];
+            if (cardId) updateAgentStatus(cardId, 'running');
+            addExecutionLog(`${data.agent} → Started`, new Date());
+            break;
+        }
+
+        case 'tool_call':
+            if (stream.workflow) {
+                addExecutionLog(`${data.agent}: ${data.name}()`, new Date());
+            }
+            break;
+
+        case 'shard_findings':
+            if (stream.workflow) {
+                addExecutionLog(`${data.agent} → Found ${findingsCount(data.value)}`, new Date());
+            }
+            break;
+
+        case 'delay_findings': {
+            const count = findingsCount(data.value);
+            document.getElementById('delay-findings-count').textContent = `Found: ${count} delay`;
+            document.getElementById('delay-output').textContent = 'delay_findings';
+            document.getElementById('delay-duration').textContent = `(${elapsedSeconds()}s)`;
+            updateAgentStatus('delay', 'complete');
+            addExecutionLog(`⏰ DelayAgent → Found ${count} delay(s)`, new Date());
+
+            const raw = typeof data.value === 'string' ? data.value : JSON.stringify(data.value);
+            updateWorkerCardsFromFindings(raw, 'delay');
+            break;
+        }
+
+        case 'safety_findings': {
+            const count = findingsCount(data.value);
+            document.getElementById('safety-findings-count').textContent = `Found: ${count} safety alerts`;
+            document.getElementById('safety-output').textContent = 'safety_findings';
+            document.getElementById('safety-duration').textContent = `(${elapsedSeconds()}s)`;
+            updateAgentStatus('safety', 'complete');
+            addExecutionLog(`🛡️ SafetyAgent → Found ${count} safety alert(s)`, new Date());
+
+            const raw = typeof data.value === 'string' ? data.value : JSON.stringify(data.value);
+            updateWorkerCardsFromFindings(raw, 'safety');
+            break;
+        }
+
+        case 'final_report': {
+            document.getElementById('report-status').textContent = `✓ Complete (${elapsedSeconds()}s)`;
+            document.getElementById('report-status').classList.add('complete');
+            document.getElementById('report-tools').textContent = 'synthesize findings';
+            document.getElementById('report-output').textContent = 'final_report';
+            updateAgentStatus('report', 'complete');
+            addExecutionLog('📋 ReportAgent → Report generated', new Date());
+
+            const report = typeof data.value === 'string' ? data.value : JSON.stringify(data.value, null, 2);
+            addChatMessage(report, 'agent');
+            stream.reported = true;
+            break;
+        }
+
+        case 'text':
+            stream.response = data.text;
+            if (stream.workflow && data.agent === 'DataIngestAgent') {
+                document.getElementById('dataingest-status').textContent = `✓ Complete (${elapsedSeconds()}s)`;
+                document.getElementById('dataingest-status').classList.add('complete');
+                document.getElementById('dataingest-data').innerHTML =
+                    `<div class="agent-data-item">• ${data.text}</div>`;
+                updateAgentStatus('dataingest', 'complete');
+                agentsCompleted++;
+                updateHeaderStats();
+            }
+            break;
+
+        case 'done':
+            removeLoadingBubble(stream);
+            if (!stream.workflow) {
+                addChatMessage(data.response || 'No response', 'agent');
+                break;
+            }
+            if (!stream.reported && data.response) {
+                addChatMessage(data.response, 'agent');
+            }
+            if (data.coalesced) {
+                addExecutionLog('Joined an analysis already in progress → shared results', new Date());
+            }
+            agentsCompleted = 4;
+            updateHeaderStats();
+            document.getElementById('duration').textContent = `${elapsedSeconds()}s`;
+            addExecutionLog(`WORKFLOW COMPLETE - Total time: ${elapsedSeconds()}s`, new Date());
+            break;
+
+        case 'error':
+            removeLoadingBubble(stream);
+            console.error(' Stream error:', data.error);
+            addChatMessage('Error: ' + (data.error || 'Unknown error'), 'agent');
+            break;
+    }
+}
+
 // Execute Workflow
 async function executeWorkflow(workflowData) {
     console.log('Starting workflow execution...');
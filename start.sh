@@ -1,3 +1,7 @@
 #!/bin/bash
 export PYTHONPATH=/opt/render/project/src
-uvicorn backend.main:app --host 0.0.0.0 --port $PORT
+# Multiple workers need a shared session store; see backend/sqlite_services.py
+if [ "${WEB_CONCURRENCY:-1}" -gt 1 ]; then
+    export SESSION_DB_PATH=${SESSION_DB_PATH:-sessions.db}
+fi
+uvicorn backend.main:app --host 0.0.0.0 --port $PORT --workers ${WEB_CONCURRENCY:-1}
@@ -0,0 +1,18 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tools.data_store import DataStore
+
+DATA = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A DataStore over a copy of data/."""
+    for name in ("workers.json", "tasks.json", "calendar.json", "messages.json"):
+        shutil.copy(DATA / name, tmp_path / name)
+    s = DataStore(tmp_path)
+    yield s
+    s.log.close()
@@ -0,0 +1,38 @@
+from backend import alerts
+from backend.alerts import AlertFeed, AlertHub
+from tools.data_store import DataStore
+
+
+def text(**extra):
+    return {"worker_id": "W101", "type": "text", "text": "on my way", **extra}
+
+
+def test_log_tail_returns_each_message_once_across_compaction(store):
+    position, _ = store.log.tail()
+    store.append_messages([text(text="one")])
+    position, new = store.log.tail(position)
+    assert [m["text"] for m in new] == ["one"]
+
+    store.log.seal()
+    store.append_messages([text(text="two")])
+    position, new = store.log.tail(position)
+    assert [m["text"] for m in new] == ["two"]
+
+    store.compact_messages()
+    assert store.log.tail(position)[1] == []
+
+
+def test_feed_alerts_messages_another_process_ingested(store, monkeypatch):
+    monkeypatch.setattr(alerts, "store", store)
+    feed = AlertFeed(AlertHub())
+    feed._position = store.log.tail()[0]
+
+    other = DataStore(store.data_dir)
+    try:
+        other.append_messages([text(text="accident near gate, worker injured"), text(text="on my way")])
+    finally:
+        other.log.close()
+
+    raised = feed.check()
+    assert [a["worker_id"] for a in raised] == ["W101"]
+    assert feed.check() == []
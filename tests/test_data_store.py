@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from tools.data_store import DataStore
+
+
+def text(**extra):
+    return {"worker_id": "W101", "type": "text", "text": "on my way", **extra}
+
+
+def compacted_ids(store) -> list:
+    return [m["msg_id"] for m in json.loads((store.data_dir / "messages.json").read_text())["messages"]]
+
+
+def test_new_ids_are_numbered_after_caller_ids(store):
+    top = max(int(m["msg_id"][1:]) for m in store.messages())
+    store.append_messages([text(msg_id=f"m{top + 2}")])
+    ids = [m["msg_id"] for m in store.append_messages([text(), text(), text()])]
+    assert ids == [f"m{top + n}" for n in (3, 4, 5)]
+
+    store.compact_messages()
+    assert len(compacted_ids(store)) == len(set(compacted_ids(store)))
+
+
+@pytest.mark.parametrize("batch", [
+    [text(msg_id="m1")],
+    [text(msg_id="x1"), text(msg_id="x1")],
+])
+def test_taken_ids_are_rejected(store, batch):
+    before = store.message("m1")
+    with pytest.raises(ValueError, match="already exists"):
+        store.append_messages(batch)
+    assert store.message("m1") is before
+    assert len(store.log) == 0
+
+
+@pytest.mark.parametrize("msg_id", [{"a": 1}, 7, ""])
+def test_non_string_ids_are_rejected(store, msg_id):
+    with pytest.raises(ValueError, match="msg_id"):
+        store.append_messages([text(msg_id=msg_id)])
+
+
+def test_stores_sharing_a_directory_see_each_others_appends(store):
+    # A second store on the same directory stands in for another worker process
+    other = DataStore(store.data_dir)
+    try:
+        a = store.append_messages([text(text="from A")])[0]["msg_id"]
+        b = other.append_messages([text(text="from B")])[0]["msg_id"]
+        assert a != b
+        for s in (store, other):
+            assert s.message(a)["text"] == "from A"
+            assert s.message(b)["text"] == "from B"
+
+        other.compact_messages()
+        assert store.message(a) is not None and store.message(b) is not None
+        assert len(DataStore(store.data_dir).messages()) == len(store.messages())
+    finally:
+        other.log.close()
+
+
+def test_append_recovers_a_record_left_half_written(store):
+    store.append_messages([text(text="before")])
+    with (store.data_dir / "messages.log").open("ab") as f:
+        f.write(b"\x64\x00\x00\x00{\"torn")
+    other = DataStore(store.data_dir)
+    try:
+        msg_id = other.append_messages([text(text="after")])[0]["msg_id"]
+        assert [m["text"] for m in store.messages()[-2:]] == ["before", "after"]
+        assert DataStore(store.data_dir).message(msg_id)["text"] == "after"
+    finally:
+        other.log.close()
+
+
+def test_fingerprint_follows_content_not_compaction_or_restarts(store):
+    empty = store.fingerprint()
+    store.append_messages([text(text="one"), text(text="two")])
+    logged = store.fingerprint()
+    assert logged != empty
+
+    store.compact_messages()
+    assert store.fingerprint() == logged
+    assert DataStore(store.data_dir).fingerprint() == logged
+
+
+def test_appends_keep_the_time_indexes_in_order(store):
+    late, newest = store.append_messages([
+        text(text="late", time="2000-01-01T00:00:00"),
+        text(text="newest", time="2099-01-01T00:00:00"),
+    ])
+    fresh = DataStore(store.data_dir)
+    try:
+        for s in (store, fresh):
+            assert s.messages_between()[0]["msg_id"] == late["msg_id"]
+            assert s.latest_message_time() == newest["time"]
+            worker = s.messages_for_worker("W101")
+            assert (worker[0]["msg_id"], worker[-1]["msg_id"]) == (late["msg_id"], newest["msg_id"])
+        assert [m["msg_id"] for m in store.messages()] == [m["msg_id"] for m in fresh.messages()]
+        assert store.messages_since("2050-01-01T00:00:00") == [newest]
+    finally:
+        fresh.log.close()
+
+
+def test_log_scan_reads_a_time_range_from_every_segment(store):
+    store.append_messages([text(text="b", time="2030-01-01T00:00:02"), text(text="d", time="2030-01-01T00:00:04")])
+    store.log.seal()
+    store.append_messages([text(text="c", time="2030-01-01T00:00:03"), text(text="a", time="2030-01-01T00:00:01")])
+
+    scan = store.log.scan
+    assert [m["text"] for m in scan("2030-01-01T00:00:01", "2030-01-01T00:00:04")] == ["a", "b", "c"]
+    assert [m["text"] for m in scan(limit=2)] == ["a", "b"]
+
+    reopened = DataStore(store.data_dir)
+    try:
+        assert [m["text"] for m in reopened.log.scan("2030-01-01T00:00:04")] == ["d"]
+    finally:
+        reopened.log.close()
@@ -0,0 +1,81 @@
+from tools.delay_engine import delay_keywords, detect_delays, is_wrong_location
+
+CALENDAR = [
+    {"worker_id": "W101", "task_id": "T2", "start": "2025-11-28T11:00:00", "location": "Sector 9"},
+    {"worker_id": "W101", "task_id": "T1", "start": "2025-11-28T09:00:00", "location": "Sector 12"},
+]
+
+
+def message(msg_time, **fields):
+    return {"worker_id": "W101", "time": f"2025-11-28T{msg_time}:00", **fields}
+
+
+def transcribe(audio_id):
+    return {"translated_text": f"{audio_id} transcript", "urgency": audio_id.split("_")[0]}
+
+
+def analyze(image_id):
+    return {
+        "reused": {"reuse_score": 0.92, "note": "Image looks reused."},
+        "wrongloc": {"reuse_score": 0.1, "note": "GPS does not match assigned site."},
+        "fresh": {"reuse_score": 0.1, "note": "Fresh image."},
+    }[image_id]
+
+
+def test_keywords_match_whole_words_only():
+    assert delay_keywords("Stuck in TRAFFIC, road closed") == ["stuck", "traffic", "road closed"]
+    assert delay_keywords("Relate the stucked lateral") == []
+    assert is_wrong_location("Photo is from the wrong site")
+    assert not is_wrong_location("Location matches")
+
+
+def test_messages_are_joined_to_the_task_they_fall_in():
+    rows = detect_delays([
+        message("11:30", type="text", text="Running late"),
+        message("09:20", type="text", text="Road closed"),
+        message("08:50", type="text", text="Stuck at the depot"),
+    ], CALENDAR)
+
+    # In time order; before the first task counts against it, with no lateness
+    assert [(r["task_id"], r["reason"]) for r in rows] == [
+        ("T1", 'Worker reported "Stuck at the depot" at 08:50.'),
+        ("T1", 'Worker reported "Road closed" at 09:20 (20 min after scheduled start 09:00).'),
+        ("T2", 'Worker reported "Running late" at 11:30 (30 min after scheduled start 11:00).'),
+    ]
+
+
+def test_media_evidence_and_urgency_thresholds():
+    rows = detect_delays([
+        message("09:10", type="audio", audio_id="high_1"),
+        message("09:11", type="audio", audio_id="medium_1"),
+        message("09:12", type="audio", audio_id="low_1"),
+        message("09:13", type="image", image_id="reused"),
+        message("09:14", type="image", image_id="wrongloc"),
+        message("09:15", type="image", image_id="fresh"),
+        message("09:16", type="text", text="All good here"),
+    ], CALENDAR, transcribe, analyze)
+
+    assert [r["reason"].split(":")[0] for r in rows] == [
+        "Audio message (high urgency)",
+        "Audio message (medium urgency)",
+        "Image reused looks reused (reuse_score 0.92)",
+        "Image wrongloc",
+    ]
+    assert "Call W101 immediately" in rows[0]["suggested_action"]
+    assert "redirect them to Sector 12" in rows[3]["suggested_action"]
+
+
+def test_repeated_evidence_is_reported_once_across_runs():
+    seen = set()
+    first = detect_delays([
+        message("09:10", type="text", text="Stuck in traffic"),
+        message("09:20", type="text", text="stuck in traffic"),
+    ], CALENDAR, seen=seen)
+    later = detect_delays([
+        message("09:30", type="text", text="Stuck in traffic"),
+        message("11:30", type="text", text="Stuck in traffic"),
+    ], CALENDAR, seen=seen)
+
+    assert [r["task_id"] for r in first] == ["T1"]
+    # Same words against the next task are new evidence
+    assert [r["task_id"] for r in later] == ["T2"]
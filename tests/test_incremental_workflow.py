@@ -0,0 +1,111 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agents import data_ingest_agent
+from agents.data_ingest_agent import (
+    INCREMENTAL_KEY,
+    NEXT_WATERMARK_KEY,
+    PREVIOUS_FINDINGS_KEY,
+    WATERMARK_KEY,
+    _watermark,
+    new_messages,
+)
+from agents.delay_agent import DELAY_SEEN_KEY, NEXT_DELAY_SEEN_KEY
+from agents.findings_merge_agent import FINDINGS_CHANGED_KEY, FindingsMergeAgent, merge_findings
+
+
+def delay(worker_id, reason):
+    return {"worker_id": worker_id, "task_id": "T1", "reason": reason, "suggested_action": "Call them."}
+
+
+def text(msg_time, msg_id=None):
+    msg = {"worker_id": "W101", "type": "text", "text": "stuck", "time": msg_time}
+    return {**msg, "msg_id": msg_id} if msg_id else msg
+
+
+def test_merge_keeps_previous_findings_and_adds_only_new_ones():
+    previous = [delay("W101", "Road closed"), delay("W194", "Traffic")]
+    # A repeat of a known finding (other wording of the action) and a new one;
+    # W194's finding is not repeated but stays open
+    new = [{**delay("W101", "Road closed"), "suggested_action": "Call W101."}, delay("W205", "Stuck")]
+
+    merged = merge_findings("delay_findings", previous, new)
+    assert merged == previous + [delay("W205", "Stuck")]
+    assert merge_findings("delay_findings", merged, []) == merged
+
+
+@pytest.fixture
+def ingest_store(store, monkeypatch):
+    monkeypatch.setattr(data_ingest_agent, "store", store)
+    return store
+
+
+def test_new_messages_are_the_ones_past_the_watermark(ingest_store):
+    assert new_messages({}) is None
+    state = {WATERMARK_KEY: _watermark()}
+    assert new_messages(state) == []
+
+    last = state[WATERMARK_KEY]["time"]
+    # Same time as the watermark but not seen yet, and a later one
+    ingest_store.append_messages([text(last, "tied"), text("2099-01-01T00:00:00", "later")])
+    assert [m["msg_id"] for m in new_messages(state)] == ["tied", "later"]
+
+    state[WATERMARK_KEY] = _watermark()
+    assert new_messages(state) == []
+
+
+def test_watermark_is_dropped_when_older_messages_or_the_calendar_change(ingest_store):
+    state = {WATERMARK_KEY: _watermark()}
+    ingest_store.append_messages([text("2000-01-01T00:00:00")])
+    assert new_messages(state) is None
+
+    state = {WATERMARK_KEY: _watermark()}
+    path = ingest_store.data_dir / "calendar.json"
+    calendar = json.loads(path.read_text())
+    calendar["worker_calendar"] = calendar["worker_calendar"][1:]
+    path.write_text(json.dumps(calendar))
+    assert new_messages(state) is None
+
+
+def merge_run(state):
+    ctx = SimpleNamespace(session=SimpleNamespace(state=state), invocation_id="inv-1", branch=None)
+    agent = FindingsMergeAgent(name="FindingsMergeAgent")
+
+    async def run():
+        return [event async for event in agent._run_async_impl(ctx)]
+
+    (event,) = asyncio.run(run())
+    return event.actions.state_delta
+
+
+def incremental_state(delay_output):
+    return {
+        INCREMENTAL_KEY: True,
+        PREVIOUS_FINDINGS_KEY: {"delay_findings": [delay("W101", "Road closed")], "safety_findings": []},
+        WATERMARK_KEY: {"time": "old"},
+        NEXT_WATERMARK_KEY: {"time": "new"},
+        NEXT_DELAY_SEEN_KEY: [["W205", "T1", "text", "stuck"]],
+        "delay_findings": delay_output,
+        "safety_findings": "[]",
+    }
+
+
+def test_merge_agent_advances_the_watermark_after_a_readable_run():
+    delta = merge_run(incremental_state(json.dumps([delay("W205", "Stuck")])))
+    assert json.loads(delta["delay_findings"]) == [delay("W101", "Road closed"), delay("W205", "Stuck")]
+    assert delta[WATERMARK_KEY] == {"time": "new"}
+    assert delta[DELAY_SEEN_KEY] == [["W205", "T1", "text", "stuck"]]
+    assert delta[FINDINGS_CHANGED_KEY] is True
+
+    delta = merge_run(incremental_state("[]"))
+    assert delta[WATERMARK_KEY] == {"time": "new"}
+    assert delta[FINDINGS_CHANGED_KEY] is False
+
+
+def test_merge_agent_keeps_the_watermark_when_a_run_cannot_be_read():
+    delta = merge_run(incremental_state("the model ran out of tokens [{\"worker_id\": "))
+    assert WATERMARK_KEY not in delta
+    assert json.loads(delta["delay_findings"]) == [delay("W101", "Road closed")]
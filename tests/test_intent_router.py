@@ -0,0 +1,78 @@
+import pytest
+
+from backend.intent_router import WORKFLOW, route
+from benchmarks.intent_routing import CASES
+
+
+@pytest.mark.parametrize("message, expected", CASES)
+def test_labelled_messages_route_to_their_intent(message, expected):
+    assert route(message).intent == expected
+
+
+@pytest.mark.parametrize("message", [
+    "any safety issues? please run analysis",
+    "show delays then run analysis",
+    "worker status and run full scan",
+    "why is W101 late? run workflow",
+])
+def test_workflow_keyword_anywhere_starts_the_workflow(message):
+    assert route(message).intent == WORKFLOW
+
+
+def read_from(store, monkeypatch):
+    """Point intent_router and its digests at `store`, with nothing computed yet."""
+    from backend import intent_router
+    from tools import digest
+
+    monkeypatch.setattr(digest, "store", store)
+    monkeypatch.setattr(digest, "_cursor", digest.MessageCursor(store, ("workers", "tasks", "calendar")))
+    monkeypatch.setattr(digest, "_cached", (None, None))
+    monkeypatch.setattr(intent_router, "store", store)
+    monkeypatch.setattr(intent_router, "_scan", intent_router._RuleScan())
+    monkeypatch.setattr(intent_router, "_cached", (None, {}))
+    return intent_router
+
+
+@pytest.fixture
+def fast(store, monkeypatch):
+    return read_from(store, monkeypatch)
+
+
+def late_messages(count: int, start: int = 0) -> list:
+    workers = ["W101", "W194", "W205", "W130"]
+    return [
+        {
+            "worker_id": workers[i % len(workers)],
+            "type": "text",
+            "text": f"stuck in traffic near gate {i}",
+            "time": f"2025-11-28T12:{i // 60:02d}:{i % 60:02d}",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def test_fast_answers_list_a_bounded_number_of_items(fast, store, monkeypatch):
+    monkeypatch.setattr(fast, "FAST_ANSWER_MAX_ITEMS", 3)
+    store.append_messages(late_messages(50))
+
+    delays = fast.answer(fast.Route(fast.DELAYS, "pattern"))
+    assert delays.count("• ") == 3
+    assert "more older delay signal(s)" in delays
+    assert "stuck in traffic near gate 49" in delays
+
+    for intent in (fast.SAFETY, fast.MESSAGES, fast.WORKER_STATUS):
+        assert fast.answer(fast.Route(intent, "pattern")).count("• ") <= 3
+
+
+def test_fast_answers_extended_with_new_messages_match_a_full_rebuild(fast, store, monkeypatch):
+    intents = (fast.DELAYS, fast.SAFETY, fast.MESSAGES, fast.WORKER_STATUS)
+    for intent in intents:
+        fast.answer(fast.Route(intent, "pattern"))
+    store.append_messages(late_messages(20))
+    for intent in intents:
+        fast.answer(fast.Route(intent, "pattern"))
+    store.append_messages(late_messages(20, start=20))
+    extended = [fast.answer(fast.Route(intent, "pattern")) for intent in intents]
+
+    read_from(store, monkeypatch)
+    assert extended == [fast.answer(fast.Route(intent, "pattern")) for intent in intents]
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from tools.json_extract import JsonExtractor, extract_json, findings_validator
+
+ROW = {"worker_id": "W101", "issue": "Accident {near} [site]", "urgency": "high", "recommended_action": "Call now."}
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps([ROW]),
+    "```json\n" + json.dumps([ROW]) + "\n```",
+    "Findings:\n```json\n" + json.dumps([ROW], indent=2) + "\n```\nEscalate {urgent} ones first. {",
+    'Example: {"worker_id": "W1"} is not a finding. Real ones: ' + json.dumps([ROW]),
+])
+def test_findings_are_found_in_fenced_or_surrounding_text(text):
+    assert extract_json(text, findings_validator("safety_findings")) == [ROW]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "No findings to report.",
+    json.dumps([ROW])[:-10],
+    "```json\n[" + json.dumps(ROW) + ", {\"worker_id\": \"W2\", \"issue\": \"cut off",
+    "{" * 10_000 + " truncated",
+    "[1, 2} {3]",
+])
+def test_truncated_or_unbalanced_output_gives_none(text):
+    assert extract_json(text, findings_validator("safety_findings")) is None
+
+
+def test_rows_missing_required_keys_are_rejected():
+    partial = [{"worker_id": "W101", "issue": "Accident"}]
+    assert extract_json(json.dumps(partial), findings_validator("safety_findings")) is None
+    assert extract_json(json.dumps(partial)) == partial
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64])
+def test_chunked_input_gives_the_same_value(size):
+    text = 'Here {"note": "a \\"quoted\\" } brace"} and ```json\n' + json.dumps([ROW]) + "\n```"
+    extractor = JsonExtractor(findings_validator("safety_findings"))
+    for i in range(0, len(text), size):
+        extractor.feed(text[i:i + size])
+    assert extractor.value == [ROW]
+    assert extractor.done
@@ -0,0 +1,14 @@
+from tools.analyze_image_mock import analyze_image_mock
+from tools.transcribe_audio_mock import transcribe_audio_mock
+
+
+def test_callers_cannot_change_later_results():
+    transcribe_audio_mock("audio_accident")["urgency"] = "low"
+    transcribe_audio_mock("unknown")["text"] = "changed"
+    analyze_image_mock("img_siteok_001")["gps"]["lat"] = 0
+    analyze_image_mock("unknown")["note"] = "changed"
+
+    assert transcribe_audio_mock("audio_accident")["urgency"] == "high"
+    assert transcribe_audio_mock("unknown")["text"] == "Unclear audio"
+    assert analyze_image_mock("img_siteok_001")["gps"]["lat"] == 12.9311
+    assert analyze_image_mock("unknown")["note"] == "Unknown image ID."
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import tenacity
+from google.genai import _api_client, types
+
+from agents.metrics import MetricsPlugin, retries_total
+
+
+def test_retries_are_counted_without_changing_the_log_level():
+    MetricsPlugin()
+    level = logging.getLogger("google_genai._api_client").level
+    before = retries_total._values.get(("unknown",), 0)
+    args = _api_client.retry_args(types.HttpRetryOptions(attempts=3, initial_delay=0.001, max_delay=0.001))
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _api_client.errors.APIError(503, {})
+        return "ok"
+
+    assert tenacity.Retrying(**args)(flaky) == "ok"
+    assert retries_total._values[("unknown",)] - before == 2
+    assert logging.getLogger("google_genai._api_client").level == level
+
+
+def test_finished_run_forgets_calls_that_never_ended():
+    plugin = MetricsPlugin()
+    ctx = SimpleNamespace(invocation_id="inv-1", agent=SimpleNamespace(name="Workflow"))
+    callback = SimpleNamespace(invocation_id="inv-1", agent_name="DelayAgent")
+
+    async def run():
+        await plugin.before_run_callback(invocation_context=ctx)
+        await plugin.before_agent_callback(agent=SimpleNamespace(name="DelayAgent"), callback_context=callback)
+        await plugin.before_model_callback(callback_context=callback, llm_request=SimpleNamespace(model="m"))
+        # The agent and model call were cancelled, so only the run ends
+        await plugin.after_run_callback(invocation_context=ctx)
+
+    asyncio.run(run())
+    assert plugin._started == {}
+    assert plugin._models == {}
@@ -0,0 +1,42 @@
+import asyncio
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from agents import model_scheduler
+from agents.model_scheduler import ModelScheduler, ScheduledGemini
+
+
+class FakeModel(ScheduledGemini):
+    async def _call_model(self, llm_request, stream):
+        yield LlmResponse()
+        yield LlmResponse()
+
+
+def test_slot_is_released_before_responses_are_passed_on(monkeypatch):
+    scheduler = ModelScheduler(max_concurrency=1, rate_per_second=0)
+    monkeypatch.setattr(model_scheduler, "scheduler", scheduler)
+    model = FakeModel(model="fake")
+
+    async def consume():
+        active = []
+        async for _ in model.generate_content_async(LlmRequest()):
+            active.append(scheduler.active)
+        return active
+
+    assert asyncio.run(consume()) == [0, 0]
+    assert scheduler.granted == 1
+
+def test_streamed_responses_are_passed_on_as_they_arrive(monkeypatch):
+    scheduler = ModelScheduler(max_concurrency=1, rate_per_second=0)
+    monkeypatch.setattr(model_scheduler, "scheduler", scheduler)
+    model = FakeModel(model="fake")
+
+    async def consume():
+        active = []
+        async for _ in model.generate_content_async(LlmRequest(), stream=True):
+            active.append(scheduler.active)
+        return active, scheduler.active
+
+    assert asyncio.run(consume()) == ([1, 1], 0)
+    assert scheduler.granted == 1
@@ -0,0 +1,104 @@
+import asyncio
+
+from backend.report_scheduler import ReportScheduler
+
+
+def test_loop_survives_a_failing_key():
+    keys = iter([ValueError("messages.json is being written"), ("v1",)])
+
+    def key():
+        k = next(keys, ("v1",))
+        if isinstance(k, Exception):
+            raise k
+        return k
+
+    async def run(k):
+        return {"final_report": f"report for {k}"}
+
+    async def main():
+        scheduler = ReportScheduler(run, key, interval_seconds=60, poll_seconds=0.01, debounce_seconds=0)
+        scheduler.start()
+        for _ in range(100):
+            if scheduler.runs:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    assert scheduler.runs == 1
+    assert scheduler.failures == 1
+    assert scheduler.latest()["result"] == {"final_report": "report for ('v1',)"}
+
+
+async def wait_for(condition, tries=200):
+    for _ in range(tries):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_one_process_runs_and_every_process_serves_its_report(tmp_path):
+    calls = []
+
+    async def run(k):
+        calls.append(k)
+        return {"final_report": "report"}
+
+    def make():
+        return ReportScheduler(
+            run, lambda: ("v1",), interval_seconds=60, poll_seconds=0.01, debounce_seconds=0, state_dir=tmp_path
+        )
+
+    async def main():
+        first, second = make(), make()
+        first.start()
+        second.start()
+        await wait_for(lambda: calls)
+        await asyncio.sleep(0.05)
+        assert len(calls) == 1
+        assert [s.leader for s in (first, second)].count(True) == 1
+        for s in (first, second):
+            assert s.latest()["result"] == {"final_report": "report"}
+            assert s.latest()["current"]
+
+        # The runner exits; the other takes over without running again
+        runner, other = (first, second) if first.leader else (second, first)
+        await runner.stop()
+        await wait_for(lambda: other.leader)
+        await asyncio.sleep(0.05)
+        assert other.leader and len(calls) == 1
+
+        # A restart over unchanged data serves the saved report
+        await other.stop()
+        restarted = make()
+        restarted.start()
+        await wait_for(lambda: restarted.leader)
+        await asyncio.sleep(0.05)
+        await restarted.stop()
+        assert len(calls) == 1
+        assert restarted.latest()["result"] == {"final_report": "report"}
+
+    asyncio.run(main())
+
+
+def test_latest_is_served_as_stale_when_the_key_fails():
+    keys = [("v1",)]
+
+    def key():
+        if not keys:
+            raise OSError("tasks.json vanished")
+        return keys[0]
+
+    async def run(k):
+        return {"final_report": "report"}
+
+    async def main():
+        scheduler = ReportScheduler(run, key, interval_seconds=60)
+        await scheduler.refresh()
+        keys.clear()
+        return scheduler.latest()
+
+    latest = asyncio.run(main())
+    assert latest["result"] == {"final_report": "report"}
+    assert latest["current"] is False
@@ -0,0 +1,49 @@
+import pytest
+
+from tools.safety_engine import alerts_for, matcher, triage_messages
+
+
+@pytest.mark.parametrize("text", [
+    "Main aage ja raha hoon",
+    "Aage traffic hai",
+    "Chota sa kaam baaki hai",
+    "Customer was very helpful",
+    "Got fired up about the firewall",
+    "Met a fellow technician",
+    "Customer was shocked by the bill",
+])
+def test_keywords_do_not_match_inside_longer_words(text):
+    assert matcher.score(text) == (0, [])
+
+
+@pytest.mark.parametrize("text, hits", [
+    ("Aag lagi hai!", ["aag"]),
+    ("Chot lagi", ["chot"]),
+    ("Need help", ["help"]),
+    ("Fire near the panel", ["fire"]),
+    ("I fell off the ladder", ["fell"]),
+    ("Got a shock", ["shock"]),
+    ("Road is dangerous", ["dangerous"]),
+    ("Worker gir gaya", ["gir gaya"]),
+])
+def test_keywords_match_whole_words(text, hits):
+    assert matcher.find(text) == hits
+
+
+def test_prefix_words_raise_no_finding_or_alert():
+    messages = [{"msg_id": "m1", "worker_id": "W101", "type": "text",
+                 "text": "Aage traffic hai", "time": "2025-11-28T10:00:00"}]
+    assert triage_messages(messages) == {"findings": [], "ambiguous": []}
+    assert alerts_for(messages) == []
+
+
+def test_high_urgency_audio_without_keywords_is_high_urgency():
+    messages = [{"msg_id": "m1", "worker_id": "W101", "type": "audio",
+                 "audio_id": "a1", "time": "2025-11-28T10:00:00"}]
+
+    def transcribe(audio_id):
+        return {"text": "Jaldi aao", "translated_text": "Come quickly", "urgency": "high"}
+
+    findings = triage_messages(messages, transcribe=transcribe)["findings"]
+    assert [f["urgency"] for f in findings] == ["high"]
+    assert [a["urgency"] for a in alerts_for(messages, transcribe=transcribe)] == ["high"]
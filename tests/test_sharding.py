@@ -0,0 +1,52 @@
+import json
+
+from agents import data_ingest_agent
+from agents.data_ingest_agent import WORKERS_KEY, active_shards, shard_key, shard_messages, shard_of
+from agents.delay_agent import NEXT_DELAY_SEEN_KEY
+from agents.findings_merge_agent import SHARD_ERRORS_KEY, merge_shards
+
+
+def test_a_workers_messages_all_go_to_one_shard(monkeypatch):
+    monkeypatch.setattr(data_ingest_agent, "WORKFLOW_SHARD_MIN_WORKERS", 100)
+    # crc32, so the same in every process
+    assert shard_of("W101", 4) == 3702477161 % 4
+    workers = [f"W{i}" for i in range(200)]
+    messages = [{"worker_id": w, "n": n} for n in range(3) for w in workers]
+    state = {WORKERS_KEY: workers}
+
+    # 200 workers use 2 of the 4 shards; the others get nothing to do
+    parts = [shard_messages(state, messages, shard, 4) for shard in range(4)]
+    assert parts[2] == parts[3] == []
+    assert sorted(map(id, parts[0] + parts[1])) == sorted(map(id, messages))
+    for shard in (0, 1):
+        assert {shard_of(m["worker_id"], 2) for m in parts[shard]} == {shard}
+    assert shard_messages(state, messages, None, 4) is messages
+
+
+def test_active_shards_follow_the_worker_count(monkeypatch):
+    monkeypatch.setattr(data_ingest_agent, "WORKFLOW_SHARD_MIN_WORKERS", 100)
+    assert active_shards({WORKERS_KEY: []}, 4) == 1
+    assert active_shards({WORKERS_KEY: [{}] * 99}, 4) == 1
+    assert active_shards({WORKERS_KEY: [{}] * 250}, 4) == 2
+    assert active_shards({WORKERS_KEY: [{}] * 10_000}, 4) == 4
+
+
+def finding(worker_id):
+    return {"worker_id": worker_id, "task_id": "T1", "reason": "Late", "suggested_action": "Call."}
+
+
+def test_merge_shards_concatenates_in_shard_order_and_reports_unreadable_shards():
+    state = {
+        shard_key("delay_findings", 0): json.dumps([finding("W1")]),
+        shard_key("delay_findings", 1): "```json\n" + json.dumps([finding("W2"), finding("W3")]) + "\n```",
+        shard_key("safety_findings", 0): "[]",
+        shard_key("safety_findings", 1): "Sorry, I could not finish",
+        shard_key(NEXT_DELAY_SEEN_KEY, 0): [["W1", "T1", "text", "late"]],
+        shard_key(NEXT_DELAY_SEEN_KEY, 1): [["W2", "T1", "text", "late"], ["W1", "T1", "text", "late"]],
+    }
+
+    delta = merge_shards(state, 2)
+    assert json.loads(delta["delay_findings"]) == [finding("W1"), finding("W2"), finding("W3")]
+    assert json.loads(delta["safety_findings"]) == []
+    assert delta[SHARD_ERRORS_KEY] == ["SafetyAgent_shard1"]
+    assert delta[NEXT_DELAY_SEEN_KEY] == [("W1", "T1", "text", "late"), ("W2", "T1", "text", "late")]
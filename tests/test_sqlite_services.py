@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from google.adk.events import Event, EventActions
+
+from backend.sqlite_services import create_services
+
+
+def test_concurrent_flushes_write_batches_in_order(tmp_path):
+    sessions, _ = create_services(str(tmp_path / "sessions.db"))
+    write_batch = sessions._write_batch
+    written = []
+
+    def slow_first_batch(batch):
+        if not written:
+            time.sleep(0.05)
+        written.append(batch[0][4]["step"])
+        write_batch(batch)
+
+    sessions._write_batch = slow_first_batch
+
+    async def main():
+        session = await sessions.create_session(app_name="agents", user_id="u", session_id="s")
+        # Final replies are flushed as they are appended; the second starts
+        # while the first is still being written
+        await asyncio.gather(*(
+            sessions.append_event(session, Event(author="agent", actions=EventActions(state_delta={"step": step})))
+            for step in (1, 2)
+        ))
+        return await sessions.get_session(app_name="agents", user_id="u", session_id="s")
+
+    stored = asyncio.run(main())
+    assert written == [1, 2]
+    assert stored.state["step"] == 2
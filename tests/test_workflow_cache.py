@@ -0,0 +1,96 @@
+import asyncio
+
+from google.adk.agents import LlmAgent
+
+from backend import workflow_cache
+from backend.workflow_cache import SingleFlight, WorkflowCache, agent_fingerprint
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(workflow_cache.time, "monotonic", lambda: now[0])
+    cache = WorkflowCache(ttl_seconds=10)
+    cache.put(("data-v1", "agents-v1"), {"final_report": "report"})
+
+    now[0] += 10
+    assert cache.get(("data-v1", "agents-v1")) == {"final_report": "report"}
+    now[0] += 1
+    assert cache.get(("data-v1", "agents-v1")) is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_a_new_key_misses_and_old_entries_are_evicted_lru_first():
+    cache = WorkflowCache(ttl_seconds=60, max_entries=2)
+    cache.put(("data-v1", "agents"), {"n": 1})
+    assert cache.get(("data-v2", "agents")) is None
+
+    cache.put(("data-v2", "agents"), {"n": 2})
+    cache.get(("data-v1", "agents"))
+    cache.put(("data-v3", "agents"), {"n": 3})
+    assert cache.get(("data-v2", "agents")) is None
+    assert cache.get(("data-v1", "agents")) == {"n": 1}
+
+
+def test_results_are_copied_in_and_out():
+    cache = WorkflowCache()
+    result = {"findings": [1]}
+    cache.put("k", result)
+    result["findings"].append(2)
+    cache.get("k")["findings"].append(3)
+    assert cache.get("k") == {"findings": [1]}
+
+
+def test_agent_fingerprint_follows_instructions_and_tools():
+    def agent(instruction, tools=()):
+        return LlmAgent(name="DelayAgent", model="gemini-2.5-flash-lite", instruction=instruction, tools=list(tools))
+
+    def load_messages():
+        """Messages."""
+
+    base = agent_fingerprint(agent("Find delays."))
+    assert agent_fingerprint(agent("Find delays.")) == base
+    assert agent_fingerprint(agent("Find delays and safety issues.")) != base
+    assert agent_fingerprint(agent("Find delays.", [load_messages])) != base
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight()
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"final_report": "report"}
+
+    async def main():
+        started = [flight.start("k", run) for _ in range(5)]
+        assert [leader for _, leader in started] == [True, False, False, False, False]
+        results = await asyncio.gather(*(task for task, _ in started))
+        # Finished runs are not reused
+        again, leader = flight.start("k", run)
+        await again
+        return results, leader
+
+    results, leader = asyncio.run(main())
+    assert results == [{"final_report": "report"}] * 5
+    assert leader and len(calls) == 2
+    assert flight.stats() == {"in_flight": 0, "runs": 2, "coalesced": 4}
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_run():
+    flight = SingleFlight()
+
+    async def run():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        task, _ = flight.start("k", run)
+        leader = asyncio.ensure_future(asyncio.shield(task))
+        follower, _ = flight.start("k", run)
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == "done"
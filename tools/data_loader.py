@@ -1,27 +1,16 @@
-import json
-from pathlib import Path
-
-DATA_DIR = Path(__file__).parent.parent / "data"
+from tools.data_store import store
 
 def load_calendar():
     """Load calendar.json and return wrapped dict for ADK."""
-    p = DATA_DIR / "calendar.json"
-    data = json.loads(p.read_text())
-    return {"calendar": data["worker_calendar"]}
+    return {"calendar": store.calendar()}
 
 def load_tasks():
     """Load tasks.json and return wrapped dict for ADK."""
-    p = DATA_DIR / "tasks.json"
-    data = json.loads(p.read_text())
-    return {"tasks": data["tasks"]}
+    return {"tasks": store.tasks()}
 
 def load_messages():
     """Load messages.json and return wrapped dict for ADK."""
-    p = DATA_DIR / "messages.json"
-    data = json.loads(p.read_text())
-    return {"messages": data["messages"]}
+    return {"messages": store.messages()}
 
 def load_workers():
-    p = DATA_DIR / "workers.json"
-    data = json.loads(p.read_text())
-    return {"workers": data["workers"]}
+    return {"workers": store.workers()}
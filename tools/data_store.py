@@ -0,0 +1,416 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from pathlib import Path
+
+from tools.message_log import FileLock, MessageLog, validate_message
+
+# Point at another directory (e.g. benchmarks.generate_data output) with DATA_DIR
+DATA_DIR = Path(os.getenv("DATA_DIR", Path(__file__).parent.parent / "data"))
+
+# file name -> top-level key holding the records
+_FILES = {
+    "calendar": ("calendar.json", "worker_calendar"),
+    "tasks": ("tasks.json", "tasks"),
+    "messages": ("messages.json", "messages"),
+    "workers": ("workers.json", "workers"),
+}
+
+
+def _group_by(records, key):
+    index = defaultdict(list)
+    for r in records:
+        index[r.get(key)].append(r)
+    return dict(index)
+
+
+class DataStore:
+    """
+    Loads data/*.json once and keeps indexed, read-only views of it.
+    Each access re-checks the file mtime, and a file is only re-parsed
+    when it has changed on disk.
+
+    Messages are messages.json plus anything appended to the message log
+    (tools/message_log.py) since it was last compacted into the file.
+    New log records are added to the message list and indexes in place,
+    so an append costs the size of the batch, not of the data set.
+
+    Returned lists and dicts are shared; callers must not mutate them.
+    The message list and per-worker lists may grow while a caller holds
+    them.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self._lock = threading.Lock()
+        # name -> (mtime_ns, size), plus the message log state for messages
+        self._stamps = {}
+        # name -> sha256 of the file contents
+        self._digests = {}
+        self._records = {}
+        self._indexes = {}
+        # messages.json alone: (stamp, records, content hash)
+        self._snapshot = (None, [], _content_hash([]))
+        # Content hash of all current messages, extended as records arrive
+        self._message_hash = _content_hash([])
+        self._log = None
+        # One compaction at a time, across worker processes too
+        self._compact_lock = FileLock(self.data_dir / "messages.compact.lock")
+
+    @property
+    def log(self) -> MessageLog:
+        if self._log is None:
+            with self._lock:
+                if self._log is None:
+                    self._log = MessageLog(self.data_dir)
+        return self._log
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _fresh(self, name: str):
+        if name == "messages":
+            return self._fresh_messages()
+        filename, key = _FILES[name]
+        path = self.data_dir / filename
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._stamps.get(name) == stamp:
+            return
+
+        with self._lock:
+            if self._stamps.get(name) == stamp:
+                return
+            raw = path.read_bytes()
+            records = json.loads(raw).get(key, [])
+            self._indexes[name] = self._build_index(name, records)
+            self._records[name] = records
+            self._digests[name] = hashlib.sha256(raw).hexdigest()
+            self._stamps[name] = stamp
+
+    def _fresh_messages(self):
+        # Log state before the file: compaction rewrites messages.json before
+        # dropping the sealed log, so this never misses compacted records
+        log_state = self.log.state()
+        path = self.data_dir / _FILES["messages"][0]
+        st = path.stat()
+        stamp = ((st.st_mtime_ns, st.st_size), log_state)
+        if self._stamps.get("messages") == stamp:
+            return
+
+        with self._lock:
+            previous = self._stamps.get("messages")
+            if previous == stamp:
+                return
+            file_stamp, snapshot, snapshot_hash = self._snapshot
+            if file_stamp != stamp[0]:
+                snapshot = json.loads(path.read_bytes()).get(_FILES["messages"][1], [])
+                snapshot_hash = _content_hash(snapshot)
+                self._snapshot = (stamp[0], snapshot, snapshot_hash)
+
+            # Only new log records to add: extend the current views in place
+            same_segments = previous is not None and [n for n, _ in previous[1][1]] == [n for n, _ in log_state[1]]
+            if previous and previous[0] == stamp[0] and same_segments:
+                log_state, logged = self.log.records(previous[1])
+                records = self._records["messages"]
+                records.extend(logged)
+                self._add_to_message_index(self._indexes["messages"], logged)
+                message_hash = _content_hash(logged, self._message_hash)
+            else:
+                log_state, logged = self.log.records()
+                # Never the snapshot itself, which later appends would extend
+                records = list(snapshot)
+                # A sealed log may already be in the new messages.json
+                known = {m.get("msg_id") for m in snapshot} if logged else ()
+                for m in logged:
+                    if m["msg_id"] not in known:
+                        known.add(m["msg_id"])
+                        records.append(m)
+                self._indexes["messages"] = self._build_index("messages", records)
+                message_hash = _content_hash(records[len(snapshot):], snapshot_hash)
+            self._records["messages"] = records
+            self._message_hash = message_hash
+            # Same records in the same order, same digest: compaction writes
+            # messages.json in this order, so it doesn't change the digest
+            self._digests["messages"] = message_hash.hexdigest()
+            self._stamps["messages"] = (stamp[0], log_state)
+
+    def _build_index(self, name: str, records: list) -> dict:
+        if name == "workers":
+            return {"by_id": {r["worker_id"]: r for r in records}}
+
+        if name == "tasks":
+            return {
+                "by_id": {r["task_id"]: r for r in records},
+                "by_worker": _group_by(records, "worker_id"),
+            }
+
+        if name == "calendar":
+            return {
+                "by_task": {r["task_id"]: r for r in records},
+                "by_worker": _group_by(records, "worker_id"),
+            }
+
+        # messages: ISO-8601 times sort correctly as strings
+        ordered = sorted(records, key=lambda m: m.get("time", ""))
+        return {
+            "by_time": ordered,
+            "times": [m.get("time", "") for m in ordered],
+            "by_worker": _group_by(ordered, "worker_id"),
+            "by_id": {m["msg_id"]: m for m in ordered},
+            "max_number": _max_msg_number(ordered),
+        }
+
+    def _add_to_message_index(self, index: dict, new: list):
+        """
+        Add `new` messages to the message index in place; holds self._lock.
+        Appends in time order are O(1) each. A late arrival is inserted into
+        the time-ordered lists, which readers slice under self._lock, and
+        into a fresh copy of its worker's list, which readers may be iterating.
+        """
+        by_time, times, by_worker = index["by_time"], index["times"], index["by_worker"]
+        for m in sorted(new, key=lambda m: m.get("time", "")):
+            t = m.get("time", "")
+            if not times or t >= times[-1]:
+                # by_time first: a reader that bisects times never runs past it
+                by_time.append(m)
+                times.append(t)
+            else:
+                i = bisect_right(times, t)
+                by_time.insert(i, m)
+                times.insert(i, t)
+
+            worker_id = m.get("worker_id")
+            msgs = by_worker.get(worker_id)
+            if msgs is None:
+                by_worker[worker_id] = [m]
+            elif t >= msgs[-1].get("time", ""):
+                msgs.append(m)
+            else:
+                msgs = list(msgs)
+                insort(msgs, m, key=lambda m: m.get("time", ""))
+                by_worker[worker_id] = msgs
+            index["by_id"][m["msg_id"]] = m
+        index["max_number"] = max(index["max_number"], _max_msg_number(new))
+
+    def _get(self, name: str) -> list:
+        self._fresh(name)
+        return self._records[name]
+
+    def _index(self, name: str) -> dict:
+        self._fresh(name)
+        return self._indexes[name]
+
+    def fingerprint(self, names: tuple = tuple(_FILES)) -> str:
+        """Content hash over the named data files (default all); changes only when their contents do."""
+        h = hashlib.sha256()
+        for name in sorted(names):
+            self._fresh(name)
+            h.update(f"{name}:{self._digests[name]};".encode())
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Full datasets
+    # ------------------------------------------------------------------
+
+    def calendar(self) -> list:
+        return self._get("calendar")
+
+    def tasks(self) -> list:
+        return self._get("tasks")
+
+    def messages(self) -> list:
+        return self._get("messages")
+
+    def workers(self) -> list:
+        return self._get("workers")
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def worker(self, worker_id: str):
+        return self._index("workers")["by_id"].get(worker_id)
+
+    def task(self, task_id: str):
+        return self._index("tasks")["by_id"].get(task_id)
+
+    def tasks_for_worker(self, worker_id: str) -> list:
+        return self._index("tasks")["by_worker"].get(worker_id, [])
+
+    def calendar_for_task(self, task_id: str):
+        return self._index("calendar")["by_task"].get(task_id)
+
+    def calendar_for_worker(self, worker_id: str) -> list:
+        return self._index("calendar")["by_worker"].get(worker_id, [])
+
+    def message(self, msg_id: str):
+        return self._index("messages")["by_id"].get(msg_id)
+
+    def messages_for_worker(self, worker_id: str) -> list:
+        """Messages from one worker, oldest first."""
+        return self._index("messages")["by_worker"].get(worker_id, [])
+
+    def messages_between(self, start: str = None, end: str = None) -> list:
+        """Messages with start <= time < end (ISO strings), oldest first."""
+        index = self._index("messages")
+        with self._lock:
+            times = index["times"]
+            lo = bisect_left(times, start) if start else 0
+            hi = bisect_left(times, end) if end else len(times)
+            return index["by_time"][lo:hi]
+
+    def latest_message_time(self):
+        """Time of the newest message, or None if there are none."""
+        times = self._index("messages")["times"]
+        return times[-1] if times else None
+
+    def count_messages_before(self, end: str) -> int:
+        """Number of messages with time < end."""
+        return bisect_left(self._index("messages")["times"], end)
+
+    def messages_since(self, since: str) -> list:
+        """Messages strictly after `since`, oldest first."""
+        index = self._index("messages")
+        with self._lock:
+            return index["by_time"][bisect_right(index["times"], since):]
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def append_messages(self, messages: list) -> list:
+        """
+        Validate messages, give those without one a msg_id, and append them
+        to the message log. A msg_id given by the caller must not be taken
+        yet; new ids are numbered after every existing and accepted one.
+        Nothing is written unless all are valid. Returns the stored messages.
+        """
+        accepted = []
+        for i, m in enumerate(messages):
+            try:
+                accepted.append(validate_message(m))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"message {i}: {e}") from None
+
+        # Ids are allocated holding the log's writer lock, against the
+        # messages every process has appended so far
+        with self.log.writer():
+            index = self._index("messages")
+            taken = set()
+            for i, m in enumerate(accepted):
+                msg_id = m.get("msg_id")
+                if msg_id is None:
+                    continue
+                if msg_id in index["by_id"] or msg_id in taken:
+                    raise ValueError(f"message {i}: msg_id {msg_id} already exists")
+                taken.add(msg_id)
+
+            next_number = max(index["max_number"], _max_msg_number(accepted)) + 1
+            for i, m in enumerate(accepted):
+                if "msg_id" not in m:
+                    accepted[i] = {"msg_id": f"m{next_number}", **m}
+                    next_number += 1
+            self.log.append(accepted)
+        return accepted
+
+    def compact_messages(self) -> int:
+        """
+        Fold the message log into messages.json (atomically replaced) and
+        drop it. Appends continue into a fresh log meanwhile. Returns the
+        number of messages compacted.
+        """
+        with self._compact_lock:
+            sealed = self.log.seal()
+            if sealed is None:
+                return 0
+
+            filename, key = _FILES["messages"]
+            path = self.data_dir / filename
+            records = json.loads(path.read_bytes()).get(key, [])
+            known = {m.get("msg_id") for m in records}
+            logged = []
+            for m in sealed.records(len(sealed.offsets)):
+                # Also drops repeats within the log itself
+                if m["msg_id"] not in known:
+                    known.add(m["msg_id"])
+                    logged.append(m)
+
+            # One record per line: json.dump(indent=...) is several times slower
+            tmp = path.with_name(path.name + ".tmp")
+            with tmp.open("w") as f:
+                f.write('{\n  "' + key + '": [\n')
+                f.write(",\n".join("    " + json.dumps(m) for m in records + logged))
+                f.write("\n  ]\n}\n")
+            os.replace(tmp, path)
+            self.log.drop_sealed()
+            return len(logged)
+
+
+class MessageCursor:
+    """
+    Follows the store's messages for consumers that keep running results
+    (digests, rule scans). read() returns the messages that arrived since
+    the previous read, or all of them when the consumer must start over:
+    on the first read, when one of the `depends` data files changed, or
+    when a message arrived with a time before one already returned.
+    Compaction keeps the message order, so it never forces a restart.
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, store: "DataStore", depends: tuple = ()):
+        self.store = store
+        self.depends = depends
+        # (messages read, last msg_id read, latest time read, depends fingerprint)
+        self._position = (0, None, "", None)
+
+    def read(self) -> tuple:
+        """(restart, messages): new messages in arrival order, or all of them if restart."""
+        messages = self.store.messages()
+        end = len(messages)
+        others = self.store.fingerprint(self.depends) if self.depends else None
+        count, last_id, last_time, previous = self._position
+
+        new = None
+        if count and others == previous and end >= count and messages[count - 1].get("msg_id") == last_id:
+            new = messages[count:end]
+            if any(m.get("time", "") < last_time for m in new):
+                new = None
+        restart = new is None
+        if restart:
+            new, last_time = messages[:end], ""
+
+        last_time = max([last_time] + [m.get("time", "") for m in new])
+        self._position = (end, messages[end - 1].get("msg_id") if end else None, last_time, others)
+        return restart, new
+
+
+_MSG_ID_RE = re.compile(r"m(\d+)")
+
+
+def _content_hash(records: list, start=None):
+    """
+    sha256 over records in order, continuing from the hash `start`: each
+    record's compact JSON followed by a comma, so hashing a+b in one go or
+    as a then b gives the same digest. One json.dumps over the whole list
+    is several times faster than one per record.
+    """
+    h = start.copy() if start is not None else hashlib.sha256()
+    if records:
+        h.update(json.dumps(records, separators=(",", ":"))[1:-1].encode())
+        h.update(b",")
+    return h
+
+
+def _max_msg_number(messages: list) -> int:
+    """Highest N among msg_ids of the form mN, or 0."""
+    numbers = [int(m.group(1)) for m in (_MSG_ID_RE.fullmatch(r.get("msg_id") or "") for r in messages) if m]
+    return max(numbers, default=0)
+
+# Shared instance used by the tools and the API
+store = DataStore()
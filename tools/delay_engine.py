@@ -0,0 +1,170 @@
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+from tools.analyze_image_mock import analyze_image_mock
+from tools.transcribe_audio_mock import transcribe_audio_mock
+
+# Same rules the DelayAgent prompt used to describe
+DELAY_KEYWORDS = ["late", "stuck", "road closed", "traffic", "delayed", "wrong location"]
+DELAY_URGENCIES = {"medium", "high"}
+REUSE_THRESHOLD = 0.7
+
+_keyword_re = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in DELAY_KEYWORDS) + r")\b", re.IGNORECASE
+)
+_wrong_location_re = re.compile(r"wrong (location|site)|does not match", re.IGNORECASE)
+
+
+def delay_keywords(text: str) -> list:
+    """Delay keywords found in a text, lowercased."""
+    return [m.group(1).lower() for m in _keyword_re.finditer(text or "")]
+
+
+def is_wrong_location(note: str) -> bool:
+    """Whether an image analysis note says the photo is from the wrong place."""
+    return bool(_wrong_location_re.search(note or ""))
+
+
+def _minutes_between(earlier: str, later: str):
+    try:
+        delta = datetime.fromisoformat(later) - datetime.fromisoformat(earlier)
+    except (TypeError, ValueError):
+        return None
+    return int(delta.total_seconds() // 60)
+
+
+class _CalendarIndex:
+    """Per-worker calendar entries sorted by start time, for bisect lookups."""
+
+    def __init__(self, calendar: list):
+        by_worker = defaultdict(list)
+        for entry in calendar:
+            by_worker[entry.get("worker_id")].append(entry)
+
+        self._starts = {}
+        self._entries = {}
+        for worker_id, entries in by_worker.items():
+            entries.sort(key=lambda e: e.get("start", ""))
+            self._entries[worker_id] = entries
+            self._starts[worker_id] = [e.get("start", "") for e in entries]
+
+    def entry_for(self, worker_id: str, time: str):
+        """The task the worker is on at `time`: latest start <= time, else the next one."""
+        entries = self._entries.get(worker_id)
+        if not entries:
+            return None
+        i = bisect_right(self._starts[worker_id], time or "")
+        return entries[i - 1] if i else entries[0]
+
+
+def _late_note(msg_time: str, entry) -> str:
+    if not entry or not msg_time:
+        return ""
+    minutes = _minutes_between(entry.get("start"), msg_time)
+    if minutes is None or minutes <= 0:
+        return ""
+    return f" ({minutes} min after scheduled start {entry['start'][11:16]})"
+
+
+def detect_delays(
+    messages: list,
+    calendar: list,
+    transcribe=transcribe_audio_mock,
+    analyze=analyze_image_mock,
+    seen: Optional[set] = None,
+) -> list:
+    """
+    Rule-based delay detection over messages joined to each worker's calendar.
+
+    Flags a message when:
+    - its text contains a delay keyword
+    - its audio transcription has medium/high urgency
+    - its image has reuse_score > 0.7 or a note saying the location is wrong
+
+    Returns [{worker_id, task_id, reason, suggested_action}], one row per
+    distinct (worker, task, evidence), in message time order.
+
+    `seen` holds (worker, task, kind, evidence) keys already reported, e.g.
+    by an earlier run over older messages; it is updated in place.
+    """
+    index = _CalendarIndex(calendar)
+    audio_cache = {}
+    image_cache = {}
+    findings = []
+    seen = set() if seen is None else seen
+
+    for msg in sorted(messages, key=lambda m: m.get("time", "")):
+        worker_id = msg.get("worker_id")
+        msg_time = msg.get("time", "")
+        entry = index.entry_for(worker_id, msg_time)
+        task_id = entry["task_id"] if entry else None
+        location = entry.get("location", "the assigned site") if entry else "the assigned site"
+        kind = msg.get("type")
+        row = None
+
+        if kind == "text":
+            text = msg.get("text") or ""
+            m = _keyword_re.search(text)
+            if m:
+                key = ("text", text.lower())
+                row = (
+                    key,
+                    f'Worker reported "{text}" at {msg_time[11:16]}{_late_note(msg_time, entry)}.',
+                    f"Call {worker_id} to confirm the new ETA and consider reassigning {task_id} "
+                    f"if the {m.group(1).lower()} issue pushes past the task window.",
+                )
+
+        elif kind == "audio":
+            audio_id = msg.get("audio_id")
+            if audio_id not in audio_cache:
+                audio_cache[audio_id] = transcribe(audio_id)
+            result = audio_cache[audio_id]
+            urgency = result.get("urgency")
+            if urgency in DELAY_URGENCIES:
+                row = (
+                    ("audio", audio_id),
+                    f'Audio message ({urgency} urgency): "{result.get("translated_text")}".',
+                    f"Call {worker_id} immediately and arrange support or a replacement for {task_id}."
+                    if urgency == "high" else
+                    f"Follow up with {worker_id} and check whether {task_id} needs more time.",
+                )
+
+        elif kind == "image":
+            image_id = msg.get("image_id")
+            if image_id not in image_cache:
+                image_cache[image_id] = analyze(image_id)
+            result = image_cache[image_id]
+            note = result.get("note") or ""
+            if is_wrong_location(note):
+                row = (
+                    ("image", image_id),
+                    f"Image {image_id}: {note}",
+                    f"Confirm {worker_id}'s location and redirect them to {location}.",
+                )
+            elif (result.get("reuse_score") or 0) > REUSE_THRESHOLD:
+                row = (
+                    ("image", image_id),
+                    f"Image {image_id} looks reused (reuse_score {result.get('reuse_score')}): {note}",
+                    f"Ask {worker_id} for a fresh geotagged photo from {location}.",
+                )
+
+        if row is None:
+            continue
+
+        evidence, reason, action = row
+        dedupe_key = (worker_id, task_id) + evidence
+        if dedupe_key in seen:
+            continue
+        seen.add(dedupe_key)
+
+        findings.append({
+            "worker_id": worker_id,
+            "task_id": task_id,
+            "reason": reason,
+            "suggested_action": action,
+        })
+
+    return findings
@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+
+from tools.analyze_image_mock import analyze_image_mock
+from tools.data_store import MessageCursor, store
+from tools.delay_engine import DELAY_URGENCIES, REUSE_THRESHOLD, delay_keywords, is_wrong_location
+from tools.safety_engine import matcher
+from tools.transcribe_audio_mock import transcribe_audio_mock
+
+# Approximate model tokens a single digest tool result may use
+DIGEST_TOKEN_BUDGET = int(os.getenv("DIGEST_TOKEN_BUDGET", "1500"))
+
+# Rough chars-per-token for compact JSON; good enough for budgeting
+_CHARS_PER_TOKEN = 4
+_SUMMARY_CHARS = 90
+
+
+def estimate_tokens(value) -> int:
+    return len(json.dumps(value, separators=(",", ":"))) // _CHARS_PER_TOKEN + 1
+
+
+def _clip(text: str) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= _SUMMARY_CHARS else text[:_SUMMARY_CHARS - 1] + "…"
+
+
+def _describe(msg: dict) -> tuple:
+    """(one-line summary, flags) for a message, with media already analysed."""
+    kind = msg.get("type")
+    flags = []
+
+    if kind == "audio":
+        result = transcribe_audio_mock(msg.get("audio_id"))
+        text = result.get("translated_text") or result.get("text") or ""
+        urgency = result.get("urgency")
+        summary = f"audio ({urgency}): {text}"
+        if urgency in DELAY_URGENCIES:
+            flags.append(f"{urgency} urgency")
+        evidence = f'{result.get("text", "")} / {text}'
+
+    elif kind == "image":
+        result = analyze_image_mock(msg.get("image_id"))
+        note = result.get("note") or ""
+        reuse = result.get("reuse_score") or 0
+        summary = f"image: {note} (reuse {reuse})"
+        if is_wrong_location(note):
+            flags.append("wrong location")
+        if reuse > REUSE_THRESHOLD:
+            flags.append("reused image")
+        evidence = note
+
+    else:
+        evidence = msg.get("text") or ""
+        summary = evidence
+
+    flags += [f"delay: {k}" for k in dict.fromkeys(delay_keywords(evidence))]
+    flags += [f"safety: {k}" for k in dict.fromkeys(matcher.find(evidence))]
+    return _clip(summary), flags
+
+
+def _event(msg: dict, summary: str, flags: list) -> dict:
+    return {
+        "msg_id": msg["msg_id"],
+        "worker_id": msg.get("worker_id"),
+        "time": msg.get("time", "")[:16],
+        "summary": summary,
+        "flags": flags,
+    }
+
+
+def _worker_digest(worker: dict, flagged: list) -> dict:
+    worker_id = worker["worker_id"]
+    messages = store.messages_for_worker(worker_id)
+    latest = messages[-1] if messages else None
+    return {
+        "worker_id": worker_id,
+        "name": worker.get("name"),
+        "status": worker.get("status"),
+        "tasks": [
+            {
+                "task_id": t["task_id"],
+                "window": f'{t.get("start", "")[11:16]}-{t.get("end", "")[11:16]}',
+                "location": t.get("location"),
+                "priority": (store.task(t["task_id"]) or {}).get("priority"),
+            }
+            for t in store.calendar_for_worker(worker_id)
+        ],
+        "messages": len(messages),
+        "latest": {
+            "time": latest.get("time", "")[:16],
+            "summary": _describe(latest)[0],
+        } if latest else None,
+        "flagged": flagged,
+    }
+
+
+def _build(messages: list) -> dict:
+    """Digest of every worker plus all flagged events, oldest first."""
+    flagged = []
+    by_worker = {}
+    for msg in sorted(messages, key=lambda m: m.get("time", "")):
+        summary, flags = _describe(msg)
+        if flags:
+            event = _event(msg, summary, flags)
+            flagged.append(event)
+            by_worker.setdefault(event["worker_id"], []).append(event)
+
+    return {
+        "workers": {
+            w["worker_id"]: _worker_digest(w, by_worker.get(w["worker_id"], []))
+            for w in store.workers()
+        },
+        "flagged": flagged,
+        "flagged_by_id": {e["msg_id"]: e for e in flagged},
+    }
+
+
+def _extend(data: dict, messages: list) -> dict:
+    """
+    Digests with newer messages added: only the workers they came from are
+    re-described. New dicts and lists, as callers may hold the old ones.
+    """
+    new_flagged = []
+    by_worker = {}
+    for msg in sorted(messages, key=lambda m: m.get("time", "")):
+        by_worker.setdefault(msg.get("worker_id"), [])
+        summary, flags = _describe(msg)
+        if flags:
+            event = _event(msg, summary, flags)
+            new_flagged.append(event)
+            by_worker[event["worker_id"]].append(event)
+
+    workers = dict(data["workers"])
+    for worker_id, events in by_worker.items():
+        worker = store.worker(worker_id)
+        if worker is not None and worker_id in workers:
+            workers[worker_id] = _worker_digest(worker, workers[worker_id]["flagged"] + events)
+    flagged_by_id = dict(data["flagged_by_id"])
+    flagged_by_id.update((e["msg_id"], e) for e in new_flagged)
+    return {
+        "workers": workers,
+        "flagged": data["flagged"] + new_flagged,
+        "flagged_by_id": flagged_by_id,
+    }
+
+
+_lock = threading.Lock()
+_cached = (None, None)
+# Messages seen so far; workers, tasks or calendar changing means a rebuild
+_cursor = MessageCursor(store, ("workers", "tasks", "calendar"))
+
+
+def digests() -> dict:
+    """
+    Digests for the current data. New messages only re-describe their
+    workers; a change to the other data files, or a message older than
+    ones already seen, rebuilds everything.
+    """
+    global _cached
+    fingerprint = store.fingerprint()
+    if _cached[0] != fingerprint:
+        with _lock:
+            if _cached[0] != fingerprint:
+                restart, messages = _cursor.read()
+                data = _build(messages) if restart or _cached[1] is None else _extend(_cached[1], messages)
+                _cached = (fingerprint, data)
+    return _cached[1]
+
+
+def _fit(items: list, budget: int) -> tuple:
+    """Longest prefix of items that fits the token budget, and how many were dropped."""
+    used = 0
+    for i, item in enumerate(items):
+        used += estimate_tokens(item)
+        if used > budget:
+            return items[:i], len(items) - i
+    return items, 0
+
+
+def _compact_worker(digest: dict, keep_flagged: int) -> dict:
+    flagged = digest["flagged"]
+    return {
+        **digest,
+        "flagged": [
+            {k: v for k, v in e.items() if k != "worker_id"}
+            for e in (flagged[-keep_flagged:] if keep_flagged else [])
+        ],
+        "flagged_total": len(flagged),
+    }
+
+
+# =====================================================================
+# Agent tools
+# =====================================================================
+
+def get_digest() -> dict:
+    """
+    Compact status of every worker: tasks with time windows, message count,
+    latest message and flagged messages (delay/safety keywords, urgent audio,
+    suspicious images). Call this first for overview questions.
+    """
+    workers = list(digests()["workers"].values())
+    budget = DIGEST_TOKEN_BUDGET
+
+    # Keep fewer flagged events per worker until the whole digest fits
+    for keep in (5, 3, 1, 0):
+        compact = [_compact_worker(d, keep) for d in workers]
+        if estimate_tokens(compact) <= budget:
+            return {"workers": compact, "omitted_workers": 0}
+
+    compact, omitted = _fit(compact, budget)
+    return {"workers": compact, "omitted_workers": omitted}
+
+
+def get_worker_digest(worker_id: str) -> dict:
+    """
+    Compact status of one worker (e.g. "W101"): tasks with time windows,
+    latest message and all flagged messages with media summaries.
+    """
+    digest = digests()["workers"].get(worker_id)
+    if digest is None:
+        return {"error": f"Unknown worker_id {worker_id}"}
+
+    events = [{k: v for k, v in e.items() if k != "worker_id"} for e in digest["flagged"]]
+    flagged, omitted = _fit(events[::-1], DIGEST_TOKEN_BUDGET // 2)
+    return {**digest, "flagged": flagged[::-1], "omitted_flagged": omitted}
+
+
+def get_flagged_events(since: str = "") -> dict:
+    """
+    Flagged messages across all workers after `since` (ISO time such as
+    "2025-11-28T09:30", or "" for all), oldest first. Each has msg_id,
+    worker_id, time, a one-line summary and the flags that matched.
+    """
+    data = digests()
+    if since:
+        by_id = data["flagged_by_id"]
+        events = [by_id[m["msg_id"]] for m in store.messages_since(since) if m["msg_id"] in by_id]
+    else:
+        events = data["flagged"]
+
+    # Over budget: keep the most recent events
+    kept, omitted = _fit(events[::-1], DIGEST_TOKEN_BUDGET)
+    return {"events": kept[::-1], "omitted_older": omitted}
@@ -0,0 +1,151 @@
+import json
+import re
+
+# Structural characters inside a candidate, openers outside one, and the
+# rest of a JSON string up to its closing quote (or an escape cut off at a
+# chunk boundary). Everything in between is skipped by the regex engine.
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_OPEN = re.compile(r"[{\[]")
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_OPENER = {"}": "{", "]": "["}
+_decoder = json.JSONDecoder()
+
+# Required keys per findings row, by session.state key
+FINDINGS_SCHEMAS = {
+    "delay_findings": ("worker_id", "task_id", "reason", "suggested_action"),
+    "safety_findings": ("worker_id", "issue", "urgency", "recommended_action"),
+}
+
+
+class JsonExtractor:
+    """
+    Incremental bracket-balancing JSON extractor.
+
+    Text is fed in chunks (e.g. as model events stream in) and scanned once,
+    left to right. Every balanced {...} or [...] span outside a JSON string
+    is a candidate; the first one that parses (and passes `validate`, if
+    given) is the result. Candidates never overlap, so the total work is
+    linear in the input length.
+    """
+
+    def __init__(self, validate=None):
+        self.validate = validate
+        self.value = None
+        self.done = False
+        self._reset()
+
+    def _reset(self):
+        self._stack = []
+        self._parts = []
+        self._in_string = False
+        self._escape = False
+
+    def _accept(self, text: str) -> bool:
+        try:
+            value = json.loads(text)
+        except (ValueError, RecursionError):
+            return False
+        if self.validate is not None and not self.validate(value):
+            return False
+        self.value = value
+        self.done = True
+        return True
+
+    def feed(self, chunk: str):
+        """Scan one more chunk. Returns the extracted value once found, else None."""
+        if self.done or not chunk:
+            return self.value
+
+        n = len(chunk)
+        pos = 0
+        start = 0 if self._stack else None
+        if self._escape:
+            # The previous chunk ended on a backslash inside a string
+            self._escape = False
+            pos = 1
+
+        while pos < n:
+            if self._in_string:
+                pos = _STRING_TAIL.match(chunk, pos).end()
+                if pos >= n:
+                    break
+                if chunk[pos] == '"':
+                    self._in_string = False
+                    pos += 1
+                    continue
+                self._escape = True
+                break
+
+            if not self._stack:
+                # Quotes and closers in prose outside a candidate are ignored
+                m = _OPEN.search(chunk, pos)
+                if m is None:
+                    break
+                start = m.start()
+                # Fast path: a candidate that is complete, valid JSON within
+                # this chunk is parsed in C. raw_decode stops at the first
+                # invalid character, never past where the scan below would.
+                try:
+                    value, end = _decoder.raw_decode(chunk, start)
+                except (ValueError, RecursionError):
+                    pass
+                else:
+                    if self.validate is None or self.validate(value):
+                        self.value = value
+                        self.done = True
+                        return value
+                    pos = end
+                    continue
+                self._stack.append(m.group())
+                pos = m.end()
+                continue
+
+            m = _STRUCTURE.search(chunk, pos)
+            if m is None:
+                break
+            ch = m.group()
+            pos = m.end()
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{" or ch == "[":
+                self._stack.append(ch)
+            elif self._stack[-1] != _OPENER[ch]:
+                # Mismatched brackets: prose, not JSON. Drop the candidate.
+                self._reset()
+                start = None
+            else:
+                self._stack.pop()
+                if not self._stack:
+                    self._parts.append(chunk[start:pos])
+                    text = "".join(self._parts)
+                    self._parts = []
+                    start = None
+                    if self._accept(text):
+                        return self.value
+
+        if self._stack and start is not None:
+            self._parts.append(chunk[start:])
+        return None
+
+
+def findings_validator(key: str):
+    """Validator for a findings key: a list of rows carrying the schema's keys."""
+    required = FINDINGS_SCHEMAS.get(key)
+    if required is None:
+        return None
+
+    def validate(value) -> bool:
+        return isinstance(value, list) and all(
+            isinstance(row, dict) and all(k in row for k in required)
+            for row in value
+        )
+
+    return validate
+
+
+def extract_json(text: str, validate=None):
+    """First complete (and valid, if `validate` is given) JSON value in text, or None."""
+    if not text:
+        return None
+    return JsonExtractor(validate).feed(text)
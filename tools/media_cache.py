@@ -0,0 +1,130 @@
+import asyncio
+import inspect
+from collections import OrderedDict
+
+from google.adk.tools import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from tools.analyze_image_mock import analyze_image_mock, analyze_image_batch
+from tools.transcribe_audio_mock import transcribe_audio_mock, transcribe_audio_batch
+
+# Live run caches are few (one per in-flight workflow); this only bounds
+# leaks from runs that never reach release_run_cache.
+MAX_RUN_CACHES = 64
+
+
+class MediaCache:
+    """
+    (tool, id) -> result cache for one workflow run.
+
+    Concurrent requests for the same key share one computation: the first
+    caller runs it and later callers await the same future.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, tool: str, key: str, compute):
+        k = (tool, key)
+        if k in self._results:
+            self.hits += 1
+            return self._results[k]
+
+        pending = self._inflight.get(k)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[k] = future
+        try:
+            result = compute(key)
+            if inspect.isawaitable(result):
+                result = await result
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved error
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(k, None)
+
+        self._results[k] = result
+        future.set_result(result)
+        return result
+
+    def get_sync(self, tool: str, key: str, compute):
+        """Synchronous lookup for callers outside the event loop's awaits (rule engines)."""
+        k = (tool, key)
+        if k in self._results:
+            self.hits += 1
+            return self._results[k]
+        self.misses += 1
+        result = self._results[k] = compute(key)
+        return result
+
+    def wrap(self, func):
+        """A drop-in for a sync single-id media function that goes through this cache."""
+        return lambda key: self.get_sync(func.__name__, key, func)
+
+
+_runs: "OrderedDict[str, MediaCache]" = OrderedDict()
+
+
+def run_cache(invocation_id: str) -> MediaCache:
+    cache = _runs.get(invocation_id)
+    if cache is None:
+        cache = _runs[invocation_id] = MediaCache()
+        while len(_runs) > MAX_RUN_CACHES:
+            _runs.popitem(last=False)
+    return cache
+
+
+def release_run_cache(callback_context):
+    """after_agent_callback for the workflow root: drop the run's cache."""
+    _runs.pop(callback_context.invocation_id, None)
+    return None
+
+
+class RunCachedTool(FunctionTool):
+    """
+    FunctionTool whose results are shared through the run's MediaCache.
+
+    `single` is the one-id media function the cache is keyed by, and
+    `id_arg` names the tool argument holding the id (or list of ids for a
+    batch tool). The tool keeps the wrapped function's name and declaration.
+    """
+
+    def __init__(self, func, single, id_arg: str):
+        super().__init__(func)
+        self.single = single
+        self.id_arg = id_arg
+
+    async def run_async(self, *, args: dict, tool_context: ToolContext):
+        value = args.get(self.id_arg)
+        cache = run_cache(tool_context.invocation_id)
+        name = self.single.__name__
+
+        if isinstance(value, str):
+            return await cache.get(name, value, self.single)
+
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            ids = list(dict.fromkeys(value))
+            results = await asyncio.gather(*(cache.get(name, i, self.single) for i in ids))
+            return dict(zip(ids, results))
+
+        # Malformed call: let FunctionTool report the validation error
+        return await super().run_async(args=args, tool_context=tool_context)
+
+
+def cached_media_tools() -> list:
+    """The single and batch media tools, sharing results within a run."""
+    return [
+        RunCachedTool(transcribe_audio_mock, transcribe_audio_mock, "audio_id"),
+        RunCachedTool(analyze_image_mock, analyze_image_mock, "image_id"),
+        RunCachedTool(transcribe_audio_batch, transcribe_audio_mock, "audio_ids"),
+        RunCachedTool(analyze_image_batch, analyze_image_mock, "image_ids"),
+    ]
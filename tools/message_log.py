@@ -0,0 +1,518 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so run a single worker there
+    fcntl = None
+
+# Flush appends to disk with fsync (survives power loss, much slower)
+MESSAGE_LOG_FSYNC = os.getenv("MESSAGE_LOG_FSYNC", "0") == "1"
+# Compact into messages.json once the active log grows past this
+MESSAGE_LOG_COMPACT_BYTES = int(os.getenv("MESSAGE_LOG_COMPACT_BYTES", str(16 * 1024 * 1024)))
+
+MESSAGE_TYPES = {"text": "text", "audio": "audio_id", "image": "image_id"}
+
+# Log record: u32 length, then that many bytes of compact JSON
+_LENGTH = struct.Struct("<I")
+# Index entry per record: u64 offset into the log, 19-byte ISO time
+_ENTRY = struct.Struct("<Q19s")
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def normalize_time(value: Optional[str]) -> str:
+    """ISO-8601 time as 'YYYY-MM-DDTHH:MM:SS' local time; now if empty."""
+    if not value:
+        return datetime.now().strftime(_TIME_FORMAT)
+    t = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if t.tzinfo is not None:
+        t = t.astimezone().replace(tzinfo=None)
+    return t.strftime(_TIME_FORMAT)
+
+
+def validate_message(message: dict) -> dict:
+    """
+    Check one incoming message against the messages.json schema and return
+    a normalized copy. Raises ValueError with the reason.
+    """
+    if not isinstance(message, dict):
+        raise ValueError("message must be an object")
+    worker_id = message.get("worker_id")
+    if not isinstance(worker_id, str) or not worker_id:
+        raise ValueError("worker_id is required")
+    kind = message.get("type")
+    field = MESSAGE_TYPES.get(kind)
+    if field is None:
+        raise ValueError(f"type must be one of {', '.join(MESSAGE_TYPES)}")
+    value = message.get(field)
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{field} is required for {kind} messages")
+
+    out = {"worker_id": worker_id, "type": kind, field: value}
+    msg_id = message.get("msg_id")
+    if msg_id is not None:
+        if not isinstance(msg_id, str) or not msg_id:
+            raise ValueError("msg_id must be a non-empty string")
+        out = {"msg_id": msg_id, **out}
+    out["time"] = normalize_time(message.get("time"))
+    return out
+
+
+def _inode(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_ino
+    except FileNotFoundError:
+        return None
+
+
+class FileLock:
+    """
+    Exclusive lock shared by this process's threads (re-entrant) and, via
+    flock on `path`, with every other process using the same data directory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; without blocking, return False if someone else holds it."""
+        if not self._lock.acquire(blocking):
+            return False
+        if self._depth == 0 and fcntl is not None:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock.release()
+                return False
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _Segment:
+    """
+    One log file plus its index file. Records are kept in arrival order;
+    (time, offset) pairs are also kept sorted for range scans by time.
+
+    The file is read through a handle opened with the segment, so it stays
+    readable after another process renames or removes it; ino tells which
+    file on disk the segment is.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self.offsets = []
+        self.size = 0
+        # (time, offset), sorted
+        self._by_time = []
+        # Records decoded so far, in arrival order
+        self._decoded = []
+        self._mm = None
+        self._reader = None
+        self.ino = None
+        # Guards decoding, mapping and renames against concurrent readers
+        self._read_lock = threading.Lock()
+        self._file = None
+        self._index_file = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Opening and recovery
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if self._reader is None:
+            try:
+                self._reader = self.path.open("rb")
+            except FileNotFoundError:
+                return
+            self.ino = os.fstat(self._reader.fileno()).st_ino
+        size = os.fstat(self._reader.fileno()).st_size
+        entries = []
+        if self.index_path.exists():
+            raw = self.index_path.read_bytes()
+            usable = len(raw) - len(raw) % _ENTRY.size
+            entries = [e for e in _ENTRY.iter_unpack(raw[:usable]) if e[0] < size]
+
+        # Records written after the last index entry (crash between the
+        # two writes), and a torn record at the end, are recovered here
+        pos = 0
+        if entries:
+            last = entries[-1][0]
+            with self.path.open("rb") as f:
+                f.seek(last)
+                header = f.read(_LENGTH.size)
+            pos = last + _LENGTH.size + _LENGTH.unpack(header)[0] if len(header) == _LENGTH.size else last
+            if pos > size:
+                entries.pop()
+                pos = last
+        rebuilt = False
+        with self.path.open("rb") as f:
+            f.seek(pos)
+            while pos + _LENGTH.size <= size:
+                (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+                if pos + _LENGTH.size + length > size:
+                    break
+                record = json.loads(f.read(length))
+                entries.append((pos, record["time"].encode()))
+                pos += _LENGTH.size + length
+                rebuilt = True
+        if pos < size:
+            with self.path.open("r+b") as f:
+                f.truncate(pos)
+        if rebuilt or pos < size or len(entries) * _ENTRY.size != self._index_size():
+            self.index_path.write_bytes(b"".join(_ENTRY.pack(o, t) for o, t in entries))
+
+        self.size = pos
+        self.offsets = [o for o, _ in entries]
+        self._by_time = sorted((t.decode(), o) for o, t in entries)
+
+    def _index_size(self) -> int:
+        return self.index_path.stat().st_size if self.index_path.exists() else 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def sync(self, writing: bool = False):
+        """
+        Pick up records another process appended since this one last looked.
+        A writer (holding the log's FileLock) also recovers what a process
+        that died mid-append left behind, as on opening.
+        """
+        try:
+            index_size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            index_size = 0
+        known = len(self.offsets) * _ENTRY.size
+        if index_size >= known + _ENTRY.size:
+            with self.index_path.open("rb") as f:
+                f.seek(known)
+                raw = f.read(index_size - known)
+            entries = [(t.decode(), o) for o, t in _ENTRY.iter_unpack(raw[:len(raw) - len(raw) % _ENTRY.size])]
+            # Log first: every indexed record is complete
+            last = entries[-1][1]
+            (length,) = _LENGTH.unpack(os.pread(self._reader.fileno(), _LENGTH.size, last))
+            with self._read_lock:
+                self._add(entries)
+                self.size = last + _LENGTH.size + length
+        if writing and self._reader is not None and os.fstat(self._reader.fileno()).st_size != self.size:
+            self.close()
+            self._load()
+
+    def append(self, messages: list):
+        if self._file is None:
+            self._file = self.path.open("ab")
+            self._index_file = self.index_path.open("ab")
+            if self._reader is None:
+                self._reader = self.path.open("rb")
+                self.ino = os.fstat(self._reader.fileno()).st_ino
+
+        data = bytearray()
+        index = bytearray()
+        new = []
+        pos = self.size
+        for m in messages:
+            payload = json.dumps(m, separators=(",", ":")).encode()
+            index += _ENTRY.pack(pos, m["time"].encode())
+            data += _LENGTH.pack(len(payload))
+            data += payload
+            new.append((m["time"], pos))
+            pos += _LENGTH.size + len(payload)
+
+        # Log first: an index entry never points past the log
+        self._file.write(data)
+        self._file.flush()
+        self._index_file.write(index)
+        self._index_file.flush()
+        if MESSAGE_LOG_FSYNC:
+            os.fsync(self._file.fileno())
+            os.fsync(self._index_file.fileno())
+
+        with self._read_lock:
+            if len(self._decoded) == len(self.offsets):
+                # The writer already has these records; don't read them back
+                self._decoded.extend(messages)
+            self._add(new)
+        self.size = pos
+
+    def _add(self, entries: list):
+        """Record new (time, offset) entries, in arrival order; holds _read_lock."""
+        for entry in entries:
+            if self._by_time and entry < self._by_time[-1]:
+                insort(self._by_time, entry)
+            else:
+                self._by_time.append(entry)
+            self.offsets.append(entry[1])
+
+    def close(self):
+        """Close the writers. A reader may still hold the map; it closes when dropped."""
+        for f in (self._file, self._index_file):
+            if f is not None:
+                f.close()
+        self._file = self._index_file = None
+
+    def rename(self, path: Path):
+        with self._read_lock:
+            self.close()
+            index_path = path.with_name(path.name + ".idx")
+            os.replace(self.index_path, index_path)
+            os.replace(self.path, path)
+            self.path, self.index_path = path, index_path
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @property
+    def key(self) -> tuple:
+        """Identifies the segment across renames and reopens."""
+        return (self.path.name, self.ino)
+
+    def _map(self, end: int):
+        if self._mm is None or len(self._mm) < end:
+            self._mm = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def _read(self, mm, offset: int) -> dict:
+        (length,) = _LENGTH.unpack_from(mm, offset)
+        start = offset + _LENGTH.size
+        return json.loads(mm[start:start + length])
+
+    def records(self, count: int, start: int = 0) -> list:
+        """Records start..count in arrival order, decoding any not seen yet."""
+        with self._read_lock:
+            if len(self._decoded) < count:
+                mm = self._map(self.offsets[count - 1] + _LENGTH.size)
+                self._decoded.extend(self._read(mm, o) for o in self.offsets[len(self._decoded):count])
+            return self._decoded[start:count]
+
+    def scan(self, start: Optional[str], end: Optional[str], count: int) -> Iterator[dict]:
+        """Records with start <= time < end among the first `count`, by time."""
+        if not count:
+            return
+        limit = self.offsets[count - 1]
+        with self._read_lock:
+            by_time = self._by_time
+            lo = bisect_left(by_time, (start,)) if start else 0
+            hi = bisect_left(by_time, (end,)) if end else len(by_time)
+            entries = by_time[lo:hi]
+            mm = self._map(limit + _LENGTH.size)
+        for _, offset in entries:
+            if offset <= limit:
+                yield self._read(mm, offset)
+
+
+class MessageLog:
+    """
+    Append-only, length-prefixed log of incoming worker messages.
+
+    `messages.log` holds the records and `messages.log.idx` one fixed-size
+    (offset, time) entry per record, so reopening never re-parses the log.
+    Records are decoded once, through mmap, into the store's in-memory
+    message index. scan() reads a time range straight from the mapped
+    files instead, decoding only the records it returns.
+
+    Compaction seals the active log as `messages.log.1` and starts a new
+    one, so appends never wait for the snapshot; the sealed log is removed
+    once its records are in messages.json.
+
+    Several processes (uvicorn workers) may share one data directory:
+    appends, sealing and dropping hold an flock on `messages.log.lock` and
+    first catch up with the files on disk, and every read catches up with
+    records and compactions from the other processes.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self._lock = threading.Lock()
+        self._writer = FileLock(self.data_dir / "messages.log.lock")
+        self._active_path = self.data_dir / "messages.log"
+        self._sealed_path = self.data_dir / "messages.log.1"
+        # True while this process holds the writer lock and has caught up:
+        # no other process can change the files until it is released
+        self._caught_up = False
+        # Bumped whenever the set of records changes
+        self.version = 0
+        with self._writer:
+            self._reopen()
+
+    @staticmethod
+    def _open(path: Path) -> Optional[_Segment]:
+        return _Segment(path) if path.exists() else None
+
+    def _reopen(self):
+        self._sealed = self._open(self._sealed_path)
+        self._active = _Segment(self._active_path)
+
+    def _moved(self) -> bool:
+        """Whether another process sealed, dropped or started a log file."""
+        on_disk = (_inode(self._sealed_path), _inode(self._active_path))
+        return on_disk != (self._sealed.ino if self._sealed else None, self._active.ino)
+
+    def refresh(self, writing: bool = False):
+        """Catch up with other processes appending to or compacting this log."""
+        if self._caught_up:
+            return
+        with self._lock:
+            if not self._moved():
+                before = len(self._active.offsets)
+                self._active.sync(writing)
+                if len(self._active.offsets) != before:
+                    self.version += 1
+                return
+        # Reopen holding the writer lock, so recovery never races an append
+        with self._writer, self._lock:
+            if self._moved():
+                for segment in (self._sealed, self._active):
+                    if segment is not None:
+                        segment.close()
+                self._reopen()
+                self.version += 1
+
+    @contextmanager
+    def writer(self):
+        """Hold the log exclusively, across processes, caught up with the files."""
+        with self._writer:
+            outermost = not self._caught_up
+            if outermost:
+                self.refresh(writing=True)
+                self._caught_up = True
+            try:
+                yield
+            finally:
+                if outermost:
+                    self._caught_up = False
+
+    def append(self, messages: list) -> int:
+        """Append already-validated messages; returns the log's record count."""
+        if not messages:
+            return len(self)
+        with self.writer(), self._lock:
+            self._active.append(messages)
+            self.version += 1
+            return len(self)
+
+    def __len__(self) -> int:
+        return len(self._active.offsets) + (len(self._sealed.offsets) if self._sealed else 0)
+
+    @property
+    def active_bytes(self) -> int:
+        return self._active.size
+
+    def _snapshot(self) -> tuple:
+        """Segments and their record counts, consistent with each other."""
+        self.refresh()
+        with self._lock:
+            segments = [s for s in (self._sealed, self._active) if s is not None]
+            return self.version, [(s, len(s.offsets)) for s in segments]
+
+    def state(self) -> tuple:
+        """(version, ((segment, record count), ...)); changes whenever records
+        are added, sealed or dropped."""
+        version, segments = self._snapshot()
+        return (version, tuple((s.key, n) for s, n in segments))
+
+    def records(self, seen: tuple = ()) -> tuple:
+        """
+        (state, messages): logged messages in arrival order, oldest segment
+        first, skipping those already returned with the earlier state `seen`.
+        """
+        version, segments = self._snapshot()
+        already = dict(seen[1]) if seen else {}
+        out = []
+        for segment, count in segments:
+            out.extend(segment.records(count, already.get(segment.key, 0)))
+        return (version, tuple((s.key, n) for s, n in segments)), out
+
+    def tail(self, position: Optional[dict] = None) -> tuple:
+        """
+        (position, messages): messages logged since `position`, returned by
+        an earlier call (None: all of them), in arrival order. A position
+        follows each file by inode, so sealing the active log doesn't
+        return its records again.
+        """
+        segments = self._snapshot()[1]
+        position = position or {}
+        out = []
+        for segment, count in segments:
+            seen = position.get(segment.ino, 0)
+            if seen > count:
+                # Inode reused by a newer file
+                seen = 0
+            out.extend(segment.records(count, seen))
+        return {s.ino: n for s, n in segments}, out
+
+    def scan(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None) -> Iterator[dict]:
+        """
+        Logged messages with start <= time < end, oldest first, at most
+        `limit` of them. Covers the log only: compacted messages are in
+        messages.json.
+        """
+        segments = self._snapshot()[1]
+        merged = heapq.merge(*(s.scan(start, end, n) for s, n in segments), key=lambda m: m["time"])
+        return islice(merged, limit)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def seal(self) -> Optional[_Segment]:
+        """Move the active log aside for compaction; returns the sealed segment."""
+        with self.writer(), self._lock:
+            if self._sealed is not None:
+                # A previous compaction didn't finish; compact that first
+                return self._sealed
+            if not self._active.offsets:
+                return None
+            # Same object, so readers keep its decoded records and map
+            self._active.rename(self._sealed_path)
+            self._sealed = self._active
+            self._active = _Segment(self._active_path)
+            self.version += 1
+            return self._sealed
+
+    def drop_sealed(self):
+        """Forget the sealed log once messages.json holds its records."""
+        with self._writer:
+            with self._lock:
+                sealed, self._sealed = self._sealed, None
+                self.version += 1
+            if sealed is not None:
+                sealed.close()
+                sealed.path.unlink(missing_ok=True)
+                sealed.index_path.unlink(missing_ok=True)
+
+    def close(self):
+        with self._lock:
+            for segment in (self._sealed, self._active):
+                if segment is not None:
+                    segment.close()
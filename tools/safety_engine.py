@@ -0,0 +1,241 @@
+import re
+from typing import Optional
+
+from tools.analyze_image_mock import analyze_image_mock
+from tools.transcribe_audio_mock import transcribe_audio_mock
+
+# keyword -> weight. 3+ on its own is a safety finding; lower weights only
+# count towards the score (e.g. Hinglish "hogaya" = "happened").
+SAFETY_KEYWORDS = {
+    # English
+    "accident": 3,
+    "danger": 3,
+    "dangerous": 3,
+    "injury": 3,
+    "injured": 3,
+    "shock": 3,
+    "electrocuted": 3,
+    "bleeding": 3,
+    "fire": 3,
+    "collapsed": 3,
+    "emergency": 3,
+    "help": 2,
+    "hurt": 2,
+    "slipped": 1,
+    "fell": 1,
+    "sirens": 1,
+    "breathing heavily": 1,
+    # Hinglish, as seen in transcripts
+    "jhatka": 3,
+    "bachao": 3,
+    "chot": 2,
+    "madad": 2,
+    "khoon": 3,
+    "aag": 3,
+    "gir gaya": 2,
+    "bhejiye": 1,
+    "hogaya": 1,
+    "jaldi": 1,
+}
+
+URGENCY_WEIGHTS = {"high": 3, "medium": 1}
+REUSE_THRESHOLD = 0.7
+
+# Score bands
+CONFIRMED_SCORE = 3
+AMBIGUOUS_SCORE = 1
+
+
+def _trie_pattern(words) -> str:
+    """
+    Compile words into one regex shaped like a trie, so each position in the
+    text is matched by walking shared prefixes once instead of trying every
+    alternative (the same idea as an Aho-Corasick automaton).
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        is_end = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            return "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Finds every keyword in a text in one left-to-right scan."""
+
+    def __init__(self, weights: dict):
+        self.weights = {k.lower(): w for k, w in weights.items()}
+        self._re = re.compile(r"\b(" + _trie_pattern(self.weights) + r")\b", re.IGNORECASE)
+
+    def find(self, text: str) -> list:
+        if not text:
+            return []
+        return [m.group(1).lower() for m in self._re.finditer(text)]
+
+    def score(self, text: str) -> tuple:
+        hits = self.find(text)
+        if not hits:
+            return 0, hits
+        return sum(self.weights.get(h, 0) for h in set(hits)), hits
+
+
+matcher = KeywordMatcher(SAFETY_KEYWORDS)
+
+
+def _urgency_for(score: int, hits: list) -> str:
+    # A transcription graded high urgency stays high even without keywords
+    if score >= 5 or "high urgency" in hits:
+        return "high"
+    if score >= CONFIRMED_SCORE:
+        return "medium"
+    return "low"
+
+
+def _recommended_action(worker_id: str, urgency: str) -> str:
+    if urgency == "high":
+        return f"Call {worker_id} now and dispatch help to their location."
+    return f"Check on {worker_id} and confirm they are safe to continue."
+
+
+def score_message(
+    msg: dict,
+    transcribe=transcribe_audio_mock,
+    analyze=analyze_image_mock,
+    media_cache: Optional[dict] = None,
+) -> Optional[tuple]:
+    """
+    (evidence, score, hits) for one message, or None for an unknown type.
+    media_cache, keyed by (kind, media id), avoids analysing a media id twice.
+    """
+    media_cache = {} if media_cache is None else media_cache
+    kind = msg.get("type")
+
+    if kind == "text":
+        evidence = msg.get("text") or ""
+        score, hits = matcher.score(evidence)
+        return evidence, score, hits
+
+    if kind == "audio":
+        audio_id = msg.get("audio_id")
+        cached = media_cache.get(("audio", audio_id))
+        if cached is None:
+            result = transcribe(audio_id)
+            evidence = f'{result.get("text", "")} / {result.get("translated_text", "")}'
+            score, hits = matcher.score(evidence)
+            urgency = result.get("urgency")
+            if urgency in URGENCY_WEIGHTS:
+                score += URGENCY_WEIGHTS[urgency]
+                hits.append(f"{urgency} urgency")
+            cached = media_cache[("audio", audio_id)] = (evidence, score, hits)
+        return cached
+
+    if kind == "image":
+        image_id = msg.get("image_id")
+        cached = media_cache.get(("image", image_id))
+        if cached is None:
+            result = analyze(image_id)
+            evidence = result.get("note") or ""
+            score, hits = matcher.score(evidence)
+            if (result.get("reuse_score") or 0) > REUSE_THRESHOLD:
+                score += 1
+                hits.append("reused image")
+            cached = media_cache[("image", image_id)] = (evidence, score, hits)
+        return cached
+
+    return None
+
+
+def triage_messages(
+    messages: list,
+    transcribe=transcribe_audio_mock,
+    analyze=analyze_image_mock,
+) -> dict:
+    """
+    Scores every message for safety risk in one pass.
+
+    Returns:
+        {
+          "findings":  [{worker_id, issue, urgency, recommended_action}],  # score >= 3
+          "ambiguous": [{msg_id, worker_id, type, evidence, score}],        # score 1-2
+        }
+    """
+    # media id -> (evidence, score, hits); each id is analysed and scored once
+    media_cache = {}
+    findings = []
+    ambiguous = []
+
+    for msg in messages:
+        scored = score_message(msg, transcribe, analyze, media_cache)
+        if scored is None:
+            continue
+        evidence, score, hits = scored
+        kind = msg.get("type")
+        worker_id = msg.get("worker_id")
+
+        if score >= CONFIRMED_SCORE:
+            urgency = _urgency_for(score, hits)
+            findings.append({
+                "worker_id": worker_id,
+                "issue": f"{kind.capitalize()} message {msg.get('msg_id')} at "
+                         f"{msg.get('time', '')[11:16]}: {evidence} "
+                         f"[{', '.join(dict.fromkeys(hits))}]",
+                "urgency": urgency,
+                "recommended_action": _recommended_action(worker_id, urgency),
+            })
+        elif score >= AMBIGUOUS_SCORE:
+            ambiguous.append({
+                "msg_id": msg.get("msg_id"),
+                "worker_id": worker_id,
+                "type": kind,
+                "evidence": evidence,
+                "score": score,
+            })
+
+    return {"findings": findings, "ambiguous": ambiguous}
+
+
+def alerts_for(
+    messages: list,
+    transcribe=transcribe_audio_mock,
+    analyze=analyze_image_mock,
+) -> list:
+    """
+    Live alerts for just-arrived messages: one per message that would be
+    a confirmed safety finding (high-urgency audio, accident notes, danger
+    keywords), with the message's id, time and type.
+
+    Returns [{msg_id, worker_id, type, time, urgency, score, evidence, hits, recommended_action}].
+    """
+    media_cache = {}
+    alerts = []
+    for msg in messages:
+        scored = score_message(msg, transcribe, analyze, media_cache)
+        if scored is None or scored[1] < CONFIRMED_SCORE:
+            continue
+        evidence, score, hits = scored
+        worker_id = msg.get("worker_id")
+        urgency = _urgency_for(score, hits)
+        alerts.append({
+            "msg_id": msg.get("msg_id"),
+            "worker_id": worker_id,
+            "type": msg.get("type"),
+            "time": msg.get("time"),
+            "urgency": urgency,
+            "score": score,
+            "evidence": evidence,
+            "hits": list(dict.fromkeys(hits)),
+            "recommended_action": _recommended_action(worker_id, urgency),
+        })
+    return alerts